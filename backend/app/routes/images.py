@@ -9,8 +9,10 @@ import os
 import logging
 import hashlib
 from uuid import uuid4
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, send_file
 from werkzeug.utils import secure_filename
+from app.extensions import db
+from app.models import Message, Conversation, MessageRole
 from app.services.vision_service import VisionService
 
 # Import hybrid OCR service (Story 8-2)
@@ -528,10 +530,6 @@ def create_message_with_image():
         JSON with message_id, image_id, ocr_result, and combined response
     """
     try:
-        # Import required models
-        from app.models import Message, Conversation, MessageRole
-        from app.extensions import db
-
         # Validate conversation_id
         conversation_id = request.form.get('conversation_id')
         if not conversation_id:
@@ -666,7 +664,6 @@ def get_image(image_id: str):
         for ext in ALLOWED_EXTENSIONS:
             filepath = os.path.join(UPLOAD_FOLDER, f"{image_id}.{ext}")
             if os.path.exists(filepath):
-                from flask import send_file
                 return send_file(filepath, mimetype=f'image/{ext}')
 
         return jsonify({
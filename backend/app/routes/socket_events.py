@@ -1,5 +1,7 @@
 """WebSocket event handlers for Flask-SocketIO."""
+import hashlib
 import logging
+import os
 import uuid
 from datetime import datetime
 from flask import request
@@ -230,53 +232,31 @@ def handle_message_send(data):
                     }
 
                     try:
-                        # Parse expression
-                        parse_result = sympy_service.parse_expression(expr_str)
-                        if parse_result['success']:
-                            expr_result['parsed'] = str(parse_result['result'])
-                            math_metadata['sympy_operations_used'].append(
-                                'parse'
+                        # Parse once, then simplify or (for equations) solve
+                        process_result = sympy_service.process_expression(
+                            expr_str
+                        )
+                        if process_result['success']:
+                            processed = process_result['result']
+                            expr_result['type'] = processed['type']
+                            expr_result['parsed'] = processed['parsed']
+                            expr_result['simplified'] = processed['simplified']
+                            expr_result['solutions'] = processed['solutions']
+                            math_metadata['sympy_operations_used'].extend(
+                                processed['operations']
                             )
 
-                            # Simplify expression
-                            simplify_result = sympy_service.simplify_expression(
-                                expr_str
-                            )
-                            if simplify_result['success']:
-                                expr_result['simplified'] = (
-                                    simplify_result['result']
-                                )
-                                math_metadata['sympy_operations_used'].append(
-                                    'simplify'
-                                )
-
-                            # If it's an equation, try to solve it
-                            if '=' in expr_str:
-                                expr_result['type'] = 'equation'
-                                solve_result = sympy_service.solve_equation(
-                                    expr_str
-                                )
-                                if (solve_result['success'] and
-                                        solve_result['result']['solvable']):
-                                    expr_result['solutions'] = (
-                                        solve_result['result']['solutions']
+                            # Generate solution steps
+                            if processed['solutions']:
+                                steps_result = (
+                                    answer_validator.generate_solution_steps(
+                                        expr_str
                                     )
-                                    math_metadata[
-                                        'sympy_operations_used'
-                                    ].append('solve')
-
-                                    # Generate solution steps
-                                    steps_result = (
-                                        answer_validator.generate_solution_steps(
-                                            expr_str
-                                        )
+                                )
+                                if steps_result.get('solvable'):
+                                    expr_result['steps'] = (
+                                        steps_result['steps']
                                     )
-                                    if steps_result.get('solvable'):
-                                        expr_result['steps'] = (
-                                            steps_result['steps']
-                                        )
-                            else:
-                                expr_result['type'] = 'expression'
 
                         math_context['expressions'].append(expr_result)
                         math_metadata['expressions'].append(expr_str)
@@ -513,8 +493,6 @@ def handle_ocr_process(data):
         - ocr:complete: Final OCR result
         - ocr:error: Error information if processing fails
     """
-    import os
-    import hashlib
     from app.services.hybrid_ocr_service import (
         HybridOCRService, optimize_image_for_ocr, OCRProgressStage
     )
@@ -1,9 +1,9 @@
 """Answer Validation Service - validates student answers using SymPy."""
 import logging
-from typing import Dict, Any, List, Optional
-from sympy import sympify, simplify, solve, Abs, N, symbols, Eq
+from typing import Dict, Any, List, Optional, Tuple
+from sympy import sympify, solve, Abs, N, symbols, Eq
 from sympy.core.numbers import Float, Integer, Rational
-from app.services.sympy_service import SymPyService
+from app.services.sympy_service import SymPyService, simplify_fast
 
 logger = logging.getLogger(__name__)
 
@@ -34,66 +34,123 @@ class AnswerValidator:
         Returns:
             Validation response with correct flag, answers, and explanation
         """
-        try:
-            # Parse both answers
-            student_parse = self.sympy_service.parse_expression(student_answer)
-            expected_parse = self.sympy_service.parse_expression(expected_answer)
+        return self.validate_batch([(student_answer, expected_answer)])[0]
 
-            if not student_parse['success']:
-                return {
-                    'correct': False,
-                    'student_answer': student_answer,
-                    'expected_answer': expected_answer,
-                    'explanation': f"Could not understand your answer: {student_parse['error']}"
-                }
+    def validate_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Validate several (student, expected) answer pairs.
 
-            if not expected_parse['success']:
-                logger.error(f"Invalid expected answer: {expected_answer}")
-                return {
+        Each distinct answer string is parsed and simplified once, so an
+        expected answer shared by many submissions is only processed once.
+
+        Args:
+            pairs: (student_answer, expected_answer) tuples
+
+        Returns:
+            One validate_answer() response per pair, in order
+        """
+        prepared = {}
+        results = []
+
+        for student_answer, expected_answer in pairs:
+            try:
+                for answer in (student_answer, expected_answer):
+                    if answer not in prepared:
+                        prepared[answer] = self._prepare_answer(answer)
+
+                results.append(self._validate_prepared(
+                    student_answer,
+                    expected_answer,
+                    prepared[student_answer],
+                    prepared[expected_answer]
+                ))
+
+            except Exception as e:
+                logger.error(f"Error validating answer: {e}")
+                results.append({
                     'correct': False,
                     'student_answer': student_answer,
                     'expected_answer': expected_answer,
-                    'explanation': "There was an error checking your answer. Please try again."
-                }
+                    'explanation': "An error occurred while checking your answer."
+                })
 
-            student_expr = student_parse['result']
-            expected_expr = expected_parse['result']
+        return results
 
-            # Simplify both expressions
-            student_simplified = simplify(student_expr)
-            expected_simplified = simplify(expected_expr)
+    def _prepare_answer(self, answer: str) -> Dict[str, Any]:
+        """Parse and simplify an answer string.
+
+        Args:
+            answer: Answer string
+
+        Returns:
+            parse_expression() result, plus the simplified expression under
+            'simplified' when parsing succeeded
+        """
+        parsed = self.sympy_service.parse_expression(answer)
+        if parsed['success']:
+            # Simplify (targeted rewrites before generic simplify)
+            parsed = {**parsed, 'simplified': simplify_fast(parsed['result'])}
+        return parsed
 
-            # Check for equivalence
-            is_correct, is_approximate = self._check_equivalence(
-                student_simplified,
-                expected_simplified
-            )
+    def _validate_prepared(
+        self,
+        student_answer: str,
+        expected_answer: str,
+        student_parse: Dict[str, Any],
+        expected_parse: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Compare two prepared answers.
 
-            # Generate explanation
-            explanation = self._generate_explanation(
-                is_correct,
-                is_approximate,
-                str(student_simplified),
-                str(expected_simplified)
-            )
+        Args:
+            student_answer: Student's submitted answer
+            expected_answer: Expected correct answer
+            student_parse: _prepare_answer() result for the student answer
+            expected_parse: _prepare_answer() result for the expected answer
 
+        Returns:
+            Validation response with correct flag, answers, and explanation
+        """
+        if not student_parse['success']:
             return {
-                'correct': is_correct,
-                'student_answer': str(student_simplified),
-                'expected_answer': str(expected_simplified),
-                'explanation': explanation,
-                'is_approximate': is_approximate
+                'correct': False,
+                'student_answer': student_answer,
+                'expected_answer': expected_answer,
+                'explanation': f"Could not understand your answer: {student_parse['error']}"
             }
 
-        except Exception as e:
-            logger.error(f"Error validating answer: {e}")
+        if not expected_parse['success']:
+            logger.error(f"Invalid expected answer: {expected_answer}")
             return {
                 'correct': False,
                 'student_answer': student_answer,
                 'expected_answer': expected_answer,
-                'explanation': "An error occurred while checking your answer."
+                'explanation': "There was an error checking your answer. Please try again."
             }
 
+        student_simplified = student_parse['simplified']
+        expected_simplified = expected_parse['simplified']
+
+        # Check for equivalence
+        is_correct, is_approximate = self._check_equivalence(
+            student_simplified,
+            expected_simplified
+        )
+
+        # Generate explanation
+        explanation = self._generate_explanation(
+            is_correct,
+            is_approximate,
+            str(student_simplified),
+            str(expected_simplified)
+        )
+
+        return {
+            'correct': is_correct,
+            'student_answer': str(student_simplified),
+            'expected_answer': str(expected_simplified),
+            'explanation': explanation,
+            'is_approximate': is_approximate
+        }
+
     def _check_equivalence(self, expr1, expr2) -> tuple[bool, bool]:
         """Check if two expressions are equivalent.
 
@@ -105,8 +162,9 @@ class AnswerValidator:
             Tuple of (is_equivalent, is_approximate)
         """
         try:
-            # Try symbolic equivalence first
-            difference = simplify(expr1 - expr2)
+            # Try symbolic equivalence first. Expanding a polynomial (or
+            # cancelling a rational function) difference is an exact zero test.
+            difference = simplify_fast(expr1 - expr2)
 
             # If difference is exactly zero, they're equivalent
             if difference == 0:
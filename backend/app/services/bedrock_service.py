@@ -6,7 +6,10 @@ specifically for Claude 3.5 Sonnet for Socratic tutoring.
 
 import os
 import json
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional, Dict, Any
 
 import boto3
@@ -14,6 +17,10 @@ from botocore.exceptions import ClientError, BotoCoreError
 
 logger = logging.getLogger(__name__)
 
+# boto3 has no async API; async calls run on a bounded thread pool so they
+# can't exhaust the event loop's default executor
+BEDROCK_ASYNC_MAX_WORKERS = 8
+
 
 class BedrockServiceError(Exception):
     """Base exception for Bedrock service errors."""
@@ -55,6 +62,12 @@ class BedrockService:
             region_name=self.region
         )
 
+        # Threads for agenerate/acheck_health (boto3 clients are thread-safe)
+        self._executor = ThreadPoolExecutor(
+            max_workers=BEDROCK_ASYNC_MAX_WORKERS,
+            thread_name_prefix='bedrock'
+        )
+
         logger.info(
             f"BedrockService initialized: model={self.model_id}, "
             f"region={self.region}, max_tokens={self.max_tokens}"
@@ -143,6 +156,51 @@ class BedrockService:
             logger.error(f"Unexpected Bedrock error: {e}")
             raise BedrockServiceError(f"Bedrock generation failed: {e}") from e
 
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> str:
+        """Async version of generate.
+
+        Runs the blocking boto3 call on the service's bounded thread pool so the
+        event loop stays free while Bedrock responds.
+
+        Args:
+            prompt: User message/prompt to send to Claude
+            system_prompt: Optional system message for role/context setting
+            temperature: Sampling temperature 0.0-1.0 (default: 0.7)
+            top_p: Nucleus sampling parameter (default: 0.9)
+
+        Returns:
+            The generated completion text
+
+        Raises:
+            BedrockServiceError: For Bedrock-related errors
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(
+                self.generate,
+                prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                top_p=top_p
+            )
+        )
+
+    async def acheck_health(self) -> Dict[str, Any]:
+        """Async version of check_health.
+
+        Returns:
+            Dict with health status information
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.check_health)
+
     def check_health(self) -> Dict[str, Any]:
         """Check if Bedrock service is accessible.
 
@@ -10,14 +10,21 @@ Provides specialized processing for geometry images, extracting:
 import logging
 import os
 import re
-import base64
-import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field, asdict
+from collections import Counter
+from typing import Dict, Any, List, NamedTuple, Optional
+from dataclasses import dataclass, field
+import orjson
 from openai import OpenAI
 
+from app.services.image_cache import ImageResultCache, b64encode, image_content_hash
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of geometry results kept in memory, keyed by image content.
+# The geometry route keeps a second, cross-process tier in Redis.
+GEOMETRY_CACHE_SIZE = 256
+_geometry_cache = ImageResultCache(GEOMETRY_CACHE_SIZE)
+
 
 # Geometry-specific prompt for structured extraction (AC-1)
 GEOMETRY_PROMPT = """You are analyzing a geometric diagram or shape image.
@@ -94,9 +101,13 @@ IMPORTANT RULES:
 
 Respond ONLY with the JSON object, no additional text."""
 
+# Outermost {...} span in a reply that wraps the JSON in prose or code fences
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
 
-@dataclass
-class SideMeasurement:
+
+# Sides and angles are immutable value records (tuples, no per-instance
+# __dict__); shapes, relationships and results hold lists and stay dataclasses.
+class SideMeasurement(NamedTuple):
     """Represents a side of a shape with its measurement."""
     from_point: str
     to_point: str
@@ -105,8 +116,7 @@ class SideMeasurement:
     marked_congruent: bool = False
 
 
-@dataclass
-class AngleMeasurement:
+class AngleMeasurement(NamedTuple):
     """Represents an angle with its measurement."""
     vertex: str
     measure: Optional[str] = None  # "90°", "45 degrees"
@@ -240,10 +250,21 @@ class GeometryOCRService:
         try:
             logger.info(f"Extracting geometry from image: {image_path}")
 
-            # Encode image as base64
             with open(image_path, "rb") as image_file:
                 image_data = image_file.read()
-                base64_image = base64.b64encode(image_data).decode('utf-8')
+
+            # Identical images (re-uploads, retries) reuse the earlier extraction
+            cache_key = (
+                image_content_hash(image_data),
+                self.model_name
+            )
+            cached = _geometry_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Geometry cache hit for image: {image_path}")
+                return cached
+
+            # Encode the bytes already read for hashing (base64 output is ASCII)
+            base64_image = b64encode(image_data).decode('ascii')
 
             # Determine image format
             image_format = image_path.split('.')[-1].lower()
@@ -272,7 +293,8 @@ class GeometryOCRService:
                     }
                 ],
                 max_tokens=2000,
-                temperature=0.0  # Deterministic output for consistent extraction
+                temperature=0.0,  # Deterministic output for consistent extraction
+                response_format={"type": "json_object"}
             )
 
             raw_response = response.choices[0].message.content.strip()
@@ -289,6 +311,9 @@ class GeometryOCRService:
                 f"Confidence: {result.confidence:.2f}"
             )
 
+            if result.success:
+                _geometry_cache.put(cache_key, result)
+
             return result
 
         except FileNotFoundError:
@@ -301,6 +326,11 @@ class GeometryOCRService:
             logger.error(error_msg)
             return GeometryResult(success=False, error=error_msg, confidence=0.0)
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the in-process geometry result cache."""
+        _geometry_cache.clear()
+
     def _parse_geometry_response(self, raw_response: str) -> GeometryResult:
         """Parse the JSON response from GPT-4o into structured data.
 
@@ -311,18 +341,26 @@ class GeometryOCRService:
             GeometryResult with parsed shapes and relationships
         """
         try:
-            # Extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', raw_response)
-            if not json_match:
-                logger.warning("No JSON found in geometry response")
-                return GeometryResult(
-                    success=False,
-                    error="No structured data extracted from image",
-                    confidence=0.0
-                )
-
-            json_str = json_match.group()
-            parsed = json.loads(json_str)
+            parsed = None
+            if raw_response.startswith('{'):
+                # JSON mode replies are a bare object: decode in one pass
+                try:
+                    parsed = orjson.loads(raw_response)
+                except orjson.JSONDecodeError:
+                    pass
+
+            if parsed is None:
+                # Otherwise extract the JSON object from surrounding text
+                json_match = _JSON_OBJECT_RE.search(raw_response)
+                if not json_match:
+                    logger.warning("No JSON found in geometry response")
+                    return GeometryResult(
+                        success=False,
+                        error="No structured data extracted from image",
+                        confidence=0.0
+                    )
+
+                parsed = orjson.loads(json_match.group())
 
             # Parse shapes
             shapes = []
@@ -349,7 +387,7 @@ class GeometryOCRService:
                 confidence=float(parsed.get('confidence', 0.85))
             )
 
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             logger.warning(f"Failed to parse geometry JSON: {e}")
             return GeometryResult(
                 success=False,
@@ -484,10 +522,7 @@ class GeometryOCRService:
         Returns:
             Summary dictionary with shape counts and types
         """
-        shape_counts = {}
-        for shape in result.shapes:
-            shape_type = shape.type
-            shape_counts[shape_type] = shape_counts.get(shape_type, 0) + 1
+        shape_counts = dict(Counter(shape.type for shape in result.shapes))
 
         has_measurements = any(
             any(s.length or s.variable for s in shape.sides) or
@@ -504,6 +539,6 @@ class GeometryOCRService:
             'has_measurements': has_measurements,
             'has_relationships': has_relationships,
             'has_problem': has_problem,
-            'relationship_types': list(set(r.type for r in result.relationships)),
+            'relationship_types': list({r.type for r in result.relationships}),
             'confidence': result.confidence
         }
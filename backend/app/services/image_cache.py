@@ -0,0 +1,84 @@
+"""In-process result cache for image OCR services.
+
+Shared by VisionService and GeometryOCRService: identical images
+(re-uploads, retries) are keyed by content hash, so the cached result is
+reused without another vision API call.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Hashable, Optional
+
+# pybase64 is a SIMD-accelerated drop-in for the stdlib encoder
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+__all__ = ['ImageResultCache', 'b64encode', 'image_content_hash']
+
+
+def image_content_hash(image_data: bytes) -> str:
+    """Hash image bytes for use in a cache key.
+
+    Args:
+        image_data: Raw image bytes
+
+    Returns:
+        Hex digest of the image content
+    """
+    return hashlib.blake2b(image_data, digest_size=16).hexdigest()
+
+
+class ImageResultCache:
+    """Thread-safe LRU cache of results keyed by image content.
+
+    Results are copied on the way in and out, so callers may modify them.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of results kept before evicting the least recently used
+        """
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: Hashable) -> Optional[Any]:
+        """Look up a cached result, marking it most recently used.
+
+        Args:
+            cache_key: Key starting with the image content hash
+
+        Returns:
+            Copy of the cached result or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(cache_key)
+            if result is None:
+                return None
+            self._entries.move_to_end(cache_key)
+        return deepcopy(result)
+
+    def put(self, cache_key: Hashable, result: Any) -> None:
+        """Store a result, evicting the least recently used entry when full.
+
+        Args:
+            cache_key: Key starting with the image content hash
+            result: Successful result
+        """
+        result = deepcopy(result)
+        with self._lock:
+            self._entries[cache_key] = result
+            self._entries.move_to_end(cache_key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
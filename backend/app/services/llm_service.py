@@ -13,15 +13,16 @@ Example Prompts:
         user_prompt = "Student reasoning: x + 2 = 7, so x = 5"
 """
 
+import asyncio
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from functools import wraps
 import signal
 from contextlib import contextmanager
 
 import ollama
-from ollama import Client, ChatResponse
+from ollama import AsyncClient, Client, ChatResponse
 
 
 # Configure logging
@@ -102,8 +103,9 @@ class LLMService:
         self.timeout_seconds = timeout_seconds
         self.base_url = base_url or os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
 
-        # Create Ollama client with custom host
+        # Create Ollama clients with custom host
         self.client = Client(host=self.base_url)
+        self.async_client = AsyncClient(host=self.base_url)
 
         logger.info(
             f"LLMService initialized: model={self.model_name}, "
@@ -140,18 +142,7 @@ class LLMService:
             ...     system_prompt="You are a Socratic math tutor."
             ... )
         """
-        messages = []
-
-        if system_prompt:
-            messages.append({
-                'role': 'system',
-                'content': system_prompt
-            })
-
-        messages.append({
-            'role': 'user',
-            'content': prompt
-        })
+        messages = self._build_messages(prompt, system_prompt)
 
         logger.info(f"Generating completion: model={self.model_name}, stream={stream}")
         logger.debug(f"Messages: {messages}")
@@ -197,6 +188,89 @@ class LLMService:
             logger.error(f"Unexpected LLM error: {e}")
             raise LLMServiceError(f"LLM generation failed: {e}") from e
 
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> str:
+        """Async version of generate using the async Ollama client.
+
+        The timeout is enforced with asyncio rather than SIGALRM, so this is
+        safe to call from any thread's event loop.
+
+        Args:
+            prompt: User message/prompt to send to the LLM
+            system_prompt: Optional system message for role/context setting
+            temperature: Sampling temperature 0.0-1.0 (default: 0.7)
+
+        Returns:
+            The generated completion text
+
+        Raises:
+            LLMTimeoutError: If request exceeds timeout
+            LLMNetworkError: If Ollama service is unreachable
+            LLMServiceError: For other LLM-related errors
+        """
+        messages = self._build_messages(prompt, system_prompt)
+
+        logger.info(f"Generating completion (async): model={self.model_name}")
+
+        try:
+            response: ChatResponse = await asyncio.wait_for(
+                self.async_client.chat(
+                    model=self.model_name,
+                    messages=messages,
+                    options={
+                        'temperature': temperature,
+                    }
+                ),
+                timeout=self.timeout_seconds
+            )
+            completion = response['message']['content']
+            logger.info(f"Completion generated: {len(completion)} chars")
+            return completion
+
+        except asyncio.TimeoutError as e:
+            logger.error(f"LLM request timeout after {self.timeout_seconds}s")
+            raise LLMTimeoutError(f"LLM request exceeded {self.timeout_seconds}s timeout") from e
+
+        except (ConnectionError, OSError) as e:
+            logger.error(f"Network error connecting to Ollama: {e}")
+            raise LLMNetworkError(f"Could not connect to Ollama at {self.base_url}") from e
+
+        except Exception as e:
+            if 'rate limit' in str(e).lower():
+                logger.error(f"Rate limit exceeded: {e}")
+                raise LLMRateLimitError("Rate limit exceeded") from e
+
+            logger.error(f"Unexpected LLM error: {e}")
+            raise LLMServiceError(f"LLM generation failed: {e}") from e
+
+    def _build_messages(self, prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """Build the chat message list for a completion.
+
+        Args:
+            prompt: User message/prompt
+            system_prompt: Optional system message
+
+        Returns:
+            List of chat messages
+        """
+        messages = []
+
+        if system_prompt:
+            messages.append({
+                'role': 'system',
+                'content': system_prompt
+            })
+
+        messages.append({
+            'role': 'user',
+            'content': prompt
+        })
+        return messages
+
     def check_health(self) -> Dict[str, Any]:
         """Check if Ollama service is healthy and model is available.
 
@@ -212,47 +286,79 @@ class LLMService:
         try:
             # Try to list models to verify Ollama is running
             models = self.client.list()
+            return self._health_from_models(models)
+        except Exception as e:
+            return self._health_error(e)
 
-            # Check if our model is available
-            model_available = any(
-                model.model == self.model_name
-                for model in models.models
-            )
+    async def acheck_health(self) -> Dict[str, Any]:
+        """Async version of check_health using the async Ollama client.
 
-            if model_available:
-                return {
-                    'status': 'healthy',
-                    'ollama': 'connected',
-                    'model': self.model_name,
-                    'model_available': True,
-                }
-            else:
-                return {
-                    'status': 'degraded',
-                    'ollama': 'connected',
-                    'model': self.model_name,
-                    'model_available': False,
-                    'error': f'Model {self.model_name} not found',
-                }
+        Returns:
+            Dict with health status information
+        """
+        try:
+            models = await self.async_client.list()
+            return self._health_from_models(models)
+        except Exception as e:
+            return self._health_error(e)
 
-        except (ConnectionError, OSError) as e:
-            logger.error(f"Health check failed: Ollama not reachable - {e}")
+    def _health_from_models(self, models: Any) -> Dict[str, Any]:
+        """Build the health status from Ollama's model list.
+
+        Args:
+            models: Response from the Ollama list endpoint
+
+        Returns:
+            Dict with health status information
+        """
+        # Check if our model is available
+        model_available = any(
+            model.model == self.model_name
+            for model in models.models
+        )
+
+        if model_available:
             return {
-                'status': 'unhealthy',
-                'ollama': 'disconnected',
+                'status': 'healthy',
+                'ollama': 'connected',
                 'model': self.model_name,
-                'error': str(e),
+                'model_available': True,
+            }
+        else:
+            return {
+                'status': 'degraded',
+                'ollama': 'connected',
+                'model': self.model_name,
+                'model_available': False,
+                'error': f'Model {self.model_name} not found',
             }
 
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
+    def _health_error(self, e: Exception) -> Dict[str, Any]:
+        """Build the health status for a failed Ollama list call.
+
+        Args:
+            e: Exception raised while listing models
+
+        Returns:
+            Dict with health status information
+        """
+        if isinstance(e, (ConnectionError, OSError)):
+            logger.error(f"Health check failed: Ollama not reachable - {e}")
             return {
                 'status': 'unhealthy',
-                'ollama': 'unknown',
+                'ollama': 'disconnected',
                 'model': self.model_name,
                 'error': str(e),
             }
 
+        logger.error(f"Health check failed: {e}")
+        return {
+            'status': 'unhealthy',
+            'ollama': 'unknown',
+            'model': self.model_name,
+            'error': str(e),
+        }
+
 
 # Singleton instance for application-wide use
 _llm_service: Optional[LLMService] = None
@@ -1,11 +1,14 @@
 """Math Expression Detector - identifies mathematical expressions in text."""
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Simple answer statement ("x = 5"), excluded from the general equation pattern
+_SIMPLE_ANSWER_RE = re.compile(r'^\s*[a-zA-Z]\s*=\s*[-]?\d+(?:\.\d+)?\s*$')
+
 
 class ExpressionType(Enum):
     """Types of mathematical expressions that can be detected."""
@@ -27,7 +30,8 @@ class MathDetector:
             'name': 'answer_statement',
             'regex': r'\b([a-zA-Z])\s*=\s*([-]?\d+(?:\.\d+)?)\b',
             'type': ExpressionType.ANSWER_STATEMENT,
-            'confidence': 0.95
+            'confidence': 0.95,
+            'requires': frozenset('=')
         },
         # Equations with = sign (x + 5 = 10) - HIGH confidence
         # Match patterns like: single_letter/digit then operations then = then right side
@@ -36,6 +40,7 @@ class MathDetector:
             'regex': r'(?:^|(?<=\s))(?:\d+[\da-zA-Z\+\-\*/\^\(\)\.]*?|[a-z](?:[\d\+\-\*/\^\(\)\.\s])*?)\s*=\s*[\da-zA-Z\+\-\*/\^\(\)\.\s]+?(?=\s*(?:$|[,\.\?!]|and|or|but))',
             'type': ExpressionType.EQUATION,
             'confidence': 0.90,
+            'requires': frozenset('='),
             'exclude_answer_statement': True  # Don't match simple answer statements
         },
         # Inequalities (x > 5, 2x < 10)
@@ -43,7 +48,8 @@ class MathDetector:
             'name': 'inequality',
             'regex': r'(?:^|(?<=\s))[\d\(a-zA-Z][\da-zA-Z\s\+\-\*/\^\(\)\.]*?\s*[<>≤≥]\s*[\da-zA-Z\s\+\-\*/\^\(\)\.]+?(?=\s|$|[,\.\?!])',
             'type': ExpressionType.INEQUALITY,
-            'confidence': 0.85
+            'confidence': 0.85,
+            'requires': frozenset('<>≤≥')
         },
         # Algebraic expressions with variables (2x + 3, x^2 - 4)
         {
@@ -82,6 +88,12 @@ class MathDetector:
         }
     ]
 
+    # PATTERNS compiled once at import, paired with their definitions.
+    # 'requires' lists characters a match cannot do without; patterns whose
+    # characters are absent from the text are skipped rather than scanned
+    # (the lazy equation/inequality prefixes are quadratic on long messages).
+    _COMPILED_PATTERNS = [(pattern_def, re.compile(pattern_def['regex'], re.IGNORECASE)) for pattern_def in PATTERNS]
+
     # Keywords that increase confidence of math detection
     MATH_KEYWORDS = [
         'solve', 'simplify', 'factor', 'expand', 'equation', 'expression',
@@ -126,12 +138,16 @@ class MathDetector:
         detected_expressions = []
         detected_patterns = []
         max_confidence = 0.0
+        # Keyword context is the same for every match in the text
+        keyword_counts = self._keyword_counts(text)
 
         # Check each pattern
-        for pattern_def in self.PATTERNS:
-            matches = re.finditer(pattern_def['regex'], text, re.IGNORECASE)
+        for pattern_def, pattern in self._COMPILED_PATTERNS:
+            required = pattern_def.get('requires')
+            if required and required.isdisjoint(text):
+                continue
 
-            for match in matches:
+            for match in pattern.finditer(text):
                 matched_text = match.group(0).strip()
 
                 # Skip if empty or too short
@@ -141,13 +157,13 @@ class MathDetector:
                 # Special handling for equations to exclude simple answer statements
                 if pattern_def.get('exclude_answer_statement'):
                     # If it looks like "x = 5" (simple answer), skip this pattern
-                    if re.match(r'^\s*[a-zA-Z]\s*=\s*[-]?\d+(?:\.\d+)?\s*$', matched_text):
+                    if _SIMPLE_ANSWER_RE.match(matched_text):
                         continue
 
                 confidence = pattern_def['confidence']
 
                 # Adjust confidence based on context
-                confidence = self._adjust_confidence(text, matched_text, confidence)
+                confidence = self._adjust_confidence(text, matched_text, confidence, keyword_counts)
 
                 if confidence >= self.min_confidence:
                     detected_expressions.append({
@@ -187,27 +203,64 @@ class MathDetector:
 
         return result
 
-    def _adjust_confidence(self, full_text: str, matched_text: str, base_confidence: float) -> float:
+    def detect_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Detect mathematical expressions in several texts.
+
+        Every pattern contributes its own (possibly overlapping) matches before
+        deduplication, so texts are scanned pattern by pattern rather than
+        with one combined alternation.
+
+        Args:
+            texts: Student message texts to analyze
+
+        Returns:
+            One detect() result per text, in order
+        """
+        return [self.detect(text) for text in texts]
+
+    def _keyword_counts(self, full_text: str) -> Tuple[int, int]:
+        """Count math and non-math keywords in a message.
+
+        Args:
+            full_text: Full message text
+
+        Returns:
+            (math keyword count, non-math keyword count)
+        """
+        full_text_lower = full_text.lower()
+        return (
+            sum(1 for keyword in self.MATH_KEYWORDS if keyword in full_text_lower),
+            sum(1 for keyword in self.NON_MATH_KEYWORDS if keyword in full_text_lower)
+        )
+
+    def _adjust_confidence(
+        self,
+        full_text: str,
+        matched_text: str,
+        base_confidence: float,
+        keyword_counts: Optional[Tuple[int, int]] = None
+    ) -> float:
         """Adjust confidence based on context.
 
         Args:
             full_text: Full message text
             matched_text: The matched expression
             base_confidence: Base confidence from pattern
+            keyword_counts: _keyword_counts(full_text), if already computed
 
         Returns:
             Adjusted confidence (0.0-1.0)
         """
         confidence = base_confidence
-        full_text_lower = full_text.lower()
+        if keyword_counts is None:
+            keyword_counts = self._keyword_counts(full_text)
+        math_keyword_count, non_math_keyword_count = keyword_counts
 
         # Increase confidence if math keywords present
-        math_keyword_count = sum(1 for keyword in self.MATH_KEYWORDS if keyword in full_text_lower)
         if math_keyword_count > 0:
             confidence = min(1.0, confidence + (math_keyword_count * 0.05))
 
         # Decrease confidence if non-math keywords present
-        non_math_keyword_count = sum(1 for keyword in self.NON_MATH_KEYWORDS if keyword in full_text_lower)
         if non_math_keyword_count > 0:
             confidence = max(0.0, confidence - (non_math_keyword_count * 0.1))
 
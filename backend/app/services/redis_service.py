@@ -8,6 +8,7 @@ Implements:
 - AC-5: Cache invalidation methods
 - AC-6: Celebration cooldown storage
 - AC-7: Cache hit/miss logging for monitoring
+- SymPy result cache shared across processes and restarts
 """
 import os
 import json
@@ -43,6 +44,7 @@ class RedisService:
     # Default TTLs (in seconds)
     OCR_CACHE_TTL = 86400  # 24 hours (AC-3)
     CELEBRATION_COOLDOWN_TTL = 120  # 2 minutes (AC-6)
+    SYMPY_CACHE_TTL = 604800  # 7 days
 
     def __new__(cls) -> 'RedisService':
         """Singleton pattern - only one Redis connection per process (AC-2)."""
@@ -337,6 +339,101 @@ class RedisService:
             logger.error(f"Error getting celebration cooldown TTL: {e}")
             return None
 
+    # ========== SymPy Result Caching ==========
+
+    def _get_sympy_cache_key(self, operation: str, args_hash: str) -> str:
+        """Generate cache key for a SymPy operation result.
+
+        Key format: sympy:{operation}:{args_hash}
+        """
+        return f"sympy:{operation}:{args_hash}"
+
+    def get_cached_sympy_result(self, operation: str, args_hash: str) -> Optional[Any]:
+        """Retrieve a cached SymPy operation result.
+
+        Args:
+            operation: Operation name (e.g. 'simplify', 'solve')
+            args_hash: Hash of the operation arguments (and SymPy version)
+
+        Returns:
+            Cached JSON-decoded result or None if not found/cache disabled
+        """
+        if not self.is_connected():
+            return None
+
+        key = self._get_sympy_cache_key(operation, args_hash)
+
+        try:
+            cached = self.client.get(key)
+            if cached is None:
+                logger.debug(f"SymPy cache MISS for {key}")
+                return None
+            logger.debug(f"SymPy cache HIT for {key}")
+            return json.loads(cached)
+
+        except Exception as e:
+            logger.error(f"Error retrieving SymPy cache: {e}")
+            return None
+
+    def cache_sympy_result(
+        self,
+        operation: str,
+        args_hash: str,
+        result: Any,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Cache a SymPy operation result.
+
+        Args:
+            operation: Operation name (e.g. 'simplify', 'solve')
+            args_hash: Hash of the operation arguments (and SymPy version)
+            result: JSON-serializable result (string or list of strings)
+            ttl: Time-to-live in seconds (default: 7 days)
+
+        Returns:
+            True if cached successfully, False otherwise
+        """
+        if not self.is_connected():
+            return False
+
+        key = self._get_sympy_cache_key(operation, args_hash)
+        ttl = ttl or self.SYMPY_CACHE_TTL
+
+        try:
+            self.client.setex(key, ttl, json.dumps(result))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error caching SymPy result: {e}")
+            return False
+
+    def invalidate_sympy_cache(self, operation: Optional[str] = None) -> int:
+        """Invalidate cached SymPy results.
+
+        Args:
+            operation: Only invalidate this operation's results (default: all)
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self.is_connected():
+            return 0
+
+        try:
+            pattern = f"sympy:{operation or '*'}:*"
+            keys = list(self.client.scan_iter(match=pattern))
+
+            if keys:
+                deleted = self.client.delete(*keys)
+                logger.info(f"Invalidated {deleted} SymPy cache entries")
+                return deleted
+
+            return 0
+
+        except Exception as e:
+            logger.error(f"Error invalidating SymPy cache: {e}")
+            return 0
+
     # ========== Monitoring Methods (AC-7) ==========
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -0,0 +1,134 @@
+"""Semantic Cache - reuse LLM verdicts for near-identical inputs.
+
+Texts are embedded with a small sentence-transformers model and compared by
+cosine similarity against previously stored entries, so paraphrases such as
+"What have you tried?" / "What have you tried so far?" share one cached value.
+Embeddings barely distinguish numbers, so a hit also requires both texts to
+contain the same numbers ("x = 2" never reuses the value stored for "x = 3").
+
+Optional dependency: if sentence-transformers (and numpy) are not installed,
+the cache is disabled and every lookup is a miss.
+"""
+import logging
+import re
+import threading
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import the embedding stack - may not be available in all environments
+SEMANTIC_CACHE_AVAILABLE = False
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError as e:
+    logger.info(f"Semantic cache not available: {e}")
+
+DEFAULT_EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Numbers in a text, which must match exactly for a cache hit
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _numbers_key(text: str) -> int:
+    """Hash the sequence of numbers in text (stable within the process)."""
+    return hash(tuple(_NUMBER_RE.findall(text)))
+
+
+class SemanticCache:
+    """Bounded in-memory cache keyed by text embeddings.
+
+    Entries are kept in a fixed-size ring buffer (oldest evicted first) and
+    searched with a single matrix-vector product over L2-normalized vectors,
+    restricted to entries whose text contains the same numbers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 10000,
+        model_name: str = DEFAULT_EMBEDDING_MODEL
+    ):
+        """Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of stored entries
+            model_name: sentence-transformers model used for embeddings
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+
+        self._model: Optional[Any] = None
+        self._vectors: Optional[Any] = None
+        self._number_keys: Optional[Any] = None
+        self._values: List[Any] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._enabled = SEMANTIC_CACHE_AVAILABLE
+
+    def _embed(self, text: str) -> Optional[Any]:
+        """Embed text as an L2-normalized vector, loading the model on first use."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        self._model = SentenceTransformer(self.model_name)
+                        logger.info(f"Semantic cache loaded embedding model {self.model_name}")
+                    except Exception as e:
+                        logger.error(f"Failed to load embedding model, disabling semantic cache: {e}")
+                        self._enabled = False
+                        return None
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def get(self, text: str) -> Optional[Any]:
+        """Return the value stored for the most similar text, if similar enough.
+
+        Args:
+            text: Lookup text
+
+        Returns:
+            Cached value or None on a miss
+        """
+        if not self._enabled or self._size == 0:
+            return None
+
+        vector = self._embed(text)
+        if vector is None:
+            return None
+
+        numbers_key = _numbers_key(text)
+        with self._lock:
+            scores = self._vectors[:self._size] @ vector
+            scores[self._number_keys[:self._size] != numbers_key] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._values[best]
+
+    def set(self, text: str, value: Any) -> None:
+        """Store a value for text, evicting the oldest entry when full.
+
+        Args:
+            text: Text to key the value by
+            value: Value to cache
+        """
+        if not self._enabled:
+            return
+
+        vector = self._embed(text)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=vector.dtype)
+                self._number_keys = np.zeros(self.max_entries, dtype=np.int64)
+            self._vectors[self._next] = vector
+            self._number_keys[self._next] = _numbers_key(text)
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
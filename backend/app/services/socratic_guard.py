@@ -1,10 +1,20 @@
 """Socratic Guard Service - ensures tutor never gives direct answers."""
+import asyncio
+import hashlib
 import logging
 import os
+import random
 import re
-from typing import Dict, Tuple, Optional
-from ollama import Client
-from openai import OpenAI
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Optional
+import httpx
+import orjson
+from ollama import AsyncClient, Client
+from openai import AsyncOpenAI, OpenAI
+from pydantic import BaseModel, ValidationError
+from app.services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +62,140 @@ DIRECT_ANSWER_KEYWORDS = [
     'calculate', 'substitute', 'plug in', 'step 1', 'step 2'
 ]
 
+
+def _compile_alternation(patterns: Iterable[str]) -> re.Pattern:
+    """Compile patterns into one alternation with a named group per pattern.
+
+    Group ``p<i>`` corresponds to ``patterns[i]``, so ``match.lastgroup`` maps
+    a hit back to the pattern that produced it.
+    """
+    return re.compile('|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(patterns)))
+
+
+# Single-pass matchers for _rule_based_validation
+_DIRECT_ANSWER_RE = _compile_alternation(DIRECT_ANSWER_PATTERNS)
+_GIVING_ANSWER_RE = _compile_alternation(GIVING_ANSWER_PATTERNS)
+_ACKNOWLEDGMENT_RE = re.compile('|'.join(ACKNOWLEDGMENT_PHRASES))
+_DIRECT_ANSWER_KEYWORD_RE = re.compile('|'.join(map(re.escape, DIRECT_ANSWER_KEYWORDS)))
+
+# Acknowledgment responses shorter than this skip LLM validation
+SHORT_ACKNOWLEDGMENT_MAX_CHARS = 120
+
+# Question words that mark a student message as a question rather than an answer
+QUESTION_WORDS = frozenset({'what', 'how', 'why', 'when', 'where', 'which', 'who'})
+_WORD_RE = re.compile(r'[a-z]+')
+_LETTER_RE = re.compile(r'[^\W\d_]')  # Any (Unicode) letter
+_VARIABLE_ASSIGNMENT_RE = re.compile(r'^[a-z]\s*=\s*-?\d+(\.\d+)?$')
+# A plain decimal number (no exponent, underscores, leading '+', inf or nan)
+_NUMBER_RE = re.compile(r'-?\d+(\.\d+)?')
+
+# Markers in OCR output from our vision service (lowercase)
+OCR_INDICATORS = [
+    'linear equation:',
+    'algebra:',
+    'geometry:',
+    'arithmetic:',
+    'right triangle',
+    'this image shows',
+    'equation:',
+    'problem:',
+    'given values:',
+    'find:',
+    'pythagorean theorem',
+]
+
+# Geometry shape indicators
+GEOMETRY_SHAPE_KEYWORDS = [
+    'triangle', 'circle', 'rectangle', 'square', 'polygon',
+    'parallelogram', 'trapezoid', 'rhombus', 'pentagon',
+    'hexagon', 'octagon', 'quadrilateral', 'line segment',
+    'ray', 'arc', 'chord', 'tangent', 'secant'
+]
+
+# Geometry measurement indicators
+GEOMETRY_MEASUREMENT_KEYWORDS = [
+    'angle', 'degree', 'radius', 'diameter', 'circumference',
+    'perimeter', 'area', 'volume', 'surface area', 'height',
+    'base', 'hypotenuse', 'leg', 'altitude', 'median',
+    'side length', 'vertex', 'vertices'
+]
+
+# Geometry relationship indicators
+GEOMETRY_RELATIONSHIP_KEYWORDS = [
+    'parallel', 'perpendicular', 'congruent', 'similar',
+    'bisect', 'bisector', 'midpoint', 'inscribed',
+    'circumscribed', 'tangent to', 'intersect'
+]
+
+# Geometry theorem/property indicators
+GEOMETRY_THEOREM_KEYWORDS = [
+    'pythagorean', 'theorem', 'sohcahtoa', 'sine', 'cosine',
+    'tangent', 'isosceles', 'equilateral', 'scalene',
+    'right angle', 'acute', 'obtuse', 'supplementary',
+    'complementary', 'vertical angles', 'corresponding'
+]
+
+GEOMETRY_KEYWORDS = (
+    GEOMETRY_SHAPE_KEYWORDS + GEOMETRY_MEASUREMENT_KEYWORDS +
+    GEOMETRY_RELATIONSHIP_KEYWORDS + GEOMETRY_THEOREM_KEYWORDS
+)
+
+# Geometry notation patterns (matched case-insensitively)
+GEOMETRY_NOTATION_PATTERNS = [
+    r'triangle\s+[A-Z]{3}',  # Triangle ABC
+    r'angle\s+[A-Z]{1,3}',  # Angle A, Angle ABC
+    r'∠[A-Z]{1,3}',  # ∠ABC
+    r'[A-Z]{2}\s*[|‖]\s*[A-Z]{2}',  # AB || CD (parallel)
+    r'[A-Z]{2}\s*[⊥]\s*[A-Z]{2}',  # AB ⊥ CD (perpendicular)
+    r'\d+\s*°',  # 90°
+    r'\d+\s*degrees?',  # 90 degrees
+    r'side\s+[A-Z]{2}',  # side AB
+]
+
+
+class MessageAnalysis(NamedTuple):
+    """Content flags for a student message."""
+    is_ocr: bool
+    is_geometry: bool
+
+
+# Combined OCR + geometry term matcher. Each term is tagged with the categories
+# it implies (including keywords nested inside it, e.g. 'right triangle'), and
+# longest terms are tried first so one scan sees every category hit.
+_MESSAGE_TERM_FLAGS = {
+    term: (term in OCR_INDICATORS, any(keyword in term for keyword in GEOMETRY_KEYWORDS))
+    for term in set(OCR_INDICATORS) | set(GEOMETRY_KEYWORDS)
+}
+_MESSAGE_TERM_RE = re.compile('|'.join(
+    re.escape(term) for term in sorted(_MESSAGE_TERM_FLAGS, key=len, reverse=True)
+))
+_GEOMETRY_NOTATION_RE = re.compile('|'.join(GEOMETRY_NOTATION_PATTERNS), re.IGNORECASE)
+
+# Number of message analyses kept (a ~500 character message takes ~150 us to
+# scan; retried turns and regenerated responses re-analyze the same message)
+MESSAGE_ANALYSIS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=MESSAGE_ANALYSIS_CACHE_SIZE)
+def _analyze_message_text(message: str) -> MessageAnalysis:
+    """Classify a message as OCR and/or geometry content, memoized across calls."""
+    is_ocr = is_geometry = False
+    for match in _MESSAGE_TERM_RE.finditer(message.lower()):
+        term_is_ocr, term_is_geometry = _MESSAGE_TERM_FLAGS[match.group()]
+        is_ocr = is_ocr or term_is_ocr
+        is_geometry = is_geometry or term_is_geometry
+        if is_ocr and is_geometry:
+            return MessageAnalysis(True, True)
+
+    if not is_ocr and '$' in message and _LETTER_RE.search(message):
+        # Has LaTeX delimiters and variables - likely from OCR
+        is_ocr = True
+
+    if not is_geometry and _GEOMETRY_NOTATION_RE.search(message):
+        is_geometry = True
+
+    return MessageAnalysis(is_ocr, is_geometry)
+
 # Fallback Socratic questions when validation fails
 FALLBACK_QUESTIONS = [
     "What have you tried so far to solve this problem?",
@@ -61,6 +205,174 @@ FALLBACK_QUESTIONS = [
     "What part of this problem seems most challenging to you?",
 ]
 
+# Prompt instructions for content extracted from uploaded images (Story 8-4, AC-6)
+GEOMETRY_IMAGE_INSTRUCTION = """
+
+⚠️ GEOMETRY DIAGRAM DETECTED - MANDATORY ACTION REQUIRED:
+This content came from an uploaded geometric diagram.
+
+GEOMETRY AWARENESS GUIDELINES (Story 8-5):
+- Reference the shapes naturally: "I see you have a triangle with sides 3, 4, and 5..."
+- Reference measurements: "Looking at angle ABC which measures 90 degrees..."
+- Reference relationships: "I notice that lines AB and CD are parallel..."
+- If you see a right angle (marked with a small square), acknowledge it explicitly
+- If confidence is low (<80%), ask for confirmation: "I think side AB is 5cm, is that correct?"
+- Ask what they're trying to find or prove BEFORE providing guidance
+- Example: "I see Triangle ABC with a right angle at C. What would you like to find - the area, the hypotenuse, or something else?"
+
+GEOMETRY-SPECIFIC QUESTIONS TO ASK:
+- "What type of triangle/shape do you see here?"
+- "What theorem or property might apply to this shape?"
+- "What do you know about the relationship between these elements?"
+- "Can you identify any special properties (right angles, parallel lines, congruent sides)?"
+
+Do not skip these steps - acknowledge the geometry diagram first."""
+
+IMAGE_INSTRUCTION = """
+
+⚠️ IMAGE/DRAWING DETECTED - MANDATORY ACTION REQUIRED:
+This content came from an uploaded image or drawing.
+
+IMAGE AWARENESS GUIDELINES:
+- Reference the uploaded content naturally: "I see you wrote..." or "Looking at the equation you uploaded..."
+- If confidence is mentioned as low (<80%), ask for confirmation: "I think you wrote X, is that correct?"
+- You MUST ask the student what they're trying to solve or calculate BEFORE providing any other guidance.
+- Example good response: "I see you've written 3x + 2 = 5. What would you like to do with this equation?"
+
+Do not skip these steps - acknowledge the image first."""
+
+# Critical instructions selected by conversation state
+NEW_CONVERSATION_INSTRUCTIONS = "This is the START of a new conversation. The student is asking for help with a problem. Guide them through solving it step-by-step using the Socratic method. Ask what operation they think should be performed first to solve the equation."
+
+# Student provided CORRECT final answer
+CORRECT_ANSWER_INSTRUCTIONS = """The student just provided a CORRECT final answer!
+
+CELEBRATE their success! Confirm they found the correct answer WITHOUT restating it.
+→ Say things like "Excellent! You've solved it!" or "Perfect! That's the correct answer!" or "Yes, you've got it!"
+→ Do NOT repeat their answer back to them (e.g., don't say "x = 1 is correct" - just say "That's correct!")
+→ Then IMMEDIATELY ask: "Would you like to try another problem?" or "Ready for another question?"
+→ DO NOT suggest verification or ask follow-up questions about the solution."""
+
+# Student provided INCORRECT final answer
+INCORRECT_ANSWER_INSTRUCTIONS = """The student just provided an INCORRECT final answer.
+
+DO NOT tell them the answer! Instead, gently guide them to reconsider:
+→ Say something like "Hmm, let's double-check that. Can you walk me through your calculation?"
+→ Or "That's not quite right. Let's go back - what did you get when you [operation]?"
+→ Guide them to identify where they made an error without giving away the answer.
+→ Be encouraging and supportive - everyone makes mistakes!"""
+
+CONTINUING_CONVERSATION_INSTRUCTIONS = """This is a CONTINUING conversation. Review the previous messages above.
+
+IMPORTANT: Look at the student's LAST response carefully:
+
+1. **Is it a QUESTION asking for help?** (e.g., "what is the answer to...", "how do I solve...")
+   → They haven't solved anything yet! Guide them to start solving step-by-step.
+   → Ask what operation they should perform first.
+
+2. **Did they identify an operation?** (e.g., "subtract 3", "divide by 2")
+   → Ask them to COMPUTE the result of that operation
+   → Example: "What do you get when you subtract 3 from both sides?"
+
+3. **Did they give an intermediate result?** (e.g., "2x = 4")
+   → Ask what the NEXT SPECIFIC operation should be
+   → Example: "Good! Now what operation will isolate x?"
+
+4. **Are they stuck or asking for help?**
+   → Ask a more specific question about the current step
+   → Guide them to the operation they need
+
+NEVER skip ahead. NEVER be vague. Make them compute EACH intermediate step."""
+
+# Socratic tutor prompt; the instruction blocks above are substituted per request
+SOCRATIC_PROMPT_TEMPLATE = """{emphasis}You are a Socratic math tutor for the following subjects:
+1 - addition
+2 - subtraction
+3 - multiplication
+4 - division
+5 - geometry
+6 - algebra
+
+Your role is to guide students to discover answers themselves through questions - NEVER give direct answers.
+
+TONE: Be naturally encouraging and supportive, but vary your language. Avoid starting every response with the same praise phrases like "Great thinking!" or "Excellent observation!" Mix it up and be authentic.
+
+FORBIDDEN behaviors:
+- NEVER give numerical answers (e.g., "x = 5")
+- NEVER provide step-by-step solutions
+- NEVER state formulas with values substituted
+- NEVER say "the answer is..." or "the solution is..."
+- NEVER skip steps or ask vague questions like "what happens if we do something?"
+- NEVER be repetitive with encouragement phrases
+
+REQUIRED behaviors - FOLLOW THIS SEQUENCE:
+1. Ask what SPECIFIC operation to perform (e.g., "What should we subtract from both sides?")
+2. After student identifies operation, ask for the INTERMEDIATE RESULT (e.g., "What do you get after subtracting 3 from both sides?")
+3. Ask about the NEXT specific operation needed
+4. Repeat: operation → result → next operation → result
+5. Guide step-by-step, making student compute EACH intermediate state
+
+CRITICAL: Make the student figure out and state:
+- The specific operation (subtract what? divide by what?)
+- The intermediate result after each operation (what equals what?)
+- Build understanding through computing each step themselves
+
+{context_section}
+{math_info}
+
+Student: {student_message}
+
+CRITICAL INSTRUCTIONS:
+
+{critical_instructions}
+{ocr_instruction}
+
+Respond as a Socratic tutor (2-3 sentences max):"""
+
+# Attempt-dependent emphasis prepended to the Socratic prompt (attempt 1, 2, 3+)
+ATTEMPT_EMPHASIS = ("", "IMPORTANT: ", "CRITICAL: ")
+
+# Placeholders of SOCRATIC_PROMPT_TEMPLATE in the order they appear
+_SOCRATIC_PROMPT_FIELDS = (
+    'emphasis', 'context_section', 'math_info',
+    'student_message', 'critical_instructions', 'ocr_instruction'
+)
+
+
+def _split_template(template: str, fields: Iterable[str]) -> Tuple[str, ...]:
+    """Split a template into the literal fragments around its placeholders.
+
+    Args:
+        template: Template with each field appearing exactly once, in order
+        fields: Field names in template order
+
+    Returns:
+        len(fields) + 1 literal fragments
+    """
+    fragments = []
+    rest = template
+    for field in fields:
+        head, rest = rest.split('{' + field + '}')
+        fragments.append(head)
+    fragments.append(rest)
+    return tuple(fragments)
+
+
+# Static fragments of the Socratic prompt, so the general case is assembled
+# by concatenation instead of a str.format() parse on every call
+_SOCRATIC_PROMPT_FRAGMENTS = _split_template(SOCRATIC_PROMPT_TEMPLATE, _SOCRATIC_PROMPT_FIELDS)
+
+# First-turn prompt (no context, math analysis, OCR or final answer) is static
+# around the student message, so pre-render it once at import
+_FIRST_TURN_PROMPT_PREFIX, _FIRST_TURN_PROMPT_SUFFIX = SOCRATIC_PROMPT_TEMPLATE.format(
+    emphasis='',
+    context_section='',
+    math_info='',
+    student_message='\0',
+    critical_instructions=NEW_CONVERSATION_INSTRUCTIONS,
+    ocr_instruction=''
+).split('\0')
+
 # Validation prompt template for LLM
 VALIDATION_PROMPT_TEMPLATE = """You are a validator for a Socratic tutoring system. Your job is to determine if a tutor response gives a DIRECT ANSWER to a student's question.
 
@@ -82,10 +394,127 @@ Tutor Response: {tutor_response}
 Analyze the tutor response. Respond ONLY with a JSON object:
 {{
   "is_direct_answer": true or false,
-  "reason": "brief explanation",
-  "confidence": 0.0 to 1.0
+  "confidence": 0.0 to 1.0,
+  "reason": "brief explanation"
 }}"""
 
+# Ollama HTTP settings. Tutor turns are often more than httpx's default 5s
+# keep-alive apart, so idle connections are kept longer to avoid reconnecting.
+OLLAMA_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+OLLAMA_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120.0)
+
+# Number of LLM validation verdicts kept per SocraticGuard instance
+VALIDATION_CACHE_SIZE = 2048
+
+# Optional semantic validation cache (enabled with SOCRATIC_SEMANTIC_CACHE=true):
+# paraphrased tutor responses reuse a confident verdict for the same student message
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_SIZE = 10000
+SEMANTIC_CACHE_MIN_CONFIDENCE = 0.8
+
+# Returned when the validator's reply cannot be parsed; never cached
+_INCONCLUSIVE_RESULT = (True, "Validation inconclusive", 0.3)
+
+# Verdict fields in (possibly truncated) streamed validator output
+_DECISION_RE = re.compile(r'"is_direct_answer"\s*:\s*(true|false)')
+_CONFIDENCE_RE = re.compile(r'"confidence"\s*:\s*(\d*\.?\d+)\s*[,}\n]')
+
+
+def _has_verdict(text: str) -> bool:
+    """Return True once streamed validator output contains the decision and confidence."""
+    return _DECISION_RE.search(text) is not None and _CONFIDENCE_RE.search(text) is not None
+
+# Pre-split validation template so the hot path is plain concatenation
+# instead of a str.format() parse on every call
+_VALIDATION_PREFIX, _validation_rest = VALIDATION_PROMPT_TEMPLATE.split('{student_message}')
+_VALIDATION_MIDDLE, _validation_rest = _validation_rest.split('{tutor_response}')
+_VALIDATION_SUFFIX = _validation_rest.replace('{{', '{').replace('}}', '}')
+del _validation_rest
+
+
+# Ollama decoding is constrained to the ValidationResult schema, so its prompt
+# omits the JSON shape example
+_STRUCTURED_VALIDATION_SUFFIX = (
+    "\n\nAnalyze the tutor response. Give is_direct_answer, a confidence "
+    "from 0.0 to 1.0, and a brief reason."
+)
+
+
+def _build_validation_prompt(student_message: str, tutor_response: str, structured: bool = False) -> str:
+    """Build the validation prompt (equivalent to VALIDATION_PROMPT_TEMPLATE.format).
+
+    Args:
+        student_message: Student's question
+        tutor_response: Tutor's response to validate
+        structured: If True, end with the short instruction used with schema-constrained output
+    """
+    suffix = _STRUCTURED_VALIDATION_SUFFIX if structured else _VALIDATION_SUFFIX
+    return f"{_VALIDATION_PREFIX}{student_message}{_VALIDATION_MIDDLE}{tutor_response}{suffix}"
+
+
+class ValidationResult(BaseModel):
+    """Validator verdict; field order matches VALIDATION_PROMPT_TEMPLATE."""
+
+    is_direct_answer: bool
+    confidence: float
+    reason: str
+
+
+# JSON schema passed as Ollama's ``format`` so the reply always parses
+_VALIDATION_SCHEMA = ValidationResult.model_json_schema()
+
+
+# Number of candidate responses requested by each retry's generation call.
+# Attempt 1 asks for a single response, which usually passes validation.
+CANDIDATE_COUNT = 3
+
+# Appended to the tutor prompt when Ollama is asked for several candidates at once
+# (OpenAI returns several choices natively via ``n``)
+_CANDIDATES_INSTRUCTION = (
+    "\n\nWrite {count} different candidate responses. Respond ONLY with a JSON object: "
+    '{{"candidates": ["first response", "second response"]}}'
+)
+
+# Ends the batch validation prompt, which reuses the single validation preamble
+_BATCH_VALIDATION_SUFFIX = """
+
+Analyze each tutor response, in order. Respond ONLY with a JSON object containing one verdict per response:
+{"verdicts": [{"is_direct_answer": true or false, "confidence": 0.0 to 1.0, "reason": "brief explanation"}]}"""
+
+
+def _build_batch_validation_prompt(student_message: str, tutor_responses: List[str]) -> str:
+    """Build a prompt that validates several numbered tutor responses in one call."""
+    numbered = '\n'.join(f"{i}. {response}" for i, response in enumerate(tutor_responses, 1))
+    return f"{_VALIDATION_PREFIX}{student_message}\n\nTutor Responses:\n{numbered}{_BATCH_VALIDATION_SUFFIX}"
+
+
+class CandidateResponses(BaseModel):
+    """Several candidate tutor responses from one generation call."""
+
+    candidates: List[str]
+
+
+class BatchValidationResult(BaseModel):
+    """Validator verdicts for numbered tutor responses, in order."""
+
+    verdicts: List[ValidationResult]
+
+
+_CANDIDATES_SCHEMA = CandidateResponses.model_json_schema()
+_BATCH_VALIDATION_SCHEMA = BatchValidationResult.model_json_schema()
+
+
+# Per-thread RNG for fallback questions, seeded lazily so forked workers diverge
+_fallback_rng = threading.local()
+
+
+def _choose_fallback_question() -> str:
+    """Pick a random fallback Socratic question."""
+    rng = getattr(_fallback_rng, 'rng', None)
+    if rng is None:
+        rng = _fallback_rng.rng = random.Random()
+    return rng.choice(FALLBACK_QUESTIONS)
+
 
 class SocraticGuard:
     """Service to validate that tutor responses are Socratic (no direct answers)."""
@@ -102,22 +531,42 @@ class SocraticGuard:
         self.max_retries = max_retries
         self.use_openai = use_openai
 
+        # LRU cache of LLM validation verdicts keyed by prompt hash. Validation runs
+        # at temperature 0.1 so reusing a verdict is safe; generation is never cached.
+        self._validation_cache: 'OrderedDict[str, Tuple[bool, str, float]]' = OrderedDict()
+        self._validation_cache_lock = threading.Lock()
+        self._semantic_cache: Optional[SemanticCache] = None
+        if os.environ.get('SOCRATIC_SEMANTIC_CACHE', 'false').lower() == 'true':
+            self._semantic_cache = SemanticCache(
+                threshold=SEMANTIC_CACHE_THRESHOLD,
+                max_entries=SEMANTIC_CACHE_SIZE
+            )
+
         if use_openai:
             api_key = os.environ.get('OPENAI_API_KEY')
             if not api_key:
                 logger.error("OPENAI_API_KEY not found, falling back to Ollama")
                 self.use_openai = False
                 self.model_name = "llama3.2:latest"
-                base_url = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
-                self.client = Client(host=base_url)
+                self._init_ollama_clients()
             else:
                 self.client = OpenAI(api_key=api_key)
+                self.async_client = AsyncOpenAI(api_key=api_key)
                 logger.info(f"Initialized Socratic Guard with OpenAI model {model_name}")
         else:
-            base_url = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
-            self.client = Client(host=base_url)
+            self._init_ollama_clients()
             logger.info(f"Initialized Socratic Guard with Ollama model {model_name}")
 
+    def _init_ollama_clients(self) -> None:
+        """Create the sync and async Ollama clients.
+
+        Each client keeps one pooled HTTP connection set for the lifetime of the
+        guard, so calls reuse open connections instead of reconnecting.
+        """
+        base_url = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
+        self.client = Client(host=base_url, timeout=OLLAMA_TIMEOUT, limits=OLLAMA_LIMITS)
+        self.async_client = AsyncClient(host=base_url, timeout=OLLAMA_TIMEOUT, limits=OLLAMA_LIMITS)
+
     def validate_response(
         self,
         student_message: str,
@@ -137,39 +586,108 @@ class SocraticGuard:
             - reason: Explanation of validation result
             - confidence: Confidence score 0.0-1.0
         """
-        # First, try rule-based validation (fast)
-        rule_is_valid, rule_reason, rule_confidence = self._rule_based_validation(tutor_response)
+        rule_result = self._rule_based_validation(tutor_response)
+        if not use_llm or self._rules_are_decisive(tutor_response, rule_result):
+            return rule_result
+
+        # Use LLM for more nuanced validation
+        try:
+            llm_result = self._llm_validation(student_message, tutor_response)
+        except Exception as e:
+            logger.warning(f"LLM validation failed, falling back to rules: {e}")
+            return rule_result
+
+        return self._combine_validation(rule_result, llm_result)
+
+    async def avalidate_response(
+        self,
+        student_message: str,
+        tutor_response: str,
+        use_llm: bool = True
+    ) -> Tuple[bool, str, float]:
+        """Async version of validate_response using the async LLM client.
+
+        Args:
+            student_message: The student's question
+            tutor_response: The tutor's proposed response
+            use_llm: Whether to use LLM validation (True) or rule-based only (False)
+
+        Returns:
+            Tuple of (is_valid, reason, confidence)
+        """
+        rule_result = self._rule_based_validation(tutor_response)
+        if not use_llm or self._rules_are_decisive(tutor_response, rule_result):
+            return rule_result
+
+        try:
+            llm_result = await self._allm_validation(student_message, tutor_response)
+        except Exception as e:
+            logger.warning(f"LLM validation failed, falling back to rules: {e}")
+            return rule_result
+
+        return self._combine_validation(rule_result, llm_result)
+
+    def _rules_are_decisive(
+        self,
+        tutor_response: str,
+        rule_result: Tuple[bool, str, float]
+    ) -> bool:
+        """Check whether the rule-based result is confident enough to skip the LLM.
+
+        Args:
+            tutor_response: The tutor's proposed response
+            rule_result: Result of _rule_based_validation
+
+        Returns:
+            True if the rule-based result should be returned as-is
+        """
+        rule_is_valid, rule_reason, rule_confidence = rule_result
 
         # If rule-based is confident it's a direct answer, don't bother with LLM
         if not rule_is_valid and rule_confidence > 0.8:
             logger.info(f"Rule-based validation failed: {rule_reason}")
-            return False, rule_reason, rule_confidence
+            return True
 
-        # Use LLM for more nuanced validation
-        if use_llm:
-            try:
-                llm_is_valid, llm_reason, llm_confidence = self._llm_validation(
-                    student_message, tutor_response
-                )
+        # Short acknowledgment replies (e.g. celebrations) are safe, skip the LLM round trip.
+        # Acknowledgments bypass the giving-answer patterns in the rules ("not correct"
+        # also contains "correct"), so the shortcut requires that none of them match.
+        return (
+            rule_is_valid
+            and rule_confidence >= 0.8
+            and len(tutor_response) < SHORT_ACKNOWLEDGMENT_MAX_CHARS
+            and _GIVING_ANSWER_RE.search(tutor_response.lower()) is None
+        )
 
-                # Combine rule-based and LLM results
-                # If either says it's a direct answer with high confidence, reject it
-                if not llm_is_valid and llm_confidence > 0.7:
-                    return False, llm_reason, llm_confidence
+    def _combine_validation(
+        self,
+        rule_result: Tuple[bool, str, float],
+        llm_result: Tuple[bool, str, float]
+    ) -> Tuple[bool, str, float]:
+        """Combine rule-based and LLM validation results.
+
+        Args:
+            rule_result: Result of _rule_based_validation
+            llm_result: Result of _llm_validation
 
-                if not rule_is_valid and not llm_is_valid:
-                    avg_confidence = (rule_confidence + llm_confidence) / 2
-                    return False, f"Both validators rejected: {llm_reason}", avg_confidence
+        Returns:
+            Tuple of (is_valid, reason, confidence)
+        """
+        rule_is_valid, _, rule_confidence = rule_result
+        llm_is_valid, llm_reason, llm_confidence = llm_result
 
-                # If LLM is confident it's good, trust it
-                if llm_is_valid and llm_confidence > 0.7:
-                    return True, llm_reason, llm_confidence
+        # If either says it's a direct answer with high confidence, reject it
+        if not llm_is_valid and llm_confidence > 0.7:
+            return False, llm_reason, llm_confidence
 
-            except Exception as e:
-                logger.warning(f"LLM validation failed, falling back to rules: {e}")
-                return rule_is_valid, rule_reason, rule_confidence
+        if not rule_is_valid and not llm_is_valid:
+            avg_confidence = (rule_confidence + llm_confidence) / 2
+            return False, f"Both validators rejected: {llm_reason}", avg_confidence
 
-        return rule_is_valid, rule_reason, rule_confidence
+        # If LLM is confident it's good, trust it
+        if llm_is_valid and llm_confidence > 0.7:
+            return True, llm_reason, llm_confidence
+
+        return rule_result
 
     def _rule_based_validation(self, response: str) -> Tuple[bool, str, float]:
         """Rule-based validation using regex and keyword detection.
@@ -183,27 +701,30 @@ class SocraticGuard:
         response_lower = response.lower()
 
         # First check if this is an acknowledgment response
-        has_acknowledgment = any(
-            re.search(pattern, response_lower)
-            for pattern in ACKNOWLEDGMENT_PHRASES
-        )
+        has_acknowledgment = _ACKNOWLEDGMENT_RE.search(response_lower) is not None
 
         # Check general direct answer patterns
-        for pattern in DIRECT_ANSWER_PATTERNS:
-            if re.search(pattern, response_lower):
-                return False, f"Matched pattern: {pattern}", 0.9
+        match = _DIRECT_ANSWER_RE.search(response_lower)
+        if match:
+            pattern = DIRECT_ANSWER_PATTERNS[int(match.lastgroup[1:])]
+            return False, f"Matched pattern: {pattern}", 0.9
 
         # Check "giving answer" patterns only if NOT acknowledging
         if not has_acknowledgment:
-            for pattern in GIVING_ANSWER_PATTERNS:
-                if re.search(pattern, response_lower):
-                    return False, f"Tutor is giving answer: {pattern}", 0.9
-
-        # Count keywords (but be lenient if acknowledging)
-        keyword_count = sum(
-            1 for keyword in DIRECT_ANSWER_KEYWORDS
-            if keyword in response_lower
-        )
+            match = _GIVING_ANSWER_RE.search(response_lower)
+            if match:
+                pattern = GIVING_ANSWER_PATTERNS[int(match.lastgroup[1:])]
+                return False, f"Tutor is giving answer: {pattern}", 0.9
+
+        # Count distinct keywords (but be lenient if acknowledging), stopping
+        # once the count reaches the rejection threshold
+        keyword_limit = 5 if has_acknowledgment else 3
+        keywords_found = set()
+        for match in _DIRECT_ANSWER_KEYWORD_RE.finditer(response_lower):
+            keywords_found.add(match.group())
+            if len(keywords_found) >= keyword_limit:
+                break
+        keyword_count = len(keywords_found)
 
         if has_acknowledgment:
             # Allow more keywords when acknowledging correct answer
@@ -233,69 +754,678 @@ class SocraticGuard:
             timeout: Maximum seconds for LLM call
 
         Returns:
-            Tuple of (is_valid, reason, confidence)
+            Tuple of (is_valid, reason, confidence)
+        """
+        prompt = _build_validation_prompt(student_message, tutor_response, structured=not self.use_openai)
+        cache_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        cached = self._lookup_validation(cache_key, student_message, tutor_response)
+        if cached is not None:
+            return cached
+
+        try:
+            if self.use_openai:
+                # OpenAI API call, streamed so we can stop once the verdict is known
+                with self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    temperature=0.1,
+                    max_tokens=150,
+                    stream=True
+                ) as stream:
+                    result_text = self._read_validation_stream(
+                        chunk.choices[0].delta.content
+                        for chunk in stream
+                        if chunk.choices and chunk.choices[0].delta.content
+                    )
+                result = self._parse_validation_result(result_text)
+            else:
+                # Ollama API call, constrained to the ValidationResult schema and
+                # streamed; closing the stream early stops generation on the server
+                stream = self.client.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    format=_VALIDATION_SCHEMA,
+                    options={'temperature': 0.1},
+                    stream=True
+                )
+                try:
+                    result_text = self._read_validation_stream(
+                        chunk['message']['content']
+                        for chunk in stream
+                        if chunk['message']['content']
+                    )
+                finally:
+                    stream.close()
+                result = self._parse_structured_validation(result_text)
+
+            self._store_validation(cache_key, student_message, tutor_response, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"LLM validation error: {e}")
+            raise
+
+    async def _allm_validation(
+        self,
+        student_message: str,
+        tutor_response: str
+    ) -> Tuple[bool, str, float]:
+        """Async LLM-based validation using the async OpenAI or Ollama client.
+
+        Args:
+            student_message: Student's question
+            tutor_response: Tutor's response to validate
+
+        Returns:
+            Tuple of (is_valid, reason, confidence)
+        """
+        prompt = _build_validation_prompt(student_message, tutor_response, structured=not self.use_openai)
+        cache_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        cached = self._lookup_validation(cache_key, student_message, tutor_response)
+        if cached is not None:
+            return cached
+
+        try:
+            if self.use_openai:
+                stream = await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    temperature=0.1,
+                    max_tokens=150,
+                    stream=True
+                )
+                parts = []
+                result_text = ""
+                async with stream:
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            parts.append(chunk.choices[0].delta.content)
+                            result_text = ''.join(parts)
+                            if _has_verdict(result_text):
+                                break
+                result = self._parse_validation_result(result_text)
+            else:
+                stream = await self.async_client.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    format=_VALIDATION_SCHEMA,
+                    options={'temperature': 0.1},
+                    stream=True
+                )
+                parts = []
+                result_text = ""
+                try:
+                    async for chunk in stream:
+                        if chunk['message']['content']:
+                            parts.append(chunk['message']['content'])
+                            result_text = ''.join(parts)
+                            if _has_verdict(result_text):
+                                break
+                finally:
+                    await stream.aclose()
+                result = self._parse_structured_validation(result_text)
+
+            self._store_validation(cache_key, student_message, tutor_response, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"LLM validation error: {e}")
+            raise
+
+    def _parse_validation_result(self, result_text: str) -> Tuple[bool, str, float]:
+        """Parse the validator's JSON reply into (is_valid, reason, confidence).
+
+        Args:
+            result_text: Raw (possibly truncated) validator output
+
+        Returns:
+            Tuple of (is_valid, reason, confidence)
+        """
+        try:
+            result = orjson.loads(result_text)
+            is_direct = result.get('is_direct_answer', False)
+            reason = result.get('reason', 'No reason provided')
+            confidence = result.get('confidence', 0.5)
+
+            is_valid = not is_direct
+            return is_valid, reason, confidence
+
+        except orjson.JSONDecodeError:
+            # Stream may have been cut off after the verdict; recover it from the prefix
+            decision = _DECISION_RE.search(result_text)
+            confidence_match = _CONFIDENCE_RE.search(result_text)
+            if decision and confidence_match:
+                return (
+                    decision.group(1) == 'false',
+                    "Validator verdict (stream stopped early)",
+                    float(confidence_match.group(1))
+                )
+            logger.warning(f"Failed to parse LLM response as JSON: {result_text}")
+            return _INCONCLUSIVE_RESULT
+
+    def _parse_structured_validation(self, result_text: str) -> Tuple[bool, str, float]:
+        """Parse a schema-constrained (Ollama) validator reply.
+
+        Args:
+            result_text: Validator output produced with ``format=_VALIDATION_SCHEMA``,
+                possibly truncated once the verdict was streamed
+
+        Returns:
+            Tuple of (is_valid, reason, confidence)
+        """
+        try:
+            verdict = ValidationResult.model_validate_json(result_text)
+        except ValidationError:
+            # Stream stopped before the reason was complete; recover the verdict
+            return self._parse_validation_result(result_text)
+        return not verdict.is_direct_answer, verdict.reason, verdict.confidence
+
+    def _validate_candidates(
+        self,
+        student_message: str,
+        candidates: List[str]
+    ) -> List[Tuple[bool, str, float]]:
+        """Validate several candidate responses with at most one LLM call.
+
+        Candidates the rules decide on are not sent to the LLM; the rest are
+        validated together and combined with their rule results as in
+        validate_response.
+
+        Args:
+            student_message: Student's question
+            candidates: Candidate tutor responses
+
+        Returns:
+            List of (is_valid, reason, confidence), one per candidate
+        """
+        results = [self._rule_based_validation(candidate) for candidate in candidates]
+        pending = [
+            i for i, (candidate, rule_result) in enumerate(zip(candidates, results))
+            if not self._rules_are_decisive(candidate, rule_result)
+        ]
+        if not pending:
+            return results
+
+        try:
+            llm_results = self._batch_llm_validation(student_message, [candidates[i] for i in pending])
+        except Exception as e:
+            logger.warning(f"Batch LLM validation failed, falling back to rules: {e}")
+            return results
+
+        for i, llm_result in zip(pending, llm_results):
+            results[i] = self._combine_validation(results[i], llm_result)
+        return results
+
+    async def _avalidate_candidates(
+        self,
+        student_message: str,
+        candidates: List[str]
+    ) -> List[Tuple[bool, str, float]]:
+        """Async version of _validate_candidates.
+
+        Candidates are validated concurrently with avalidate_response rather
+        than in one batch call.
+
+        Args:
+            student_message: Student's question
+            candidates: Candidate tutor responses
+
+        Returns:
+            List of (is_valid, reason, confidence), one per candidate
+        """
+        return list(await asyncio.gather(*(
+            self.avalidate_response(student_message, candidate) for candidate in candidates
+        )))
+
+    def _batch_llm_validation(
+        self,
+        student_message: str,
+        tutor_responses: List[str]
+    ) -> List[Tuple[bool, str, float]]:
+        """LLM-based validation of several tutor responses in a single request.
+
+        Verdicts are read from and stored in the same cache as _llm_validation,
+        so only uncached responses are sent to the model.
+
+        Args:
+            student_message: Student's question
+            tutor_responses: Tutor responses to validate
+
+        Returns:
+            List of (is_valid, reason, confidence), one per response
+        """
+        structured = not self.use_openai
+        cache_keys = [
+            hashlib.sha256(
+                _build_validation_prompt(student_message, response, structured=structured).encode('utf-8')
+            ).hexdigest()
+            for response in tutor_responses
+        ]
+        results = [
+            self._lookup_validation(cache_key, student_message, response)
+            for cache_key, response in zip(cache_keys, tutor_responses)
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        if len(missing) == 1:
+            results[missing[0]] = self._llm_validation(student_message, tutor_responses[missing[0]])
+        elif missing:
+            prompt = _build_batch_validation_prompt(student_message, [tutor_responses[i] for i in missing])
+            try:
+                if self.use_openai:
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[{'role': 'user', 'content': prompt}],
+                        temperature=0.1,
+                        max_tokens=150 * len(missing),
+                        response_format={'type': 'json_object'}
+                    )
+                    result_text = response.choices[0].message.content
+                else:
+                    response = self.client.chat(
+                        model=self.model_name,
+                        messages=[{'role': 'user', 'content': prompt}],
+                        format=_BATCH_VALIDATION_SCHEMA,
+                        options={'temperature': 0.1}
+                    )
+                    result_text = response['message']['content']
+            except Exception as e:
+                logger.error(f"Batch LLM validation error: {e}")
+                raise
+
+            verdicts = self._parse_batch_validation(result_text, len(missing))
+            for i, verdict in zip(missing, verdicts):
+                results[i] = verdict
+                self._store_validation(cache_keys[i], student_message, tutor_responses[i], verdict)
+
+        return results
+
+    def _parse_batch_validation(self, result_text: str, count: int) -> List[Tuple[bool, str, float]]:
+        """Parse a batch validator reply into per-response verdicts.
+
+        Missing or unparseable verdicts are reported as inconclusive.
+
+        Args:
+            result_text: Raw validator output
+            count: Number of responses that were validated
+
+        Returns:
+            List of (is_valid, reason, confidence) of length count
+        """
+        try:
+            verdicts = BatchValidationResult.model_validate_json(result_text).verdicts
+        except ValidationError:
+            logger.warning(f"Failed to parse batch LLM response: {result_text}")
+            verdicts = []
+
+        if len(verdicts) != count:
+            logger.warning(f"Batch validator returned {len(verdicts)} verdicts for {count} responses")
+
+        results = [
+            (not verdict.is_direct_answer, verdict.reason, verdict.confidence)
+            for verdict in verdicts[:count]
+        ]
+        results.extend([_INCONCLUSIVE_RESULT] * (count - len(results)))
+        return results
+
+    def _lookup_validation(
+        self,
+        cache_key: str,
+        student_message: str,
+        tutor_response: str
+    ) -> Optional[Tuple[bool, str, float]]:
+        """Look up a validation verdict in the exact cache, then the semantic cache.
+
+        Args:
+            cache_key: SHA-256 hex digest of the validation prompt
+            student_message: Student's question
+            tutor_response: Tutor's response to validate
+
+        Returns:
+            Cached (is_valid, reason, confidence) or None on a miss
+        """
+        cached = self._get_cached_validation(cache_key)
+        if cached is None and self._semantic_cache is not None:
+            cached = self._semantic_cache.get(f"{student_message}||{tutor_response}")
+            if cached is not None:
+                logger.debug("Semantic validation cache hit")
+        return cached
+
+    def _store_validation(
+        self,
+        cache_key: str,
+        student_message: str,
+        tutor_response: str,
+        result: Tuple[bool, str, float]
+    ) -> None:
+        """Store a validation verdict in the exact cache and, if confident, the semantic cache.
+
+        Args:
+            cache_key: SHA-256 hex digest of the validation prompt
+            student_message: Student's question
+            tutor_response: Tutor's response that was validated
+            result: Parsed (is_valid, reason, confidence)
+        """
+        self._cache_validation(cache_key, result)
+        confidence = result[2]
+        if (self._semantic_cache is not None and result is not _INCONCLUSIVE_RESULT
+                and isinstance(confidence, (int, float)) and confidence > SEMANTIC_CACHE_MIN_CONFIDENCE):
+            self._semantic_cache.set(f"{student_message}||{tutor_response}", result)
+
+    def _get_cached_validation(self, cache_key: str) -> Optional[Tuple[bool, str, float]]:
+        """Look up a cached validation verdict, marking it most recently used.
+
+        Args:
+            cache_key: SHA-256 hex digest of the validation prompt
+
+        Returns:
+            Cached (is_valid, reason, confidence) or None on a miss
+        """
+        with self._validation_cache_lock:
+            result = self._validation_cache.get(cache_key)
+            if result is not None:
+                self._validation_cache.move_to_end(cache_key)
+        return result
+
+    def _cache_validation(self, cache_key: str, result: Tuple[bool, str, float]) -> None:
+        """Store a validation verdict, evicting the least recently used entry when full.
+
+        Inconclusive results are not cached so a later call can retry the LLM.
+
+        Args:
+            cache_key: SHA-256 hex digest of the validation prompt
+            result: Parsed (is_valid, reason, confidence)
+        """
+        if result is _INCONCLUSIVE_RESULT:
+            return
+        with self._validation_cache_lock:
+            self._validation_cache[cache_key] = result
+            self._validation_cache.move_to_end(cache_key)
+            if len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+
+    def _read_validation_stream(self, deltas: Iterable[str]) -> str:
+        """Accumulate streamed validator output until the verdict is known.
+
+        Stops reading as soon as both ``is_direct_answer`` and ``confidence``
+        have been emitted, so the remaining ``reason`` tokens are never generated.
+
+        Args:
+            deltas: Iterator of text fragments from a streaming LLM response
+
+        Returns:
+            Accumulated (possibly truncated) response text
+        """
+        parts = []
+        text = ""
+        for delta in deltas:
+            parts.append(delta)
+            text = ''.join(parts)
+            if _has_verdict(text):
+                break
+        return text
+
+    def generate_socratic_response(
+        self,
+        student_message: str,
+        conversation_context: Optional[str] = None,
+        attempt: int = 1,
+        math_context: Optional[Dict] = None,
+        is_correct_answer: Optional[bool] = None
+    ) -> str:
+        """Generate a Socratic tutor response.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (1-3)
+            math_context: Optional SymPy computation results
+
+        Returns:
+            Generated Socratic response
+        """
+        prompt = self._generation_prompt(
+            student_message, conversation_context, attempt, math_context, is_correct_answer
+        )
+
+        try:
+            if self.use_openai:
+                # OpenAI API call
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    temperature=0.7,
+                    max_tokens=200
+                )
+                return response.choices[0].message.content.strip()
+            else:
+                # Ollama API call
+                response = self.client.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    options={'temperature': 0.7}
+                )
+                return response['message']['content'].strip()
+
+        except Exception as e:
+            logger.error(f"Error generating Socratic response: {e}")
+            # Return fallback question
+            return _choose_fallback_question()
+
+    def generate_socratic_candidates(
+        self,
+        student_message: str,
+        conversation_context: Optional[str] = None,
+        attempt: int = 2,
+        math_context: Optional[Dict] = None,
+        count: int = CANDIDATE_COUNT
+    ) -> List[str]:
+        """Generate several Socratic responses for a retry in a single LLM call.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (2-3)
+            math_context: Optional SymPy computation results
+            count: Number of candidates to request
+
+        Returns:
+            Up to ``count`` candidate responses (empty if generation failed)
+        """
+        prompt = self._generation_prompt(student_message, conversation_context, attempt, math_context, None)
+
+        try:
+            if self.use_openai:
+                # OpenAI samples several choices from one prompt evaluation
+                response = self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    temperature=0.7,
+                    max_tokens=200,
+                    n=count
+                )
+                candidates = [choice.message.content for choice in response.choices]
+            else:
+                response = self.client.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt + _CANDIDATES_INSTRUCTION.format(count=count)}],
+                    format=_CANDIDATES_SCHEMA,
+                    options={'temperature': 0.7}
+                )
+                candidates = CandidateResponses.model_validate_json(response['message']['content']).candidates
+
+        except Exception as e:
+            logger.error(f"Error generating candidate responses: {e}")
+            return []
+
+        return [candidate.strip() for candidate in candidates if candidate and candidate.strip()][:count]
+
+    async def agenerate_socratic_candidates(
+        self,
+        student_message: str,
+        conversation_context: Optional[str] = None,
+        attempt: int = 2,
+        math_context: Optional[Dict] = None,
+        count: int = CANDIDATE_COUNT
+    ) -> List[str]:
+        """Async version of generate_socratic_candidates using the async LLM client.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (2-3)
+            math_context: Optional SymPy computation results
+            count: Number of candidates to request
+
+        Returns:
+            Up to ``count`` candidate responses (empty if generation failed)
+        """
+        prompt = self._generation_prompt(student_message, conversation_context, attempt, math_context, None)
+
+        try:
+            if self.use_openai:
+                response = await self.async_client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt}],
+                    temperature=0.7,
+                    max_tokens=200,
+                    n=count
+                )
+                candidates = [choice.message.content for choice in response.choices]
+            else:
+                response = await self.async_client.chat(
+                    model=self.model_name,
+                    messages=[{'role': 'user', 'content': prompt + _CANDIDATES_INSTRUCTION.format(count=count)}],
+                    format=_CANDIDATES_SCHEMA,
+                    options={'temperature': 0.7}
+                )
+                candidates = CandidateResponses.model_validate_json(response['message']['content']).candidates
+
+        except Exception as e:
+            logger.error(f"Error generating candidate responses: {e}")
+            return []
+
+        return [candidate.strip() for candidate in candidates if candidate and candidate.strip()][:count]
+
+    def _generate_attempt(
+        self,
+        student_message: str,
+        conversation_context: Optional[str],
+        attempt: int,
+        math_context: Optional[Dict]
+    ) -> List[str]:
+        """Generate the responses to validate for one attempt.
+
+        Attempt 1 asks for a single response, which usually passes. Retries
+        ask for CANDIDATE_COUNT candidates in one call, and fall back to a
+        single response if candidate generation fails.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (1-3)
+            math_context: Optional SymPy computation results
+
+        Returns:
+            Responses to validate, in order of preference
+        """
+        if attempt > 1:
+            candidates = self.generate_socratic_candidates(
+                student_message, conversation_context, attempt, math_context
+            )
+            if candidates:
+                return candidates
+        return [self.generate_socratic_response(student_message, conversation_context, attempt, math_context)]
+
+    async def _agenerate_attempt(
+        self,
+        student_message: str,
+        conversation_context: Optional[str],
+        attempt: int,
+        math_context: Optional[Dict]
+    ) -> List[str]:
+        """Async version of _generate_attempt.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (1-3)
+            math_context: Optional SymPy computation results
+
+        Returns:
+            Responses to validate, in order of preference
+        """
+        if attempt > 1:
+            candidates = await self.agenerate_socratic_candidates(
+                student_message, conversation_context, attempt, math_context
+            )
+            if candidates:
+                return candidates
+        return [await self.agenerate_socratic_response(student_message, conversation_context, attempt, math_context)]
+
+    async def agenerate_socratic_response(
+        self,
+        student_message: str,
+        conversation_context: Optional[str] = None,
+        attempt: int = 1,
+        math_context: Optional[Dict] = None,
+        is_correct_answer: Optional[bool] = None
+    ) -> str:
+        """Async version of generate_socratic_response using the async LLM client.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            attempt: Current generation attempt (1-3)
+            math_context: Optional SymPy computation results
+
+        Returns:
+            Generated Socratic response
         """
-        prompt = VALIDATION_PROMPT_TEMPLATE.format(
-            student_message=student_message,
-            tutor_response=tutor_response
+        prompt = self._generation_prompt(
+            student_message, conversation_context, attempt, math_context, is_correct_answer
         )
 
         try:
             if self.use_openai:
-                # OpenAI API call
-                response = self.client.chat.completions.create(
+                response = await self.async_client.chat.completions.create(
                     model=self.model_name,
                     messages=[{'role': 'user', 'content': prompt}],
-                    temperature=0.1,
-                    max_tokens=150
+                    temperature=0.7,
+                    max_tokens=200
                 )
-                result_text = response.choices[0].message.content
+                return response.choices[0].message.content.strip()
             else:
-                # Ollama API call
-                response = self.client.chat(
+                response = await self.async_client.chat(
                     model=self.model_name,
                     messages=[{'role': 'user', 'content': prompt}],
-                    options={'temperature': 0.1}
+                    options={'temperature': 0.7}
                 )
-                result_text = response['message']['content']
-
-            # Parse JSON response
-            import json
-            try:
-                result = json.loads(result_text)
-                is_direct = result.get('is_direct_answer', False)
-                reason = result.get('reason', 'No reason provided')
-                confidence = result.get('confidence', 0.5)
-
-                is_valid = not is_direct
-                return is_valid, reason, confidence
-
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM response as JSON: {result_text}")
-                return True, "Validation inconclusive", 0.3
+                return response['message']['content'].strip()
 
         except Exception as e:
-            logger.error(f"LLM validation error: {e}")
-            raise
+            logger.error(f"Error generating Socratic response: {e}")
+            return _choose_fallback_question()
 
-    def generate_socratic_response(
+    def _generation_prompt(
         self,
         student_message: str,
-        conversation_context: Optional[str] = None,
-        attempt: int = 1,
-        math_context: Optional[Dict] = None,
-        is_correct_answer: Optional[bool] = None
+        conversation_context: Optional[str],
+        attempt: int,
+        math_context: Optional[Dict],
+        is_correct_answer: Optional[bool]
     ) -> str:
-        """Generate a Socratic tutor response.
+        """Build the tutor prompt for a generation attempt.
 
         Args:
             student_message: Student's question
             conversation_context: Previous conversation history
             attempt: Current generation attempt (1-3)
             math_context: Optional SymPy computation results
+            is_correct_answer: Whether the final answer is correct (None if not a final answer)
 
         Returns:
-            Generated Socratic response
+            Prompt text for the tutor model
         """
         logger.info(f"[SOCRATIC] Generating response, attempt {attempt}")
         logger.info(f"[SOCRATIC] Conversation context provided: {bool(conversation_context)}, length: {len(conversation_context) if conversation_context else 0}")
@@ -303,66 +1433,70 @@ class SocraticGuard:
             logger.debug(f"[SOCRATIC] Context preview: {conversation_context[:200]}")
 
         # Build prompt with increasing emphasis on Socratic method
-        emphasis = ["", "IMPORTANT: ", "CRITICAL: "][min(attempt - 1, 2)]
+        emphasis = ATTEMPT_EMPHASIS[min(attempt, len(ATTEMPT_EMPHASIS)) - 1]
+
+        # Detect if this message came from OCR/Vision (image or drawing), and if it is geometry
+        analysis = self._analyze_message(student_message)
+
+        if (not conversation_context and is_correct_answer is None and not analysis.is_ocr
+                and not (math_context and math_context.get('detected'))):
+            # Common first turn: everything around the student message is static
+            return f"{emphasis}{_FIRST_TURN_PROMPT_PREFIX}{student_message}{_FIRST_TURN_PROMPT_SUFFIX}"
+
+        return self._build_socratic_prompt(
+            student_message,
+            conversation_context,
+            emphasis,
+            analysis,
+            math_context,
+            is_correct_answer
+        )
+
+    def _build_socratic_prompt(
+        self,
+        student_message: str,
+        conversation_context: Optional[str],
+        emphasis: str,
+        analysis: MessageAnalysis,
+        math_context: Optional[Dict],
+        is_correct_answer: Optional[bool]
+    ) -> str:
+        """Assemble the full Socratic prompt for the general (non first-turn) case.
 
-        # Detect if this message came from OCR/Vision (image or drawing)
-        is_from_image = self._detect_ocr_content(student_message)
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            emphasis: Attempt-dependent emphasis prefix
+            analysis: OCR/geometry flags for the student message
+            math_context: Optional SymPy computation results
+            is_correct_answer: Whether the final answer is correct (None if not a final answer)
 
+        Returns:
+            Prompt text for the tutor model
+        """
         # Build math context section if available
         math_info = ""
         if math_context and math_context.get('detected'):
-            math_info = "\n\nMATH ANALYSIS (use this to ask informed questions):\n"
+            parts = ["\n\nMATH ANALYSIS (use this to ask informed questions):\n"]
             for expr in math_context.get('expressions', []):
-                math_info += f"- Expression: {expr['original']}\n"
+                parts.append(f"- Expression: {expr['original']}\n")
                 if expr.get('simplified'):
-                    math_info += f"  Simplified: {expr['simplified']}\n"
+                    parts.append(f"  Simplified: {expr['simplified']}\n")
                 if expr.get('solutions'):
-                    math_info += f"  Solutions exist: {', '.join(expr['solutions'])}\n"
+                    parts.append(f"  Solutions exist: {', '.join(expr['solutions'])}\n")
                 if expr.get('steps'):
-                    math_info += f"  Solution steps: {len(expr['steps'])} steps available\n"
-            math_info += "\nUse this information to ask questions that guide the student toward these insights, but NEVER reveal the answers directly.\n"
+                    parts.append(f"  Solution steps: {len(expr['steps'])} steps available\n")
+            parts.append("\nUse this information to ask questions that guide the student toward these insights, but NEVER reveal the answers directly.\n")
+            math_info = ''.join(parts)
 
         # Image awareness instructions for OCR content (Story 8-4, AC-6)
         ocr_instruction = ""
-        if is_from_image:
-            # Check if this is geometry content (Story 8-5, AC-6)
-            is_geometry = self._detect_geometry_content(student_message)
-
-            if is_geometry:
-                ocr_instruction = """
-
-⚠️ GEOMETRY DIAGRAM DETECTED - MANDATORY ACTION REQUIRED:
-This content came from an uploaded geometric diagram.
-
-GEOMETRY AWARENESS GUIDELINES (Story 8-5):
-- Reference the shapes naturally: "I see you have a triangle with sides 3, 4, and 5..."
-- Reference measurements: "Looking at angle ABC which measures 90 degrees..."
-- Reference relationships: "I notice that lines AB and CD are parallel..."
-- If you see a right angle (marked with a small square), acknowledge it explicitly
-- If confidence is low (<80%), ask for confirmation: "I think side AB is 5cm, is that correct?"
-- Ask what they're trying to find or prove BEFORE providing guidance
-- Example: "I see Triangle ABC with a right angle at C. What would you like to find - the area, the hypotenuse, or something else?"
-
-GEOMETRY-SPECIFIC QUESTIONS TO ASK:
-- "What type of triangle/shape do you see here?"
-- "What theorem or property might apply to this shape?"
-- "What do you know about the relationship between these elements?"
-- "Can you identify any special properties (right angles, parallel lines, congruent sides)?"
-
-Do not skip these steps - acknowledge the geometry diagram first."""
+        if analysis.is_ocr:
+            # Geometry content gets geometry-specific guidance (Story 8-5, AC-6)
+            if analysis.is_geometry:
+                ocr_instruction = GEOMETRY_IMAGE_INSTRUCTION
             else:
-                ocr_instruction = """
-
-⚠️ IMAGE/DRAWING DETECTED - MANDATORY ACTION REQUIRED:
-This content came from an uploaded image or drawing.
-
-IMAGE AWARENESS GUIDELINES:
-- Reference the uploaded content naturally: "I see you wrote..." or "Looking at the equation you uploaded..."
-- If confidence is mentioned as low (<80%), ask for confirmation: "I think you wrote X, is that correct?"
-- You MUST ask the student what they're trying to solve or calculate BEFORE providing any other guidance.
-- Example good response: "I see you've written 3x + 2 = 5. What would you like to do with this equation?"
-
-Do not skip these steps - acknowledge the image first."""
+                ocr_instruction = IMAGE_INSTRUCTION
 
         # Build context section (avoid backslashes in f-string expressions)
         context_section = ""
@@ -371,116 +1505,20 @@ Do not skip these steps - acknowledge the image first."""
 
         # Build critical instructions based on whether we have context
         if not conversation_context:
-            critical_instructions = "This is the START of a new conversation. The student is asking for help with a problem. Guide them through solving it step-by-step using the Socratic method. Ask what operation they think should be performed first to solve the equation."
+            critical_instructions = NEW_CONVERSATION_INSTRUCTIONS
         elif is_correct_answer is True:
-            # Student provided CORRECT final answer
-            critical_instructions = """The student just provided a CORRECT final answer!
-
-CELEBRATE their success! Confirm they found the correct answer WITHOUT restating it.
-→ Say things like "Excellent! You've solved it!" or "Perfect! That's the correct answer!" or "Yes, you've got it!"
-→ Do NOT repeat their answer back to them (e.g., don't say "x = 1 is correct" - just say "That's correct!")
-→ Then IMMEDIATELY ask: "Would you like to try another problem?" or "Ready for another question?"
-→ DO NOT suggest verification or ask follow-up questions about the solution."""
+            critical_instructions = CORRECT_ANSWER_INSTRUCTIONS
         elif is_correct_answer is False:
-            # Student provided INCORRECT final answer
-            critical_instructions = """The student just provided an INCORRECT final answer.
-
-DO NOT tell them the answer! Instead, gently guide them to reconsider:
-→ Say something like "Hmm, let's double-check that. Can you walk me through your calculation?"
-→ Or "That's not quite right. Let's go back - what did you get when you [operation]?"
-→ Guide them to identify where they made an error without giving away the answer.
-→ Be encouraging and supportive - everyone makes mistakes!"""
+            critical_instructions = INCORRECT_ANSWER_INSTRUCTIONS
         else:
-            critical_instructions = """This is a CONTINUING conversation. Review the previous messages above.
-
-IMPORTANT: Look at the student's LAST response carefully:
-
-1. **Is it a QUESTION asking for help?** (e.g., "what is the answer to...", "how do I solve...")
-   → They haven't solved anything yet! Guide them to start solving step-by-step.
-   → Ask what operation they should perform first.
-
-2. **Did they identify an operation?** (e.g., "subtract 3", "divide by 2")
-   → Ask them to COMPUTE the result of that operation
-   → Example: "What do you get when you subtract 3 from both sides?"
-
-3. **Did they give an intermediate result?** (e.g., "2x = 4")
-   → Ask what the NEXT SPECIFIC operation should be
-   → Example: "Good! Now what operation will isolate x?"
-
-4. **Are they stuck or asking for help?**
-   → Ask a more specific question about the current step
-   → Guide them to the operation they need
-
-NEVER skip ahead. NEVER be vague. Make them compute EACH intermediate step."""
-
-        prompt = f"""{emphasis}You are a Socratic math tutor for the following subjects:
-1 - addition
-2 - subtraction
-3 - multiplication
-4 - division
-5 - geometry
-6 - algebra
-
-Your role is to guide students to discover answers themselves through questions - NEVER give direct answers.
-
-TONE: Be naturally encouraging and supportive, but vary your language. Avoid starting every response with the same praise phrases like "Great thinking!" or "Excellent observation!" Mix it up and be authentic.
-
-FORBIDDEN behaviors:
-- NEVER give numerical answers (e.g., "x = 5")
-- NEVER provide step-by-step solutions
-- NEVER state formulas with values substituted
-- NEVER say "the answer is..." or "the solution is..."
-- NEVER skip steps or ask vague questions like "what happens if we do something?"
-- NEVER be repetitive with encouragement phrases
-
-REQUIRED behaviors - FOLLOW THIS SEQUENCE:
-1. Ask what SPECIFIC operation to perform (e.g., "What should we subtract from both sides?")
-2. After student identifies operation, ask for the INTERMEDIATE RESULT (e.g., "What do you get after subtracting 3 from both sides?")
-3. Ask about the NEXT specific operation needed
-4. Repeat: operation → result → next operation → result
-5. Guide step-by-step, making student compute EACH intermediate state
-
-CRITICAL: Make the student figure out and state:
-- The specific operation (subtract what? divide by what?)
-- The intermediate result after each operation (what equals what?)
-- Build understanding through computing each step themselves
-
-{context_section}
-{math_info}
-
-Student: {student_message}
-
-CRITICAL INSTRUCTIONS:
-
-{critical_instructions}
-{ocr_instruction}
-
-Respond as a Socratic tutor (2-3 sentences max):"""
-
-        try:
-            if self.use_openai:
-                # OpenAI API call
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[{'role': 'user', 'content': prompt}],
-                    temperature=0.7,
-                    max_tokens=200
-                )
-                return response.choices[0].message.content.strip()
-            else:
-                # Ollama API call
-                response = self.client.chat(
-                    model=self.model_name,
-                    messages=[{'role': 'user', 'content': prompt}],
-                    options={'temperature': 0.7}
-                )
-                return response['message']['content'].strip()
+            critical_instructions = CONTINUING_CONVERSATION_INSTRUCTIONS
 
-        except Exception as e:
-            logger.error(f"Error generating Socratic response: {e}")
-            # Return fallback question
-            import random
-            return random.choice(FALLBACK_QUESTIONS)
+        # Equivalent to SOCRATIC_PROMPT_TEMPLATE.format(...) with the fields in order
+        f = _SOCRATIC_PROMPT_FRAGMENTS
+        return (
+            f[0] + emphasis + f[1] + context_section + f[2] + math_info + f[3]
+            + student_message + f[4] + critical_instructions + f[5] + ocr_instruction + f[6]
+        )
 
     def detect_final_answer(self, student_message: str, math_context: Optional[Dict] = None) -> bool:
         """Detect if student provided a final answer (e.g., "x = 1").
@@ -495,17 +1533,15 @@ Respond as a Socratic tutor (2-3 sentences max):"""
         message_lower = student_message.lower().strip()
 
         # Exclude questions - if message contains question words, it's not a final answer
-        question_indicators = ['what', 'how', 'why', 'when', 'where', 'which', 'who', '?']
-        if any(indicator in message_lower for indicator in question_indicators):
+        if '?' in message_lower or not QUESTION_WORDS.isdisjoint(_WORD_RE.findall(message_lower)):
             return False
 
-        # Pattern 1: Simple variable assignment (x = number)
-        import re
-        if re.match(r'^[a-z]\s*=\s*-?\d+(\.\d+)?$', message_lower):
+        # Pattern 1: Just a number (could be final answer)
+        if _NUMBER_RE.fullmatch(message_lower):
             return True
 
-        # Pattern 2: Just a number (could be final answer)
-        if re.match(r'^-?\d+(\.\d+)?$', message_lower):
+        # Pattern 2: Simple variable assignment (x = number)
+        if '=' in message_lower and _VARIABLE_ASSIGNMENT_RE.match(message_lower):
             return True
 
         # Pattern 3: Math context shows this is a solution (but only if it's a short message)
@@ -563,41 +1599,37 @@ Respond as a Socratic tutor (2-3 sentences max):"""
         for attempt in range(1, self.max_retries + 1):
             logger.info(f"Generating response, attempt {attempt}/{self.max_retries}")
 
-            # Generate response
-            response = self.generate_socratic_response(
+            # Generate one response, or several candidates on a retry
+            responses = self._generate_attempt(
                 student_message,
                 conversation_context,
                 attempt,
-                math_context,
-                is_correct_answer
+                math_context
             )
 
-            # Validate response
-            is_valid, reason, confidence = self.validate_response(
-                student_message,
-                response
-            )
-
-            if is_valid:
-                logger.info(f"Response validated successfully on attempt {attempt}")
-                return {
-                    'response': response,
-                    'validation_passed': True,
-                    'attempts': attempt,
-                    'confidence': confidence,
-                    'reason': reason,
-                    'is_final_answer': is_final_answer
-                }
+            # Validate them together (at most one LLM call)
+            results = self._validate_candidates(student_message, responses)
+
+            for response, (is_valid, reason, confidence) in zip(responses, results):
+                if is_valid:
+                    logger.info(f"Response validated successfully on attempt {attempt}")
+                    return {
+                        'response': response,
+                        'validation_passed': True,
+                        'attempts': attempt,
+                        'confidence': confidence,
+                        'reason': reason,
+                        'is_final_answer': is_final_answer
+                    }
 
             logger.warning(
-                f"Response failed validation on attempt {attempt}: {reason} "
+                f"{len(responses)} response(s) failed validation on attempt {attempt}: {reason} "
                 f"(confidence: {confidence})"
             )
 
         # All attempts failed, return fallback
         logger.error("All validation attempts failed, using fallback question")
-        import random
-        fallback = random.choice(FALLBACK_QUESTIONS)
+        fallback = _choose_fallback_question()
 
         return {
             'response': fallback,
@@ -608,6 +1640,119 @@ Respond as a Socratic tutor (2-3 sentences max):"""
             'is_final_answer': is_final_answer
         }
 
+    async def agenerate_validated_response(
+        self,
+        student_message: str,
+        conversation_context: Optional[str] = None,
+        math_context: Optional[Dict] = None,
+        is_correct_answer: Optional[bool] = None
+    ) -> Dict[str, any]:
+        """Async generate-and-validate loop that overlaps retries with validation.
+
+        Attempt 1 usually passes, so it is a single response validated on its
+        own; retries ask for several candidates, as in
+        generate_validated_response. From attempt 2, attempt N+1 is generated
+        while attempt N is validated, so a further failed validation does not
+        pay a full extra round trip. The speculative generation is cancelled
+        once a response passes.
+
+        Args:
+            student_message: Student's question
+            conversation_context: Previous conversation history
+            math_context: Optional SymPy computation results
+            is_correct_answer: If this is a final answer, whether it's correct (None if not a final answer)
+
+        Returns:
+            Dictionary with response, validation_passed, attempts, etc.
+        """
+        is_final_answer = is_correct_answer is not None
+
+        if is_correct_answer is not None:
+            logger.info(f"Skipping validation for {'celebration' if is_correct_answer else 'correction'} response")
+            response = await self.agenerate_socratic_response(
+                student_message,
+                conversation_context,
+                1,
+                math_context,
+                is_correct_answer
+            )
+            return {
+                'response': response,
+                'validation_passed': True,
+                'attempts': 1,
+                'confidence': 1.0,
+                'reason': 'Validation skipped for acknowledgment response',
+                'is_final_answer': is_final_answer
+            }
+
+        def start_generation(attempt: int) -> asyncio.Task:
+            return asyncio.create_task(self._agenerate_attempt(
+                student_message,
+                conversation_context,
+                attempt,
+                math_context
+            ))
+
+        next_generation: Optional[asyncio.Task] = None
+        try:
+            for attempt in range(1, self.max_retries + 1):
+                logger.info(f"Generating response, attempt {attempt}/{self.max_retries}")
+                if next_generation is None:
+                    next_generation = start_generation(attempt)
+                responses = await next_generation
+                next_generation = None
+
+                # Retries speculatively start the next attempt while this one is validated
+                if 1 < attempt < self.max_retries:
+                    next_generation = start_generation(attempt + 1)
+
+                results = await self._avalidate_candidates(student_message, responses)
+
+                for response, (is_valid, reason, confidence) in zip(responses, results):
+                    if is_valid:
+                        logger.info(f"Response validated successfully on attempt {attempt}")
+                        return {
+                            'response': response,
+                            'validation_passed': True,
+                            'attempts': attempt,
+                            'confidence': confidence,
+                            'reason': reason,
+                            'is_final_answer': is_final_answer
+                        }
+
+                logger.warning(
+                    f"{len(responses)} response(s) failed validation on attempt {attempt}: {reason} "
+                    f"(confidence: {confidence})"
+                )
+        finally:
+            if next_generation is not None:
+                next_generation.cancel()
+
+        logger.error("All validation attempts failed, using fallback question")
+        return {
+            'response': _choose_fallback_question(),
+            'validation_passed': False,
+            'attempts': self.max_retries,
+            'confidence': 1.0,
+            'reason': 'Used fallback after max retries',
+            'is_final_answer': is_final_answer
+        }
+
+    def _analyze_message(self, message: str) -> MessageAnalysis:
+        """Run OCR and geometry detection in a single pass over the message.
+
+        Equivalent to calling ``_detect_ocr_content`` and
+        ``_detect_geometry_content`` but lowercases and scans the message once;
+        results are memoized per message text.
+
+        Args:
+            message: The student message to analyze
+
+        Returns:
+            MessageAnalysis with is_ocr and is_geometry flags
+        """
+        return _analyze_message_text(message)
+
     def _detect_ocr_content(self, message: str) -> bool:
         """Detect if message content came from OCR/Vision extraction.
 
@@ -620,30 +1765,15 @@ Respond as a Socratic tutor (2-3 sentences max):"""
         Returns:
             True if message appears to be from OCR extraction
         """
-        # Check for OCR output patterns from our vision service
-        ocr_indicators = [
-            'Linear equation:',
-            'ALGEBRA:',
-            'GEOMETRY:',
-            'ARITHMETIC:',
-            'Right triangle',
-            'This image shows',
-            'equation:',
-            'problem:',
-            'Given values:',
-            'Find:',
-            'Pythagorean theorem',
-        ]
-
         message_lower = message.lower()
 
         # Check if any OCR indicator is present
-        for indicator in ocr_indicators:
-            if indicator.lower() in message_lower:
+        for indicator in OCR_INDICATORS:
+            if indicator in message_lower:
                 return True
 
         # Check for LaTeX patterns (our OCR always uses these)
-        if '$' in message and any(c.isalpha() for c in message):
+        if '$' in message and _LETTER_RE.search(message):
             # Has LaTeX delimiters and variables - likely from OCR
             return True
 
@@ -661,63 +1791,5 @@ Respond as a Socratic tutor (2-3 sentences max):"""
         Returns:
             True if message appears to contain geometry content
         """
-        message_lower = message.lower()
-
-        # Geometry shape indicators
-        shape_keywords = [
-            'triangle', 'circle', 'rectangle', 'square', 'polygon',
-            'parallelogram', 'trapezoid', 'rhombus', 'pentagon',
-            'hexagon', 'octagon', 'quadrilateral', 'line segment',
-            'ray', 'arc', 'chord', 'tangent', 'secant'
-        ]
-
-        # Geometry measurement indicators
-        measurement_keywords = [
-            'angle', 'degree', 'radius', 'diameter', 'circumference',
-            'perimeter', 'area', 'volume', 'surface area', 'height',
-            'base', 'hypotenuse', 'leg', 'altitude', 'median',
-            'side length', 'vertex', 'vertices'
-        ]
-
-        # Geometry relationship indicators
-        relationship_keywords = [
-            'parallel', 'perpendicular', 'congruent', 'similar',
-            'bisect', 'bisector', 'midpoint', 'inscribed',
-            'circumscribed', 'tangent to', 'intersect'
-        ]
-
-        # Geometry theorem/property indicators
-        theorem_keywords = [
-            'pythagorean', 'theorem', 'sohcahtoa', 'sine', 'cosine',
-            'tangent', 'isosceles', 'equilateral', 'scalene',
-            'right angle', 'acute', 'obtuse', 'supplementary',
-            'complementary', 'vertical angles', 'corresponding'
-        ]
-
-        # Check for any geometry indicators
-        all_keywords = (
-            shape_keywords + measurement_keywords +
-            relationship_keywords + theorem_keywords
-        )
-
-        for keyword in all_keywords:
-            if keyword in message_lower:
-                return True
-
-        # Check for geometry notation patterns
-        geometry_patterns = [
-            r'triangle\s+[A-Z]{3}',  # Triangle ABC
-            r'angle\s+[A-Z]{1,3}',  # Angle A, Angle ABC
-            r'∠[A-Z]{1,3}',  # ∠ABC
-            r'[A-Z]{2}\s*[|‖]\s*[A-Z]{2}',  # AB || CD (parallel)
-            r'[A-Z]{2}\s*[⊥]\s*[A-Z]{2}',  # AB ⊥ CD (perpendicular)
-            r'\d+\s*°',  # 90°
-            r'\d+\s*degrees?',  # 90 degrees
-            r'side\s+[A-Z]{2}',  # side AB
-        ]
-
-        for pattern in geometry_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                return True
-
-        return False
+        # Keywords and notation are matched by precompiled combined patterns
+        return self._analyze_message(message).is_geometry
@@ -1,11 +1,295 @@
 """SymPy Service - symbolic mathematics computation wrapper."""
+import atexit
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List, Union
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from tokenize import TokenError
+from typing import Callable, Dict, Any, Optional, List, Union
 import sympy
-from sympy import sympify, simplify, factor, expand, solve, diff, integrate, SympifyError, symbols, Eq
+from sympy import simplify, factor, expand, solve, diff, integrate, SympifyError, symbols, Eq
+from sympy import Expr, cancel, count_ops, trigsimp
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication
+from app.services.redis_service import get_redis_service
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of distinct parsed expressions kept in memory
+PARSE_CACHE_SIZE = 4096
+
+# Transformations sympify applies to strings, plus implicit multiplication so
+# student input like "2x + 3" or "x(x+1)" parses. Symbol splitting ("xy" ->
+# x*y) is deliberately left out so multi-letter names keep their meaning.
+PARSE_TRANSFORMATIONS = standard_transformations + (implicit_multiplication,)
+
+# Maximum number of distinct variable symbols kept in memory
+SYMBOL_CACHE_SIZE = 64
+
+# Maximum number of results kept per operation (simplify, factor, ...)
+RESULT_CACHE_SIZE = 4096
+
+# SymPy operations run in a process pool so CPU-heavy calls (simplify,
+# integrate) don't serialize on the GIL; each call is bounded by a timeout.
+# A running computation cannot be cancelled, so a timeout kills the pool's
+# workers and the next call starts a fresh pool.
+COMPUTE_MAX_WORKERS = os.cpu_count() or 1
+COMPUTE_TIMEOUT_SECONDS = 5
+
+
+# Runs of whitespace (including tabs/newlines from pasted input)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# An equation has one bare "=" (not part of <=, >=, != or ==)
+_EQUATION_RE = re.compile(r'[^=<>!]*=[^=]*')
+
+
+def _normalize_expression(expr_str: str) -> str:
+    """Normalize common input formats before parsing (e.g. ``^`` to ``**``).
+
+    Whitespace runs collapse to a single space (the tokenizer treats them
+    alike), so spacing variants of an expression share cache entries.
+    """
+    return _WHITESPACE_RE.sub(' ', expr_str.replace('^', '**')).strip()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(expr_str: str):
+    """Parse a normalized expression string, memoized across calls.
+
+    Calls parse_expr directly with PARSE_TRANSFORMATIONS; syntax errors are
+    raised as SympifyError, as sympify would. SymPy expressions are
+    immutable, so the cached objects are safe to share. Parse errors
+    propagate and are not cached.
+    """
+    try:
+        return parse_expr(expr_str, transformations=PARSE_TRANSFORMATIONS)
+    except (SyntaxError, TokenError) as e:
+        raise SympifyError('could not parse %r' % expr_str, e) from e
+
+
+@lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _sym(name: str):
+    """Return the SymPy symbol for a variable name, memoized across calls."""
+    return symbols(name)
+
+
+# Worker functions run in the compute pool. They live at module scope so
+# they can be pickled, and take/return plain strings (solve returns a tuple
+# of strings).
+
+def simplify_fast(expr):
+    """Simplify with a targeted strategy chosen by expression shape.
+
+    Generic ``simplify`` tries many strategies; the algebra students enter
+    is usually a polynomial or rational function, where ``expand``/``cancel``
+    alone give the same result far faster. Like ``simplify``, the shorter of
+    the original and rewritten forms is kept, so ``(x + 1)**2`` stays
+    factored. Other expressions try ``cancel`` first (treating radicals and
+    exponentials as generators) and fall back to ``simplify`` only when
+    that does not shorten them.
+    """
+    if not isinstance(expr, Expr):
+        return simplify(expr)
+    if expr.is_polynomial():
+        candidate = expand(expr)
+    elif expr.is_rational_function():
+        candidate = cancel(expr)
+    elif expr.has(TrigonometricFunction):
+        return trigsimp(expr)
+    else:
+        candidate = cancel(expr)
+        if count_ops(candidate) < count_ops(expr):
+            return candidate
+        return simplify(expr)
+    return min(expr, candidate, key=count_ops)
+
+
+def _worker_simplify(expr_str: str) -> str:
+    return str(simplify_fast(_parse_cached(expr_str)))
+
+
+def _worker_factor(expr_str: str) -> str:
+    return str(factor(_parse_cached(expr_str)))
+
+
+def _worker_expand(expr_str: str) -> str:
+    return str(expand(_parse_cached(expr_str)))
+
+
+def _worker_diff(expr_str: str, variable: str) -> str:
+    return str(diff(_parse_cached(expr_str), _sym(variable)))
+
+
+def _worker_integrate(expr_str: str, variable: str) -> str:
+    return str(integrate(_parse_cached(expr_str), _sym(variable)))
+
+
+def _worker_solve(left_str: str, right_str: Optional[str], variable: str) -> tuple:
+    """Solve ``left = right`` (or ``left = 0`` when right_str is None) for variable."""
+    expr = _parse_cached(left_str)
+    if right_str is not None:
+        expr = expr - _parse_cached(right_str)
+    return tuple(str(sol) for sol in solve(expr, _sym(variable)))
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the shared compute pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=COMPUTE_MAX_WORKERS)
+            logger.info(f"Started SymPy compute pool with {COMPUTE_MAX_WORKERS} workers")
+        return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    """Discard a broken pool so the next call starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _terminate_pool(pool: ProcessPoolExecutor) -> None:
+    """Discard a pool and kill its workers, including any stuck mid-computation.
+
+    Other calls still waiting on the pool fail with BrokenProcessPool.
+    """
+    processes = list((pool._processes or {}).values())
+    _reset_pool(pool)
+    for process in processes:
+        process.terminate()
+
+
+def shutdown_pool() -> None:
+    """Stop the compute pool and kill its workers.
+
+    Registered with atexit: under eventlet's monkey_patch the interpreter
+    otherwise hangs at exit waiting on the pool's workers.
+    """
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        _terminate_pool(pool)
+
+
+atexit.register(shutdown_pool)
+
+
+def _run_in_pool(worker: Callable, *args) -> Any:
+    """Run a SymPy worker in the compute pool, bounded by COMPUTE_TIMEOUT_SECONDS.
+
+    Args:
+        worker: Module-level worker function
+        *args: Picklable worker arguments
+
+    Returns:
+        The worker's return value
+
+    Raises:
+        TimeoutError: If the computation does not finish in time
+    """
+    pool = _get_pool()
+    try:
+        future = pool.submit(worker, *args)
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        pool = _get_pool()
+        future = pool.submit(worker, *args)
+
+    try:
+        return future.result(timeout=COMPUTE_TIMEOUT_SECONDS)
+    except FuturesTimeoutError:
+        if not future.cancel():
+            _terminate_pool(pool)
+            logger.warning("Terminated SymPy compute pool after a timeout")
+        raise TimeoutError(f"computation timed out after {COMPUTE_TIMEOUT_SECONDS}s")
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise
+
+
+def _compute(operation: str, worker: Callable, *args) -> Any:
+    """Get an operation result from the shared Redis cache, computing it on a miss.
+
+    The SymPy version is part of the cache key, so an upgrade (which may
+    change result formatting) starts from an empty shared cache.
+
+    Args:
+        operation: Operation name used in the cache key
+        worker: Module-level worker function
+        *args: Worker arguments (strings)
+
+    Returns:
+        The worker's (JSON-serializable) result
+    """
+    shared_cache = get_redis_service()
+    args_hash = hashlib.sha256(repr((sympy.__version__,) + args).encode('utf-8')).hexdigest()
+
+    cached = shared_cache.get_cached_sympy_result(operation, args_hash)
+    if cached is not None:
+        return cached
+
+    result = _run_in_pool(worker, *args)
+    shared_cache.cache_sympy_result(operation, args_hash, result)
+    return result
+
+
+# Operation results are pure functions of (normalized expression, variable),
+# so they are memoized as strings: in process (hot tier), then in Redis so
+# they survive restarts and are shared between workers. Exceptions
+# (including timeouts) propagate and are not cached.
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _simplify_cached(expr_str: str) -> str:
+    return _compute('simplify', _worker_simplify, expr_str)
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _factor_cached(expr_str: str) -> str:
+    return _compute('factor', _worker_factor, expr_str)
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _expand_cached(expr_str: str) -> str:
+    return _compute('expand', _worker_expand, expr_str)
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _diff_cached(expr_str: str, variable: str) -> str:
+    return _compute('diff', _worker_diff, expr_str, variable)
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _integrate_cached(expr_str: str, variable: str) -> str:
+    return _compute('integrate', _worker_integrate, expr_str, variable)
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def _solve_cached(left_str: str, right_str: Optional[str], variable: str) -> tuple:
+    return tuple(_compute('solve', _worker_solve, left_str, right_str, variable))
+
+
+_CACHED_OPERATIONS = (
+    _parse_cached,
+    _simplify_cached,
+    _factor_cached,
+    _expand_cached,
+    _diff_cached,
+    _integrate_cached,
+    _solve_cached,
+)
+
 
 class SymPyService:
     """Service wrapper for SymPy operations with error handling."""
@@ -14,6 +298,16 @@ class SymPyService:
         """Initialize SymPy service."""
         logger.info(f"Initialized SymPy service (version {sympy.__version__})")
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the in-process parse and result caches.
+
+        Results shared through Redis are cleared with
+        ``get_redis_service().invalidate_sympy_cache()``.
+        """
+        for cached in _CACHED_OPERATIONS:
+            cached.cache_clear()
+
     def _standardize_response(
         self,
         success: bool,
@@ -47,10 +341,10 @@ class SymPyService:
         """
         try:
             # Handle common input formats: convert ^ to **
-            expr_str = expr_str.replace('^', '**')
+            expr_str = _normalize_expression(expr_str)
 
-            # Parse using sympify
-            expr = sympify(expr_str)
+            # Parse (cached, repeated expressions are common)
+            expr = _parse_cached(expr_str)
 
             logger.debug(f"Successfully parsed expression: {expr_str}")
             return self._standardize_response(True, result=expr)
@@ -85,11 +379,10 @@ class SymPyService:
             if not parse_result['success']:
                 return parse_result
 
-            expr = parse_result['result']
-            simplified = simplify(expr)
+            simplified = _simplify_cached(_normalize_expression(expr_str))
 
             logger.debug(f"Simplified '{expr_str}' to '{simplified}'")
-            return self._standardize_response(True, result=str(simplified))
+            return self._standardize_response(True, result=simplified)
 
         except Exception as e:
             error_msg = f"Simplification error: {str(e)}"
@@ -110,11 +403,10 @@ class SymPyService:
             if not parse_result['success']:
                 return parse_result
 
-            expr = parse_result['result']
-            factored = factor(expr)
+            factored = _factor_cached(_normalize_expression(expr_str))
 
             logger.debug(f"Factored '{expr_str}' to '{factored}'")
-            return self._standardize_response(True, result=str(factored))
+            return self._standardize_response(True, result=factored)
 
         except Exception as e:
             error_msg = f"Factoring error: {str(e)}"
@@ -135,11 +427,10 @@ class SymPyService:
             if not parse_result['success']:
                 return parse_result
 
-            expr = parse_result['result']
-            expanded = expand(expr)
+            expanded = _expand_cached(_normalize_expression(expr_str))
 
             logger.debug(f"Expanded '{expr_str}' to '{expanded}'")
-            return self._standardize_response(True, result=str(expanded))
+            return self._standardize_response(True, result=expanded)
 
         except Exception as e:
             error_msg = f"Expansion error: {str(e)}"
@@ -172,19 +463,18 @@ class SymPyService:
                 if not right_parse['success']:
                     return right_parse
 
-                expr = left_parse['result'] - right_parse['result']
+                left_str = _normalize_expression(left)
+                right_str = _normalize_expression(right)
             else:
                 # Assume = 0
                 parse_result = self.parse_expression(equation_str)
                 if not parse_result['success']:
                     return parse_result
-                expr = parse_result['result']
+                left_str = _normalize_expression(equation_str)
+                right_str = None
 
-            # Get the variable symbol
-            var = symbols(variable)
-
-            # Solve
-            solutions = solve(expr, var)
+            # Solve (cached by normalized equation and variable); solutions are strings
+            solutions = list(_solve_cached(left_str, right_str, variable))
 
             if not solutions:
                 return self._standardize_response(
@@ -197,7 +487,7 @@ class SymPyService:
                 )
 
             # Handle special case: infinite solutions
-            if solutions == [True]:
+            if solutions == ['True']:
                 return self._standardize_response(
                     True,
                     result={
@@ -207,15 +497,13 @@ class SymPyService:
                     }
                 )
 
-            solution_strs = [str(sol) for sol in solutions]
-
-            logger.debug(f"Solved '{equation_str}' for {variable}: {solution_strs}")
+            logger.debug(f"Solved '{equation_str}' for {variable}: {solutions}")
             return self._standardize_response(
                 True,
                 result={
                     'solvable': True,
-                    'solutions': solution_strs,
-                    'count': len(solution_strs)
+                    'solutions': solutions,
+                    'count': len(solutions)
                 }
             )
 
@@ -224,6 +512,66 @@ class SymPyService:
             logger.error(f"Error solving '{equation_str}': {e}")
             return self._standardize_response(False, error=error_msg)
 
+    def process_expression(
+        self,
+        expr_str: str,
+        variable: str = 'x'
+    ) -> Dict[str, Any]:
+        """Simplify an expression, or solve it if it is an equation.
+
+        Equations (a single bare ``=``) are solved for variable; anything
+        else, including inequalities such as ``x <= 5``, is simplified.
+        Every step reuses the cached parse, so each side of the input is
+        parsed once.
+
+        Args:
+            expr_str: Expression or equation string
+            variable: Variable to solve equations for (default: 'x')
+
+        Returns:
+            Standardized response whose result holds 'type' ('equation' or
+            'expression'), 'parsed', 'simplified', 'solutions' and
+            'operations' (the SymPy operations that succeeded)
+        """
+        result = {
+            'type': 'expression',
+            'parsed': None,
+            'simplified': None,
+            'solutions': [],
+            'operations': []
+        }
+
+        if _EQUATION_RE.fullmatch(expr_str):
+            result['type'] = 'equation'
+            solve_result = self.solve_equation(expr_str, variable)
+            if not solve_result['success']:
+                return solve_result
+
+            # Both sides parsed successfully inside solve_equation
+            left, right = expr_str.split('=', 1)
+            result['parsed'] = (
+                f"{_parse_cached(_normalize_expression(left))} = "
+                f"{_parse_cached(_normalize_expression(right))}"
+            )
+            result['operations'].append('parse')
+
+            if solve_result['result']['solvable']:
+                result['solutions'] = solve_result['result']['solutions']
+                result['operations'].append('solve')
+        else:
+            parse_result = self.parse_expression(expr_str)
+            if not parse_result['success']:
+                return parse_result
+            result['parsed'] = str(parse_result['result'])
+            result['operations'].append('parse')
+
+            simplify_result = self.simplify_expression(expr_str)
+            if simplify_result['success']:
+                result['simplified'] = simplify_result['result']
+                result['operations'].append('simplify')
+
+        return self._standardize_response(True, result=result)
+
     def differentiate(
         self,
         expr_str: str,
@@ -243,13 +591,10 @@ class SymPyService:
             if not parse_result['success']:
                 return parse_result
 
-            expr = parse_result['result']
-            var = symbols(variable)
-
-            derivative = diff(expr, var)
+            derivative = _diff_cached(_normalize_expression(expr_str), variable)
 
             logger.debug(f"Differentiated '{expr_str}' w.r.t. {variable}: {derivative}")
-            return self._standardize_response(True, result=str(derivative))
+            return self._standardize_response(True, result=derivative)
 
         except Exception as e:
             error_msg = f"Differentiation error: {str(e)}"
@@ -275,13 +620,10 @@ class SymPyService:
             if not parse_result['success']:
                 return parse_result
 
-            expr = parse_result['result']
-            var = symbols(variable)
-
-            integral = integrate(expr, var)
+            integral = _integrate_cached(_normalize_expression(expr_str), variable)
 
             logger.debug(f"Integrated '{expr_str}' w.r.t. {variable}: {integral}")
-            return self._standardize_response(True, result=str(integral))
+            return self._standardize_response(True, result=integral)
 
         except Exception as e:
             error_msg = f"Integration error: {str(e)}"
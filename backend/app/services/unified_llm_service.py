@@ -4,12 +4,22 @@ This module provides a unified interface that automatically selects between
 Ollama and Bedrock based on environment configuration.
 """
 
+import importlib
 import os
 import logging
+import threading
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Load the configured backend's module at import so the first request doesn't
+# pay for it (boto3 in particular is slow to import). __init__ still imports
+# its factory itself in case the configuration changes after import.
+if os.environ.get('USE_AWS_BEDROCK', 'false').lower() == 'true':
+    importlib.import_module('app.services.bedrock_service')
+else:
+    importlib.import_module('app.services.llm_service')
+
 
 class UnifiedLLMService:
     """Unified LLM service that routes to Ollama or Bedrock based on configuration."""
@@ -58,6 +68,33 @@ class UnifiedLLMService:
             **kwargs
         )
 
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        """Async version of generate that doesn't block the event loop.
+
+        Args:
+            prompt: User message/prompt
+            system_prompt: Optional system message
+            temperature: Sampling temperature
+            **kwargs: Additional service-specific parameters
+
+        Returns:
+            The generated completion text
+        """
+        logger.debug(f"Generating (async) with {self.service_name}: prompt_length={len(prompt)}")
+
+        return await self.service.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            **kwargs
+        )
+
     def check_health(self) -> Dict[str, Any]:
         """Check health of the configured LLM service.
 
@@ -65,6 +102,19 @@ class UnifiedLLMService:
             Dict with health status information
         """
         health = self.service.check_health()
+        return self._annotate_health(health)
+
+    async def acheck_health(self) -> Dict[str, Any]:
+        """Async version of check_health.
+
+        Returns:
+            Dict with health status information
+        """
+        health = await self.service.acheck_health()
+        return self._annotate_health(health)
+
+    def _annotate_health(self, health: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the routing details to a backend health report."""
         health['service_name'] = self.service_name
         health['use_bedrock'] = self.use_bedrock
         return health
@@ -72,15 +122,20 @@ class UnifiedLLMService:
 
 # Singleton instance
 _unified_llm_service: Optional[UnifiedLLMService] = None
+_unified_llm_service_lock = threading.Lock()
 
 
 def get_unified_llm_service() -> UnifiedLLMService:
     """Get the singleton unified LLM service instance.
 
+    Thread-safe: concurrent first calls construct the service only once.
+
     Returns:
         The global UnifiedLLMService instance
     """
     global _unified_llm_service
     if _unified_llm_service is None:
-        _unified_llm_service = UnifiedLLMService()
+        with _unified_llm_service_lock:
+            if _unified_llm_service is None:
+                _unified_llm_service = UnifiedLLMService()
     return _unified_llm_service
@@ -4,28 +4,238 @@ Enhanced with chain-of-thought prompting for improved OCR accuracy (Story 8-1).
 Temperature set to 0.0 for deterministic output per research findings.
 Includes uncertainty markers and structured JSON output.
 """
+import asyncio
+import atexit
 import logging
 import os
 import re
-import base64
+import tempfile
+import threading
 import time
-import random
-import hashlib
-import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict, field
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from functools import cached_property
+import httpx
+import orjson
+from openai import APIError, AsyncOpenAI, OpenAI
+
+from app.services.image_cache import ImageResultCache, b64encode, image_content_hash
 
 logger = logging.getLogger(__name__)
 
+# Try to import Pillow for downscaling large uploads - may not be available in all environments
+PIL_AVAILABLE = False
+try:
+    from PIL import ExifTags, Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Pillow not available, images will be sent at full size: {e}")
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1
+HTTP2_AVAILABLE = False
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    logger.info("h2 not available, Vision API calls will use HTTP/1.1")
+
+# Maximum number of Vision API calls in flight, kept under the account's rate
+# limit; also the default fan-out for aextract_many / extract_texts_from_images
+OCR_CONCURRENCY = int(os.environ.get('OPENAI_VISION_CONCURRENCY', '10'))
+# Shared by all VisionService instances so concurrent requests share the limit
+_vision_call_slots = threading.BoundedSemaphore(OCR_CONCURRENCY)
+
+# Pooled connections for Vision API calls; HTTP/2 multiplexes concurrent OCRs.
+# The pool is sized so every allowed in-flight call can keep its connection.
+VISION_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+VISION_HTTP_LIMITS = httpx.Limits(
+    max_connections=max(20, 2 * OCR_CONCURRENCY),
+    max_keepalive_connections=max(10, OCR_CONCURRENCY)
+)
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+# Model availability is re-checked hourly. After failed probes the check
+# fast-fails without calling the API for 2, 4, 8... seconds, capped at a minute.
+MODEL_AVAILABILITY_TTL_SECONDS = 3600
+MODEL_UNAVAILABLE_TTL_SECONDS = 60
+# Probes skip retries and time out quickly so readiness checks never stall
+MODEL_PROBE_TIMEOUT_SECONDS = 5.0
+_availability_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Consecutive failed probes per model
+_availability_failures: Dict[str, int] = {}
+_availability_lock = threading.Lock()
+
+# Maximum number of OCR results kept in memory, keyed by image content.
+# Shared by all VisionService instances (HybridOCRService creates one per call).
+# The routes keep a second, cross-process tier in Redis (RedisService.get_cached_ocr).
+OCR_CACHE_SIZE = 512
+_ocr_cache = ImageResultCache(OCR_CACHE_SIZE)
+
+# Problem types that are math by definition
+MATH_PROBLEM_TYPES = frozenset({'algebra', 'geometry', 'arithmetic'})
+
+# The Vision API scales high-detail images to fit 2048x2048, then to a 768px
+# shortest side; uploads are downscaled to the same size before encoding
+VISION_MAX_DIMENSION = 2048
+VISION_MAX_SHORT_SIDE = 768
+RESIZED_JPEG_QUALITY = 90
+# EXIF orientations that rotate the image by 90 degrees, swapping width and height
+_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+# Low detail shows the model a single 512x512 view for a flat 85 tokens; images
+# that already fit lose nothing and skip the extra high-detail tile tokens
+LOW_DETAIL_MAX_DIMENSION = 512
+
+# Retries for rate-limit (429), overloaded (5xx) and connection errors. The
+# OpenAI client backs off exponentially with jitter and honours Retry-After.
+VISION_MAX_RETRIES = 4
+
+# Images packed into one Vision request by extract_texts_batched; each image
+# keeps its own output budget so replies aren't truncated
+MULTI_IMAGE_BATCH_SIZE = 4
+OCR_MAX_TOKENS_PER_IMAGE = 1500
+
+# OpenAI Batch API settings for non-interactive OCR (half price, 24h window)
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW = '24h'
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_TERMINAL_STATUSES = frozenset({'completed', 'failed', 'expired', 'cancelled'})
+
+# Patterns used on every OCR response, compiled once at import
+# Characters that matter when scanning for a JSON object
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+_LATEX_RE = re.compile(r'\$([^$]+)\$')
+# [unclear:best_guess/alternative] or [unreadable]
+_UNCERTAINTY_MARKER_RE = re.compile(r'\[unclear:([^/\]]+)/([^\]]+)\]|\[unreadable\]')
+# Subject hints in their usual spellings, mapped to the lowercase form used internally
+_SUBJECT_MAP = {
+    spelling: subject
+    for subject in ('algebra', 'geometry', 'arithmetic')
+    for spelling in (subject, subject.capitalize(), subject.upper())
+}
+
+# Geometry indicators, matched as substrings of the lowercased text
+_GEOMETRY_TERMS = ('triangle', 'circle', 'rectangle', 'square', 'angle',
+                   'parallel', 'perpendicular', 'radius', 'diameter',
+                   'area', 'perimeter', 'polygon', 'line segment')
+_GEOMETRY_TERMS_RE = re.compile('|'.join(map(re.escape, _GEOMETRY_TERMS)))
+# Any math symbol or the LaTeX "$" delimiter
+_MATH_CHAR_RE = re.compile('[×÷±≠≤≥√π∫∑∞=$]')
+# Variable next to an operator, on either side (algebra)
+_VARIABLE_OPERATOR_RE = re.compile(r'[a-zA-Z]\s*[+\-*/=]|[+\-*/=]\s*[a-zA-Z]')
+# Variable followed by an operator and a number (equation)
+_EQUATION_RE = re.compile(r'[a-zA-Z]\s*[+\-*/=]\s*\d+')
+# Numbers joined by an operator (arithmetic)
+_NUMERIC_EQ_RE = re.compile(r'\d+\s*[+\-*/=]\s*\d+')
+
+
+def _get_http_client() -> httpx.Client:
+    """Get the HTTP client shared by all VisionService instances.
+
+    HybridOCRService creates a VisionService per call, so sharing the client
+    keeps TLS connections to the API warm across instances.
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    http2=HTTP2_AVAILABLE, limits=VISION_HTTP_LIMITS, timeout=VISION_HTTP_TIMEOUT
+                )
+                # Close pooled connections cleanly on interpreter shutdown
+                atexit.register(_http_client.close)
+    return _http_client
+
+
+def _invalidate_model_availability(model_name: str) -> None:
+    """Drop the cached availability of a model so the next check probes the API.
+
+    Called when a Vision call fails with an API error, so health checks don't
+    keep reporting a cached "available" for the rest of the TTL. Local
+    failures (unreadable files, unparseable replies) leave the cache alone.
+    """
+    with _availability_lock:
+        _availability_cache.pop(model_name, None)
+
+
+def _normalize_subject(subject: Optional[str]) -> Optional[str]:
+    """Lowercase a subject hint once at the API boundary.
+
+    Known subjects in their usual spellings are looked up without allocating;
+    anything else is lowercased. Empty values become None.
+    """
+    if not subject:
+        return None
+    normalized = _SUBJECT_MAP.get(subject)
+    return normalized if normalized is not None else subject.lower()
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """Return the first balanced ``{...}`` object in text, or None.
 
-@dataclass
+    Replies that are only a JSON object are returned as-is. Otherwise the
+    text is scanned from the first ``{``, tracking brace depth and ignoring
+    braces inside string literals; only brace, quote and backslash
+    characters are visited.
+    """
+    if text.startswith('{') and text.endswith('}'):
+        return text
+
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    skip_to = start
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        position = match.start()
+        if position < skip_to:
+            continue
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                skip_to = position + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:position + 1]
+    return None
+
+
+@dataclass(init=False)
 class UncertainRegion:
     """Represents an uncertain character region in OCR output (AC-4)."""
+    # Declared by hand (dataclass slots=True needs Python 3.10; mypy.ini targets
+    # 3.9). A slot cannot have a class-level default, so __init__ supplies the
+    # empty alternatives list.
+    __slots__ = ('position', 'character', 'confidence', 'alternatives')
+
     position: int
     character: str
     confidence: float
-    alternatives: List[str] = field(default_factory=list)
+    alternatives: List[str]
+
+    def __init__(
+        self,
+        position: int,
+        character: str,
+        confidence: float,
+        alternatives: Optional[List[str]] = None
+    ) -> None:
+        self.position = position
+        self.character = character
+        self.confidence = confidence
+        self.alternatives = [] if alternatives is None else alternatives
 
 
 # Chain-of-thought OCR prompt with 5-step structure (AC-2)
@@ -133,6 +343,28 @@ If something is unreadable, mark it as: "[unreadable]"
 Respond ONLY with the JSON object, no additional text."""
 
 
+# Subject hints appended after OCR_PROMPT. The fixed prompt comes first so
+# identical prefixes can be reused by the API's prompt caching.
+SUBJECT_HINTS = {
+    'algebra': '\n\nSUBJECT HINT: The student indicated this is an ALGEBRA problem (equations, expressions, variables).',
+    'arithmetic': '\n\nSUBJECT HINT: The student indicated this is an ARITHMETIC problem (basic calculations).'
+}
+
+# Full prompt per normalized subject, built once; unknown subjects use OCR_PROMPT
+_PROMPT_VARIANTS = {
+    None: OCR_PROMPT,
+    'geometry': GEOMETRY_PROMPT,
+    **{subject: OCR_PROMPT + hint for subject, hint in SUBJECT_HINTS.items()}
+}
+
+# Appended when several images share one request; the single-image prompt
+# stays unchanged in front of it so its prefix is still cached
+MULTI_IMAGE_INSTRUCTIONS = """
+
+MULTIPLE IMAGES: You will receive {count} images. Apply the instructions above to each image separately.
+Respond with a single JSON object {{"results": [...]}} where element i is the JSON object for image i, in the order the images are given."""
+
+
 class VisionService:
     """Service for Vision AI OCR using OpenAI GPT-4 Vision.
 
@@ -152,8 +384,29 @@ class VisionService:
             logger.error("OPENAI_API_KEY not found in environment variables")
             raise ValueError("OPENAI_API_KEY is required")
 
-        self.client = OpenAI(api_key=api_key)
-        logger.info(f"Initialized Vision service with model {model_name}")
+        self._api_key = api_key
+        self.client = OpenAI(
+            api_key=api_key, http_client=_get_http_client(), max_retries=VISION_MAX_RETRIES
+        )
+        self._async_call_slots = asyncio.Semaphore(OCR_CONCURRENCY)
+        logger.info("Initialized Vision service with model %s", model_name)
+
+    @cached_property
+    def async_client(self) -> AsyncOpenAI:
+        """Async OpenAI client, created on first async call.
+
+        Async connections are bound to an event loop, so each instance gets its
+        own pool. Building it loads an SSL context (tens of ms), which
+        instances used only synchronously (HybridOCRService creates one per
+        call) never pay.
+        """
+        return AsyncOpenAI(
+            api_key=self._api_key,
+            http_client=httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, limits=VISION_HTTP_LIMITS, timeout=VISION_HTTP_TIMEOUT
+            ),
+            max_retries=VISION_MAX_RETRIES
+        )
 
     def extract_text_from_image(self, image_path: str, subject: str = None) -> Dict[str, Any]:
         """Extract text and math from image using Vision AI with chain-of-thought prompting.
@@ -166,102 +419,595 @@ class VisionService:
             Dictionary with success, extracted_text, latex, confidence, math_detected,
             problem_type, and uncertain_regions (AC-4 enhanced response schema)
         """
+        subject = _normalize_subject(subject)
         try:
-            logger.info(f"Extracting text from image: {image_path}, subject: {subject}")
-
-            # Encode image as base64
-            with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-                base64_image = base64.b64encode(image_data).decode('utf-8')
-
-            # Calculate image hash for debugging and cache verification
-            image_hash = hashlib.md5(image_data).hexdigest()[:8]
-            logger.info(f"Image hash: {image_hash}, size: {len(base64_image)} chars")
-
-            # Determine image format from file extension
-            image_format = image_path.split('.')[-1].lower()
-            if image_format == 'jpg':
-                image_format = 'jpeg'
-
-            # Select prompt based on subject (AC-5: geometry-specific routing)
-            if subject and subject.lower() == 'geometry':
-                prompt_text = GEOMETRY_PROMPT
-                logger.info("Using GEOMETRY_PROMPT for geometry subject")
-            else:
-                prompt_text = OCR_PROMPT
-                # Add subject hint as prefix if provided
-                if subject:
-                    subject_hints = {
-                        'algebra': 'SUBJECT HINT: The student indicated this is an ALGEBRA problem (equations, expressions, variables).\n\n',
-                        'arithmetic': 'SUBJECT HINT: The student indicated this is an ARITHMETIC problem (basic calculations).\n\n'
-                    }
-                    hint = subject_hints.get(subject.lower(), '')
-                    if hint:
-                        prompt_text = hint + prompt_text
-
-            # Add cache-busting mechanism to force fresh OCR analysis
-            cache_buster = f"\n\n[Request ID: {int(time.time() * 1000)}-{random.randint(1000, 9999)}]"
-            prompt_text_final = prompt_text + cache_buster
-
-            logger.info(f"OCR request with cache-buster, image hash: {image_hash}")
+            logger.info("Extracting text from image: %s, subject: %s", image_path, subject)
+
+            image_data, image_hash, cache_key = self._read_image(image_path, subject)
+
+            # Identical uploads (retries, re-processed worksheets) reuse the earlier result
+            cached_result = _ocr_cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Returning cached OCR result for image hash: %s", image_hash)
+                return cached_result
+
+            # The raw bytes are released before decoding so only the encoded copies remain
+            image_url, detail = self._encode_image(image_path, image_data)
+            del image_data
+            image_url = image_url.decode('utf-8')
+            logger.info("OCR request, image hash: %s, size: %d chars", image_hash, len(image_url))
 
             # Call OpenAI Vision API with temperature=0.0 for deterministic OCR (AC-1)
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt_text_final
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/{image_format};base64,{base64_image}",
-                                    "detail": "high"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1500,
-                temperature=0.0  # Deterministic output for OCR accuracy (AC-1, Story 8-1)
-            )
+            with _vision_call_slots:
+                response = self.client.chat.completions.create(
+                    **self._ocr_request_body(self._select_prompt(subject), image_url, detail)
+                )
 
             raw_response = response.choices[0].message.content.strip()
-            logger.info(f"RAW OCR OUTPUT: {raw_response}")
-            logger.info(f"Subject hint used: {subject}")
-            logger.info(f"Image hash: {image_hash} - This verifies unique image processing")
+            # Raw output can be several KB; format it only when DEBUG is enabled
+            logger.debug("RAW OCR OUTPUT (image hash: %s, subject: %s): %s", image_hash, subject, raw_response)
+
+            result = self._finalize_ocr_result(raw_response, subject)
+
+            if result.get('success'):
+                _ocr_cache.put(cache_key, result)
+
+            return result
+
+        except Exception as e:
+            error_msg = f"OpenAI Vision API error: {str(e)}"
+            logger.error(f"OCR failed: {error_msg}")
+            if isinstance(e, APIError):
+                _invalidate_model_availability(self.model_name)
+            return self._ocr_error_result()
 
-            # Parse structured JSON response (AC-4)
-            result = self._parse_ocr_response(raw_response, subject)
+    async def aextract_text_from_image(self, image_path: str, subject: str = None) -> Dict[str, Any]:
+        """Async variant of extract_text_from_image.
 
-            # Detect if math content is present
-            result['math_detected'] = self._detect_math(result.get('extracted_text', ''))
+        File reading and base64 encoding run in the default executor so they
+        don't block the event loop while other requests are in flight.
 
-            logger.info(
-                f"OCR complete. Confidence: {result.get('confidence', 0):.2f}, "
-                f"Math detected: {result.get('math_detected')}, "
-                f"Problem type: {result.get('problem_type', 'unknown')}"
+        Args:
+            image_path: Path to image file
+            subject: Optional subject hint ('algebra', 'geometry', 'arithmetic')
+
+        Returns:
+            Same dictionary as extract_text_from_image
+        """
+        subject = _normalize_subject(subject)
+        try:
+            logger.info("Extracting text from image (async): %s, subject: %s", image_path, subject)
+            loop = asyncio.get_running_loop()
+
+            image_data, image_hash, cache_key = await loop.run_in_executor(
+                None, self._read_image, image_path, subject
             )
 
+            cached_result = _ocr_cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Returning cached OCR result for image hash: %s", image_hash)
+                return cached_result
+
+            image_url, detail = await loop.run_in_executor(None, self._encode_image, image_path, image_data)
+            del image_data
+            image_url = image_url.decode('utf-8')
+            logger.info("OCR request, image hash: %s, size: %d chars", image_hash, len(image_url))
+
+            async with self._async_call_slots:
+                response = await self.async_client.chat.completions.create(
+                    **self._ocr_request_body(self._select_prompt(subject), image_url, detail)
+                )
+
+            raw_response = response.choices[0].message.content.strip()
+            logger.debug("RAW OCR OUTPUT (image hash: %s, subject: %s): %s", image_hash, subject, raw_response)
+
+            result = self._finalize_ocr_result(raw_response, subject)
+
+            if result.get('success'):
+                _ocr_cache.put(cache_key, result)
+
             return result
 
         except Exception as e:
             error_msg = f"OpenAI Vision API error: {str(e)}"
             logger.error(f"OCR failed: {error_msg}")
-            return {
-                'success': False,
-                'error': "An error occurred during OCR processing.",
-                'extracted_text': '',
-                'latex': '',
-                'confidence': 0.0,
-                'math_detected': False,
-                'problem_type': 'unknown',
-                'uncertain_regions': []
-            }
+            if isinstance(e, APIError):
+                _invalidate_model_availability(self.model_name)
+            return self._ocr_error_result()
+
+    async def aextract_many(
+        self,
+        image_paths: List[str],
+        subject: str = None,
+        concurrency: int = OCR_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """Extract text from several images concurrently.
+
+        Args:
+            image_paths: Paths to image files
+            subject: Optional subject hint applied to every image
+            concurrency: Maximum number of Vision API calls in flight
+
+        Returns:
+            Results in the same order as image_paths
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(image_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aextract_text_from_image(image_path, subject=subject)
+
+        return await asyncio.gather(*(bounded(image_path) for image_path in image_paths))
+
+    def extract_texts_from_images(
+        self,
+        image_paths: List[str],
+        subject: str = None,
+        concurrency: int = OCR_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """Extract text from several images concurrently, for synchronous callers.
+
+        Calls run on a thread pool over the shared (thread-safe) HTTP client;
+        the work is almost entirely waiting on the API, so N images take
+        roughly the time of the slowest one. Async code should use
+        aextract_many instead.
+
+        Args:
+            image_paths: Paths to image files
+            subject: Optional subject hint applied to every image
+            concurrency: Maximum number of Vision API calls in flight
+
+        Returns:
+            Results in the same order as image_paths
+        """
+        if not image_paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(image_paths))) as executor:
+            return list(executor.map(
+                lambda image_path: self.extract_text_from_image(image_path, subject=subject),
+                image_paths
+            ))
+
+    def extract_texts_batched(
+        self,
+        image_paths: List[str],
+        subject: str = None,
+        batch_size: int = MULTI_IMAGE_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Extract text from several images, packing up to batch_size images per request.
+
+        The OCR prompt is sent once per request rather than once per image,
+        and cached images are not resent. Requests whose reply can't be
+        mapped back to their images fall back to one call per image.
+
+        Args:
+            image_paths: Paths to image files
+            subject: Optional subject hint applied to every image
+            batch_size: Maximum number of images per Vision API request
+
+        Returns:
+            Results in the same order as image_paths
+        """
+        subject = _normalize_subject(subject)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(image_paths)
+        # image content hash -> (cache key, data URL, detail, indexes of images with that content)
+        pending: Dict[str, Tuple[Tuple[str, str, str], str, str, List[int]]] = {}
+
+        for index, image_path in enumerate(image_paths):
+            try:
+                image_data, _, cache_key = self._read_image(image_path, subject)
+            except OSError as e:
+                logger.error(f"Failed to read image {image_path} for OCR: {e}")
+                results[index] = self._ocr_error_result()
+                continue
+
+            cached_result = _ocr_cache.get(cache_key)
+            if cached_result is not None:
+                results[index] = cached_result
+                continue
+
+            if cache_key[0] not in pending:
+                image_url, detail = self._encode_image(image_path, image_data)
+                del image_data
+                pending[cache_key[0]] = (cache_key, image_url.decode('utf-8'), detail, [])
+            pending[cache_key[0]][3].append(index)
+
+        groups = list(pending.values())
+        chunks = [groups[start:start + batch_size] for start in range(0, len(groups), batch_size)]
+        if chunks:
+            logger.info(f"OCR of {len(groups)} images in {len(chunks)} requests, subject: {subject}")
+            with ThreadPoolExecutor(max_workers=min(OCR_CONCURRENCY, len(chunks))) as executor:
+                chunk_results = list(executor.map(
+                    lambda chunk: self._ocr_encoded_images([(url, detail) for _, url, detail, _ in chunk], subject),
+                    chunks
+                ))
+
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                for (cache_key, _, _, indexes), result in zip(chunk, chunk_result):
+                    if result.get('success'):
+                        _ocr_cache.put(cache_key, result)
+                    for index in indexes:
+                        results[index] = deepcopy(result)
+
+        return results
+
+    def _ocr_encoded_images(self, images: List[Tuple[str, str]], subject: Optional[str]) -> List[Dict[str, Any]]:
+        """OCR already-encoded images in one request, or one request each on failure.
+
+        Args:
+            images: (data URL, detail) per image
+            subject: Normalized subject hint
+
+        Returns:
+            One result per image, in order
+        """
+        prompt_text = self._select_prompt(subject)
+
+        if len(images) > 1:
+            content = [{"type": "text", "text": prompt_text + MULTI_IMAGE_INSTRUCTIONS.format(count=len(images))}]
+            content.extend(
+                {"type": "image_url", "image_url": {"url": image_url, "detail": detail}}
+                for image_url, detail in images
+            )
+            try:
+                with _vision_call_slots:
+                    response = self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=[{"role": "user", "content": content}],
+                        max_tokens=OCR_MAX_TOKENS_PER_IMAGE * len(images),
+                        temperature=0.0,
+                        response_format={"type": "json_object"}
+                    )
+                replies = orjson.loads(response.choices[0].message.content)['results']
+                if isinstance(replies, list) and len(replies) == len(images):
+                    return [
+                        self._finalize_ocr_result(
+                            reply if isinstance(reply, str) else orjson.dumps(reply).decode('utf-8'), subject
+                        )
+                        for reply in replies
+                    ]
+                logger.warning(f"Multi-image OCR returned {len(replies)} results for {len(images)} images")
+            except Exception as e:
+                logger.warning(f"Multi-image OCR failed, sending images one at a time: {e}")
+
+        results = []
+        for image_url, detail in images:
+            try:
+                with _vision_call_slots:
+                    response = self.client.chat.completions.create(
+                        **self._ocr_request_body(prompt_text, image_url, detail)
+                    )
+                results.append(self._finalize_ocr_result(response.choices[0].message.content.strip(), subject))
+            except Exception as e:
+                logger.error(f"OCR failed: OpenAI Vision API error: {str(e)}")
+                if isinstance(e, APIError):
+                    _invalidate_model_availability(self.model_name)
+                results.append(self._ocr_error_result())
+        return results
+
+    def extract_text_from_image_batch(
+        self,
+        image_paths: List[str],
+        subject: str = None,
+        poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Extract text from many images through the OpenAI Batch API.
+
+        Intended for non-interactive workloads such as bulk worksheet ingestion
+        in background workers: batch requests cost half as much but complete
+        within a 24h window, so this call blocks while polling. Interactive
+        requests should use extract_text_from_image.
+
+        Args:
+            image_paths: Paths to image files
+            subject: Optional subject hint applied to every image
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait for the batch (None waits for the
+                completion window); the batch is cancelled on timeout
+
+        Returns:
+            Mapping of image path to the same result dictionary
+            extract_text_from_image returns
+        """
+        subject = _normalize_subject(subject)
+        results: Dict[str, Dict[str, Any]] = {}
+        # custom_id (image content hash) -> cache key and paths sharing that content
+        pending: Dict[str, Tuple[Tuple[str, str, str], List[str]]] = {}
+        prompt_text = self._select_prompt(subject)
+
+        batch_file = tempfile.NamedTemporaryFile('wb', suffix='.jsonl', delete=False)
+        try:
+            with batch_file:
+                for image_path in image_paths:
+                    try:
+                        image_data, _, cache_key = self._read_image(image_path, subject)
+                    except OSError as e:
+                        logger.error(f"Failed to read image {image_path} for batch OCR: {e}")
+                        results[image_path] = self._ocr_error_result()
+                        continue
+
+                    cached_result = _ocr_cache.get(cache_key)
+                    if cached_result is not None:
+                        results[image_path] = cached_result
+                        continue
+
+                    custom_id = cache_key[0]
+                    if custom_id not in pending:
+                        image_url, detail = self._encode_image(image_path, image_data)
+                        del image_data
+                        batch_file.write(orjson.dumps({
+                            'custom_id': custom_id,
+                            'method': 'POST',
+                            'url': BATCH_ENDPOINT,
+                            'body': self._ocr_request_body(prompt_text, image_url.decode('utf-8'), detail)
+                        }) + b'\n')
+                        pending[custom_id] = (cache_key, [])
+                    pending[custom_id][1].append(image_path)
+
+            try:
+                if pending:
+                    logger.info(f"Submitting OCR batch with {len(pending)} images, subject: {subject}")
+                    outputs = self._run_ocr_batch(batch_file.name, poll_interval, timeout)
+                else:
+                    outputs = {}
+            except Exception as e:
+                logger.error(f"Batch OCR failed: {e}")
+                outputs = {}
+        finally:
+            os.remove(batch_file.name)
+
+        for custom_id, (cache_key, paths) in pending.items():
+            raw_response = outputs.get(custom_id)
+            if raw_response is None:
+                result = self._ocr_error_result()
+            else:
+                result = self._finalize_ocr_result(raw_response, subject)
+                if result.get('success'):
+                    _ocr_cache.put(cache_key, result)
+            for image_path in paths:
+                results[image_path] = deepcopy(result)
+
+        return results
+
+    def _run_ocr_batch(self, input_path: str, poll_interval: float, timeout: Optional[float]) -> Dict[str, str]:
+        """Upload a JSONL batch input, wait for it to finish and collect the replies.
+
+        Args:
+            input_path: Path of the JSONL request file
+            poll_interval: Seconds between batch status checks
+            timeout: Maximum seconds to wait (None waits for the completion window)
+
+        Returns:
+            Mapping of custom_id to raw model output for successful requests
+
+        Raises:
+            TimeoutError: If the batch does not finish within timeout
+            RuntimeError: If the batch fails, expires or is cancelled
+        """
+        with open(input_path, "rb") as input_file:
+            batch_input = self.client.files.create(file=input_file, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f"OCR batch {batch.id} created")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            if deadline is not None and time.monotonic() >= deadline:
+                self.client.batches.cancel(batch.id)
+                raise TimeoutError(f"OCR batch {batch.id} did not finish within {timeout}s")
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != 'completed':
+            raise RuntimeError(f"OCR batch {batch.id} ended with status {batch.status}")
+        if not batch.output_file_id:
+            return {}
+
+        outputs = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get('response') or {}
+            if record.get('error') or response.get('status_code') != 200:
+                logger.warning(f"OCR batch request {record.get('custom_id')} failed: {record.get('error')}")
+                continue
+            outputs[record['custom_id']] = response['body']['choices'][0]['message']['content'].strip()
+        return outputs
+
+    def _read_image(self, image_path: str, subject: Optional[str]) -> Tuple[bytes, str, Tuple[str, str, str]]:
+        """Read an image and compute its debug hash and OCR cache key.
+
+        The image is read with a single read() (sized from the file, so one
+        buffer) and hashed once; the log hash is a prefix of the cache key hash.
+
+        Args:
+            image_path: Path to image file
+            subject: Optional subject hint
+
+        Returns:
+            (image bytes, short content hash for logs, OCR cache key)
+        """
+        with open(image_path, "rb") as image_file:
+            image_data = image_file.read()
+
+        cache_key = (
+            image_content_hash(image_data),
+            self.model_name,
+            subject or ''
+        )
+        return image_data, cache_key[0][:8], cache_key
+
+    @staticmethod
+    def _encode_image(image_path: str, image_data: bytes) -> Tuple[bytes, str]:
+        """Encode image bytes as a base64 data URL, returned as bytes.
+
+        Args:
+            image_path: Path of the image, used for its format
+            image_data: Raw image bytes
+
+        Returns:
+            (ASCII data URL, Vision detail level); decode the URL after
+            releasing image_data
+        """
+        # Determine image format from file extension
+        image_format = image_path.split('.')[-1].lower()
+        if image_format == 'jpg':
+            image_format = 'jpeg'
+        image_data, image_format, detail = VisionService._downscale_image(image_data, image_format)
+        return b"data:image/%b;base64,%b" % (image_format.encode('utf-8'), b64encode(image_data)), detail
+
+    @staticmethod
+    def _downscale_image(image_data: bytes, image_format: str) -> Tuple[bytes, str, str]:
+        """Shrink an image to the size the Vision API would scale it to anyway.
+
+        High-detail images are scaled server-side to fit VISION_MAX_DIMENSION
+        and then to a VISION_MAX_SHORT_SIDE shortest side before tiling, so
+        sending more pixels only costs upload and decode time. Smaller images
+        are returned unchanged, and those within LOW_DETAIL_MAX_DIMENSION are
+        sent at low detail.
+
+        Args:
+            image_data: Raw image bytes
+            image_format: Format of image_data (e.g. 'png', 'jpeg')
+
+        Returns:
+            (image bytes, format, detail) - re-encoded as JPEG when resized
+        """
+        if not PIL_AVAILABLE:
+            return image_data, image_format, 'high'
+
+        try:
+            with Image.open(BytesIO(image_data)) as img:
+                # Only the header has been read; the scale doesn't depend on orientation
+                width, height = img.size
+                scale = min(VISION_MAX_DIMENSION / max(width, height), VISION_MAX_SHORT_SIDE / min(width, height))
+                if scale >= 1:
+                    detail = 'low' if max(width, height) <= LOW_DETAIL_MAX_DIMENSION else 'high'
+                    return image_data, image_format, detail
+
+                new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                # JPEGs decode straight at 1/2, 1/4 or 1/8 scale (never below
+                # new_size), so a phone photo's full-size raster is never allocated
+                img.draft(None, new_size)
+
+                # Apply EXIF orientation, which is lost when re-encoding
+                if img.getexif().get(ExifTags.Base.Orientation) in _TRANSPOSED_ORIENTATIONS:
+                    width, height = height, width
+                    new_size = new_size[::-1]
+                img = ImageOps.exif_transpose(img)
+                resized = img.resize(new_size, Image.Resampling.LANCZOS)
+
+            # Flatten transparency onto white (canvas drawings are transparent PNGs)
+            if resized.mode in ('RGBA', 'LA', 'P'):
+                resized = resized.convert('RGBA')
+                background = Image.new('RGB', resized.size, (255, 255, 255))
+                background.paste(resized, mask=resized.split()[3])
+                resized = background
+            elif resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+
+            buffer = BytesIO()
+            resized.save(buffer, 'JPEG', quality=RESIZED_JPEG_QUALITY)
+            logger.info("Downscaled image from %dx%d to %dx%d for upload", width, height, *new_size)
+            return buffer.getvalue(), 'jpeg', 'high'
+
+        except Exception as e:
+            logger.warning(f"Image downscaling failed, sending original: {e}")
+            return image_data, image_format, 'high'
+
+    @staticmethod
+    def _select_prompt(subject: Optional[str]) -> str:
+        """Select the OCR prompt for a subject (AC-5: geometry-specific routing)."""
+        if subject == 'geometry':
+            logger.info("Using GEOMETRY_PROMPT for geometry subject")
+        return _PROMPT_VARIANTS.get(subject, OCR_PROMPT)
+
+    def _ocr_request_body(self, prompt_text: str, image_url: str, detail: str = 'high') -> Dict[str, Any]:
+        """Build the chat completion request for one image.
+
+        Args:
+            prompt_text: OCR prompt
+            image_url: Base64 data URL of the image
+            detail: Vision detail level ('low' or 'high')
+
+        Returns:
+            Keyword arguments for chat.completions.create (also the batch request body)
+        """
+        return {
+            "model": self.model_name,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt_text
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url,
+                                "detail": detail
+                            }
+                        }
+                    ]
+                }
+            ],
+            "max_tokens": OCR_MAX_TOKENS_PER_IMAGE,
+            "temperature": 0.0  # Deterministic output for OCR accuracy (AC-1, Story 8-1)
+        }
+
+    def _finalize_ocr_result(self, raw_response: str, subject: Optional[str]) -> Dict[str, Any]:
+        """Parse a raw OCR reply into the response schema and flag math content.
+
+        Args:
+            raw_response: Model output
+            subject: Subject hint used
+
+        Returns:
+            Structured response dictionary (AC-4)
+        """
+        # Parse structured JSON response (AC-4)
+        result = self._parse_ocr_response(raw_response, subject)
+
+        # Detect if math content is present. A recognized problem type or LaTeX
+        # output already implies math, so the text scan is only needed otherwise.
+        result['math_detected'] = (
+            result.get('problem_type') in MATH_PROBLEM_TYPES
+            or bool(result.get('latex'))
+            or self._detect_math(result.get('extracted_text', ''))
+        )
+
+        logger.info(
+            "OCR complete. Confidence: %.2f, Math detected: %s, Problem type: %s, Length: %d",
+            result.get('confidence', 0), result['math_detected'],
+            result.get('problem_type', 'unknown'), len(result.get('extracted_text') or '')
+        )
+        return result
+
+    @staticmethod
+    def _ocr_error_result() -> Dict[str, Any]:
+        """Build the response returned when OCR fails."""
+        return {
+            'success': False,
+            'error': "An error occurred during OCR processing.",
+            'extracted_text': '',
+            'latex': '',
+            'confidence': 0.0,
+            'math_detected': False,
+            'problem_type': 'unknown',
+            'uncertain_regions': []
+        }
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the in-process OCR result cache."""
+        _ocr_cache.clear()
 
     def _parse_ocr_response(self, raw_response: str, subject: str = None) -> Dict[str, Any]:
         """Parse OCR response, handling both JSON and plain text formats.
@@ -275,10 +1021,9 @@ class VisionService:
         """
         try:
             # Try to extract JSON from response
-            json_match = re.search(r'\{[\s\S]*\}', raw_response)
-            if json_match:
-                json_str = json_match.group()
-                parsed = json.loads(json_str)
+            json_str = _extract_json_object(raw_response)
+            if json_str is not None:
+                parsed = orjson.loads(json_str)
 
                 # Ensure all required fields exist
                 result = {
@@ -291,7 +1036,7 @@ class VisionService:
                 }
 
                 # Handle geometry-specific fields
-                if subject and subject.lower() == 'geometry':
+                if subject == 'geometry':
                     result['shapes'] = parsed.get('shapes', [])
                     result['relationships'] = parsed.get('relationships', [])
                     result['problem_text'] = parsed.get('problem_text', [])
@@ -299,7 +1044,7 @@ class VisionService:
 
                 return result
 
-        except (json.JSONDecodeError, AttributeError) as e:
+        except (orjson.JSONDecodeError, AttributeError) as e:
             logger.warning(f"Failed to parse JSON from OCR response: {e}")
 
         # Fallback: Parse plain text response and extract uncertainty markers
@@ -314,15 +1059,12 @@ class VisionService:
         Returns:
             Structured response dictionary
         """
-        # Extract uncertainty markers [unclear:x/y] from text
-        uncertain_regions = self._extract_uncertainty_markers(raw_response)
-
-        # Clean text by replacing uncertainty markers with best guess
-        cleaned_text = self._clean_uncertainty_markers(raw_response)
+        # Extract uncertainty markers and replace them with best guesses in one pass
+        cleaned_text, uncertain_regions = self._extract_and_clean_markers(raw_response)
 
         # Try to extract LaTeX if present
         latex = ''
-        latex_match = re.search(r'\$([^$]+)\$', raw_response)
+        latex_match = _LATEX_RE.search(raw_response)
         if latex_match:
             latex = f"${latex_match.group(1)}$"
 
@@ -341,42 +1083,56 @@ class VisionService:
             'uncertain_regions': uncertain_regions
         }
 
-    def _extract_uncertainty_markers(self, text: str) -> List[Dict[str, Any]]:
-        """Extract [unclear:x/y] markers from text (AC-3).
+    def _extract_and_clean_markers(self, text: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Extract uncertainty markers and replace them with best guesses (AC-3).
+
+        A single regex pass handles both marker kinds; positions are offsets
+        in the original text.
 
         Args:
             text: Text containing uncertainty markers
 
         Returns:
-            List of UncertainRegion dictionaries
+            (cleaned text, UncertainRegion dictionaries with [unclear] markers
+            before [unreadable] ones)
         """
-        uncertain_regions = []
+        unclear_regions = []
+        unreadable_regions = []
 
-        # Pattern: [unclear:best_guess/alternative]
-        unclear_pattern = r'\[unclear:([^/\]]+)/([^\]]+)\]'
-        for match in re.finditer(unclear_pattern, text):
-            position = match.start()
+        def replace(match: 're.Match') -> str:
             best_guess = match.group(1)
-            alternative = match.group(2)
-
-            uncertain_regions.append({
-                'position': position,
+            if best_guess is None:
+                # Pattern: [unreadable]
+                unreadable_regions.append({
+                    'position': match.start(),
+                    'character': '?',
+                    'confidence': 0.0,
+                    'alternatives': []
+                })
+                return '?'
+
+            # Pattern: [unclear:best_guess/alternative]
+            unclear_regions.append({
+                'position': match.start(),
                 'character': best_guess,
                 'confidence': 0.6,  # Default confidence for unclear markers
-                'alternatives': [best_guess, alternative]
+                'alternatives': [best_guess, match.group(2)]
             })
+            return best_guess
 
-        # Pattern: [unreadable]
-        unreadable_pattern = r'\[unreadable\]'
-        for match in re.finditer(unreadable_pattern, text):
-            uncertain_regions.append({
-                'position': match.start(),
-                'character': '?',
-                'confidence': 0.0,
-                'alternatives': []
-            })
+        cleaned = _UNCERTAINTY_MARKER_RE.sub(replace, text)
+        return cleaned, unclear_regions + unreadable_regions
 
-        return uncertain_regions
+    def _extract_uncertainty_markers(self, text: str) -> List[Dict[str, Any]]:
+        """Extract [unclear:x/y] markers from text (AC-3).
+
+        Args:
+            text: Text containing uncertainty markers
+
+        Returns:
+            List of UncertainRegion dictionaries
+        """
+        return self._extract_and_clean_markers(text)[1]
 
     def _clean_uncertainty_markers(self, text: str) -> str:
         """Replace uncertainty markers with best guess values (AC-3).
@@ -387,11 +1143,7 @@ class VisionService:
         Returns:
             Cleaned text with markers replaced
         """
-        # Replace [unclear:x/y] with just x (best guess)
-        cleaned = re.sub(r'\[unclear:([^/\]]+)/[^\]]+\]', r'\1', text)
-        # Replace [unreadable] with placeholder
-        cleaned = re.sub(r'\[unreadable\]', '?', cleaned)
-        return cleaned
+        return self._extract_and_clean_markers(text)[0]
 
     def _detect_problem_type(self, text: str) -> str:
         """Detect problem type from extracted text (AC-4).
@@ -402,21 +1154,16 @@ class VisionService:
         Returns:
             Problem type: 'algebra', 'geometry', or 'arithmetic'
         """
-        text_lower = text.lower()
-
         # Check for geometry indicators
-        geometry_terms = ['triangle', 'circle', 'rectangle', 'square', 'angle',
-                         'parallel', 'perpendicular', 'radius', 'diameter',
-                         'area', 'perimeter', 'polygon', 'line segment']
-        if any(term in text_lower for term in geometry_terms):
+        if _GEOMETRY_TERMS_RE.search(text.lower()):
             return 'geometry'
 
         # Check for algebra indicators (variables)
-        if re.search(r'[a-zA-Z]\s*[+\-*/=]', text) or re.search(r'[+\-*/=]\s*[a-zA-Z]', text):
+        if _VARIABLE_OPERATOR_RE.search(text):
             return 'algebra'
 
         # Default to arithmetic if only numbers and operators
-        if re.search(r'\d+\s*[+\-*/=]\s*\d+', text):
+        if _NUMERIC_EQ_RE.search(text):
             return 'arithmetic'
 
         return 'unknown'
@@ -451,13 +1198,15 @@ class VisionService:
 
         return max(0.1, min(base_confidence, 1.0))
 
-    def _estimate_confidence(self, extracted_text: str) -> float:
+    def _estimate_confidence(self, extracted_text: str, math_detected: Optional[bool] = None) -> float:
         """Estimate confidence based on extracted text characteristics.
 
         DEPRECATED: Use _calculate_confidence_from_markers for new code.
 
         Args:
             extracted_text: Extracted text from OCR
+            math_detected: Result of _detect_math if already known (e.g. an
+                OCR result's math_detected), so the text isn't scanned again
 
         Returns:
             Confidence score between 0 and 1
@@ -477,12 +1226,14 @@ class VisionService:
 
         # Word completeness (no excessive fragmentation)
         words = extracted_text.split()
-        avg_word_length = sum(len(w) for w in words) / max(len(words), 1)
+        avg_word_length = sum(map(len, words)) / max(len(words), 1)
         if avg_word_length >= 4:
             confidence += 0.1
 
         # Math notation (GPT-4 is very good at this)
-        if self._detect_math(extracted_text):
+        if math_detected is None:
+            math_detected = self._detect_math(extracted_text)
+        if math_detected:
             confidence += 0.05
 
         return min(confidence, 1.0)
@@ -499,24 +1250,20 @@ class VisionService:
         if not text:
             return False
 
-        # Check for LaTeX delimiters
-        if '$' in text or '\\frac' in text or '\\sqrt' in text:
+        # Check for LaTeX delimiters and mathematical symbols in one pass
+        if _MATH_CHAR_RE.search(text):
             return True
 
-        # Check for mathematical symbols
-        math_symbols = [
-            '×', '÷', '±', '≠', '≤', '≥', '√', 'π', '∫', '∑', '∞', '='
-        ]
-        if any(symbol in text for symbol in math_symbols):
+        # Check for LaTeX commands
+        if '\\' in text and ('\\frac' in text or '\\sqrt' in text):
             return True
 
         # Check for equations (variables with operators)
-        equation_pattern = r'[a-zA-Z]\s*[+\-*/=]\s*\d+'
-        if re.search(equation_pattern, text):
+        if _EQUATION_RE.search(text):
             return True
 
         # Check for numbers with operators
-        if re.search(r'\d+\s*[+\-*/=]\s*\d+', text):
+        if _NUMERIC_EQ_RE.search(text):
             return True
 
         return False
@@ -524,23 +1271,48 @@ class VisionService:
     def check_model_availability(self) -> Dict[str, Any]:
         """Check if OpenAI API is available.
 
+        Retrieves only the configured model rather than listing the whole
+        catalog, with a short timeout and no retries. Results are cached per
+        model for MODEL_AVAILABILITY_TTL_SECONDS so polling health checks
+        don't hit the API on every call; after consecutive failures the
+        unavailable result is returned without a probe for an exponentially
+        growing window of up to MODEL_UNAVAILABLE_TTL_SECONDS.
+
         Returns:
             Dictionary with status and model info
         """
+        now = time.monotonic()
+        with _availability_lock:
+            cached = _availability_cache.get(self.model_name)
+        if cached is not None and cached[0] > now:
+            return dict(cached[1])
+
         try:
             # Try a simple API call to check availability
-            self.client.models.list()
+            self.client.with_options(
+                timeout=MODEL_PROBE_TIMEOUT_SECONDS, max_retries=0
+            ).models.retrieve(self.model_name)
 
-            return {
+            status = {
                 'available': True,
                 'model': self.model_name,
                 'provider': 'OpenAI'
             }
+            failures = 0
+            ttl = MODEL_AVAILABILITY_TTL_SECONDS
 
         except Exception as e:
             logger.error(f"Error checking model availability: {e}")
-            return {
+            status = {
                 'available': False,
                 'model': self.model_name,
                 'error': str(e)
             }
+            with _availability_lock:
+                failures = _availability_failures.get(self.model_name, 0) + 1
+            ttl = min(2 ** failures, MODEL_UNAVAILABLE_TTL_SECONDS)
+
+        with _availability_lock:
+            _availability_failures[self.model_name] = failures
+            _availability_cache[self.model_name] = (now + ttl, status)
+        return dict(status)
@@ -1,6 +1,14 @@
 """Flask application entry point."""
-from app import create_app
-from app.extensions import socketio, db
+import eventlet
+
+# Make sockets cooperative before anything else is imported, so a handler
+# waiting on the OpenAI or Ollama APIs yields to other clients instead of
+# blocking the server. gunicorn's eventlet worker patches on its own; this
+# covers `python run.py`.
+eventlet.monkey_patch()
+
+from app import create_app  # noqa: E402
+from app.extensions import socketio, db  # noqa: E402
 
 app = create_app()
 
@@ -1,38 +1,34 @@
 """Standalone test script for LLM service (no Flask dependency)."""
-import os
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from functools import wraps
-import signal
-from contextlib import contextmanager
 
 import ollama
+from ollama import AsyncClient
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds allowed for each generation request. Enforced with asyncio rather
+# than SIGALRM, so it also works off the main thread and on Windows.
+REQUEST_TIMEOUT_SECONDS = 30
 
-class LLMTimeoutError(Exception):
-    """Raised when LLM request exceeds timeout."""
-    pass
 
-
-@contextmanager
-def timeout_handler(seconds: int):
-    """Context manager for timeout handling."""
-    def _handle_timeout(signum: Any, frame: Any) -> None:
-        raise LLMTimeoutError(f"LLM request exceeded {seconds}s timeout")
-
-    old_handler = signal.signal(signal.SIGALRM, _handle_timeout)
-    signal.alarm(seconds)
-
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
+async def _timed_chat(system_prompt: str, user_prompt: str, temperature: float) -> str:
+    """Chat with the model, bounded by REQUEST_TIMEOUT_SECONDS."""
+    response = await asyncio.wait_for(
+        AsyncClient().chat(
+            model='llama3.2:latest',
+            messages=[
+                {'role': 'system', 'content': system_prompt},
+                {'role': 'user', 'content': user_prompt}
+            ],
+            options={'temperature': temperature}
+        ),
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    return response['message']['content']
 
 
 def test_health_check():
@@ -79,23 +75,13 @@ def test_socratic_questioning():
     print("\nGenerating response (this may take 10-20 seconds)...")
 
     try:
-        with timeout_handler(30):
-            response = ollama.chat(
-                model='llama3.2:latest',
-                messages=[
-                    {'role': 'system', 'content': system_prompt},
-                    {'role': 'user', 'content': user_prompt}
-                ],
-                options={'temperature': 0.7}
-            )
-
-            completion = response['message']['content']
-            print(f"\n✓ Response ({len(completion)} chars):")
-            print(f"{completion}")
-            return True
+        completion = asyncio.run(_timed_chat(system_prompt, user_prompt, temperature=0.7))
+        print(f"\n✓ Response ({len(completion)} chars):")
+        print(f"{completion}")
+        return True
 
-    except LLMTimeoutError as e:
-        print(f"✗ Timeout: {e}")
+    except asyncio.TimeoutError:
+        print(f"✗ Timeout: LLM request exceeded {REQUEST_TIMEOUT_SECONDS}s timeout")
         return False
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -116,23 +102,13 @@ def test_response_validation():
     print("\nGenerating response (this may take 10-20 seconds)...")
 
     try:
-        with timeout_handler(30):
-            response = ollama.chat(
-                model='llama3.2:latest',
-                messages=[
-                    {'role': 'system', 'content': system_prompt},
-                    {'role': 'user', 'content': user_prompt}
-                ],
-                options={'temperature': 0.3}
-            )
-
-            completion = response['message']['content']
-            print(f"\n✓ Response ({len(completion)} chars):")
-            print(f"{completion}")
-            return True
+        completion = asyncio.run(_timed_chat(system_prompt, user_prompt, temperature=0.3))
+        print(f"\n✓ Response ({len(completion)} chars):")
+        print(f"{completion}")
+        return True
 
-    except LLMTimeoutError as e:
-        print(f"✗ Timeout: {e}")
+    except asyncio.TimeoutError:
+        print(f"✗ Timeout: LLM request exceeded {REQUEST_TIMEOUT_SECONDS}s timeout")
         return False
     except Exception as e:
         print(f"✗ Error: {e}")
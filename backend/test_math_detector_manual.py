@@ -25,12 +25,12 @@ def test_math_detector():
     print("MATH DETECTOR MANUAL TESTS")
     print("=" * 70)
 
-    for text, description in test_cases:
+    results = detector.detect_batch([text for text, _ in test_cases])
+
+    for (text, description), result in zip(test_cases, results):
         print(f"\nTest: {description}")
         print(f"Input: '{text}'")
 
-        result = detector.detect(text)
-
         print(f"Has math: {result['has_math']}")
         print(f"Confidence: {result['confidence']:.2f}")
         print(f"Overall type: {result['overall_type']}")
@@ -1,5 +1,6 @@
 """Quick test script to verify database models work correctly."""
 import sys
+import time
 from app import create_app
 from app.extensions import db
 from app.models import Conversation, Message, MessageRole
@@ -65,9 +66,55 @@ def test_crud():
 
         print("\n✅ All CRUD operations successful!")
 
+def test_bulk_crud(n: int = 1000):
+    """Compare per-row ORM inserts with a single bulk INSERT.
+
+    add_all tracks every Message in the session; for large batches a Core
+    INSERT with a list of rows skips that bookkeeping and is much faster.
+    """
+    app = create_app()
+
+    with app.app_context():
+        conv = Conversation(title="Bulk Insert Benchmark")
+        db.session.add(conv)
+        db.session.commit()
+
+        rows = [
+            {
+                "conversation_id": conv.id,
+                "role": MessageRole.STUDENT,
+                "content": f"msg {i}",
+                "message_metadata": {}
+            }
+            for i in range(n)
+        ]
+
+        print(f"\nInserting {n} messages with add_all...")
+        start = time.perf_counter()
+        db.session.add_all([Message(**row) for row in rows])
+        db.session.commit()
+        orm_seconds = time.perf_counter() - start
+        print(f"add_all: {orm_seconds:.3f}s")
+
+        print(f"Inserting {n} messages with a bulk INSERT...")
+        start = time.perf_counter()
+        db.session.execute(Message.__table__.insert(), rows)
+        db.session.commit()
+        bulk_seconds = time.perf_counter() - start
+        print(f"Bulk INSERT: {bulk_seconds:.3f}s ({orm_seconds / bulk_seconds:.1f}x faster)")
+
+        inserted = db.session.query(Message).filter_by(conversation_id=conv.id).count()
+        print(f"Messages inserted: {inserted}")
+
+        db.session.delete(conv)
+        db.session.commit()
+
+        print("\n✅ Bulk insert successful!")
+
 if __name__ == '__main__':
     try:
         test_crud()
+        test_bulk_crud()
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
         import traceback
@@ -1,183 +1,223 @@
-"""Integration test for SymPy integration in conversation flow."""
+"""Integration test for SymPy integration in conversation flow.
+
+Each scenario is a separate parametrized case, so the scenarios can be
+distributed across workers (``pytest -n auto`` with pytest-xdist).
+"""
 import sys
 sys.path.insert(0, '/Users/joaocarlinho/gauntlet/bmad/supertutors/backend')
 
+import logging
+
+import pytest
+
 from app.services.math_detector import MathDetector
 from app.services.sympy_service import SymPyService
 from app.services.answer_validator import AnswerValidator
 
-def test_full_integration():
-    """Test the complete SymPy integration workflow."""
-
-    print("=" * 70)
-    print("SYMPY INTEGRATION TEST")
-    print("=" * 70)
-
-    # Initialize services
-    math_detector = MathDetector(min_confidence=0.6)
-    sympy_service = SymPyService()
-    answer_validator = AnswerValidator()
-
-    # Test scenarios
-    test_scenarios = [
-        {
-            'name': 'Simple equation',
-            'student_input': 'I think x + 5 = 10',
-            'expected_expressions': ['x + 5 = 10']
-        },
-        {
-            'name': 'Answer statement',
-            'student_input': 'Is x = 5 the correct answer?',
-            'expected_expressions': ['x = 5']
-        },
-        {
-            'name': 'Expression to simplify',
-            'student_input': 'Can you help me simplify 2x + 3x?',
-            'expected_expressions': ['2x + 3x']
-        },
-        {
-            'name': 'Quadratic equation',
-            'student_input': 'How do I solve x^2 - 4 = 0?',
-            'expected_expressions': ['x^2 - 4 = 0']
-        },
-        {
-            'name': 'No math',
-            'student_input': 'What is algebra?',
-            'expected_expressions': []
+# Silent under pytest unless enabled (pytest --log-cli-level=DEBUG)
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+TEST_SCENARIOS = [
+    {
+        'name': 'Simple equation',
+        'student_input': 'I think x + 5 = 10',
+        'expected_expressions': ['x + 5 = 10']
+    },
+    {
+        'name': 'Answer statement',
+        'student_input': 'Is x = 5 the correct answer?',
+        'expected_expressions': ['x = 5']
+    },
+    {
+        'name': 'Expression to simplify',
+        'student_input': 'Can you help me simplify 2x + 3x?',
+        'expected_expressions': ['2x + 3x']
+    },
+    {
+        'name': 'Quadratic equation',
+        'student_input': 'How do I solve x^2 - 4 = 0?',
+        'expected_expressions': ['x^2 - 4 = 0']
+    },
+    {
+        'name': 'No math',
+        'student_input': 'What is algebra?',
+        'expected_expressions': []
+    }
+]
+
+VALIDATION_TESTS = [
+    {
+        'student': 'x = 5',
+        'expected': '5',
+        'should_match': True,
+        'xfail': 'Answer statements are not parsed as expressions'
+    },
+    {
+        'student': '5',
+        'expected': 'x = 5',
+        'should_match': True,
+        'xfail': 'Answer statements are not parsed as expressions'
+    },
+    {
+        'student': '2x + 3x',
+        'expected': '5x',
+        'should_match': True
+    },
+    {
+        'student': 'x^2 - 1',
+        'expected': '(x-1)(x+1)',
+        'should_match': True
+    },
+    {
+        'student': '7',
+        'expected': '5',
+        'should_match': False
+    }
+]
+
+
+def _build_services():
+    """Initialize services."""
+    return MathDetector(min_confidence=0.6), SymPyService(), AnswerValidator()
+
+
+@pytest.fixture(scope="module")
+def services():
+    """Services shared by every case in this module."""
+    return _build_services()
+
+
+@pytest.fixture(scope="module")
+def validation_results(services):
+    """validate_batch results for VALIDATION_TESTS."""
+    return run_answer_validation(services[2])
+
+
+@pytest.mark.parametrize("scenario", TEST_SCENARIOS, ids=lambda scenario: scenario['name'])
+def test_scenario(scenario, services):
+    """Test the SymPy integration workflow for one student message."""
+    detection_result = run_scenario(scenario, *services)
+
+    assert detection_result['has_math'] == bool(scenario['expected_expressions'])
+
+
+@pytest.mark.parametrize("index", [
+    pytest.param(
+        index,
+        id=f"{test['student']} vs {test['expected']}",
+        marks=[pytest.mark.xfail(reason=test['xfail'], strict=True)] if 'xfail' in test else []
+    )
+    for index, test in enumerate(VALIDATION_TESTS)
+])
+def test_answer_validation(index, validation_results):
+    """Test answer validation on one validation case."""
+    assert validation_results[index]['correct'] == VALIDATION_TESTS[index]['should_match']
+
+
+def run_scenario(scenario, math_detector, sympy_service, answer_validator):
+    """Detect, parse, simplify and solve the math in one scenario."""
+    log.debug("TEST: %s", scenario['name'])
+    log.debug("Input: %s", scenario['student_input'])
+
+    # Step 1: Detect math
+    detection_result = math_detector.detect(scenario['student_input'])
+
+    log.debug("Math detected: %s", detection_result['has_math'])
+    log.debug("Confidence: %.2f", detection_result['confidence'])
+
+    if not detection_result['has_math']:
+        log.debug("No math detected")
+        return detection_result
+
+    log.debug("Expressions found: %d", len(detection_result['expressions']))
+
+    # Step 2: Extract for SymPy
+    expr_strings = math_detector.extract_expressions_for_sympy(detection_result)
+    log.debug("SymPy expressions: %s", expr_strings)
+
+    # Step 3: Process with SymPy
+    math_context = {
+        'detected': True,
+        'confidence': detection_result['confidence'],
+        'overall_type': detection_result['overall_type'],
+        'expressions': []
+    }
+
+    for expr_str in expr_strings[:3]:
+        log.debug("Processing: '%s'", expr_str)
+
+        expr_result = {
+            'original': expr_str,
+            'parsed': None,
+            'simplified': None,
+            'type': None,
+            'solutions': [],
+            'steps': []
         }
-    ]
-
-    for scenario in test_scenarios:
-        print(f"\n{'=' * 70}")
-        print(f"TEST: {scenario['name']}")
-        print(f"Input: {scenario['student_input']}")
-        print("-" * 70)
-
-        # Step 1: Detect math
-        detection_result = math_detector.detect(scenario['student_input'])
-
-        print(f"Math detected: {detection_result['has_math']}")
-        print(f"Confidence: {detection_result['confidence']:.2f}")
 
-        if not detection_result['has_math']:
-            print("✓ No math detected (as expected)" if not scenario['expected_expressions'] else "✗ Math should have been detected!")
-            continue
+        try:
+            # Parse once, then simplify or (for equations) solve
+            process_result = sympy_service.process_expression(expr_str)
+            if not process_result['success']:
+                log.debug("  Processing failed: %s", process_result['error'])
+                continue
+
+            processed = process_result['result']
+            expr_result['type'] = processed['type']
+            expr_result['parsed'] = processed['parsed']
+            expr_result['simplified'] = processed['simplified']
+            expr_result['solutions'] = processed['solutions']
+            log.debug("  Parsed: %s", expr_result['parsed'])
+            if expr_result['simplified'] is not None:
+                log.debug("  Simplified: %s", expr_result['simplified'])
+
+            if expr_result['solutions']:
+                log.debug("  Solutions: %s", expr_result['solutions'])
+
+                # Generate steps
+                steps_result = answer_validator.generate_solution_steps(expr_str)
+                if steps_result.get('solvable'):
+                    expr_result['steps'] = steps_result['steps']
+                    log.debug("  Steps: %s", expr_result['steps'])
+
+            math_context['expressions'].append(expr_result)
+            log.debug("  Successfully processed")
+
+        except Exception as e:
+            log.debug("  Error: %s", e)
+
+    return detection_result
+
+
+def run_answer_validation(answer_validator):
+    """Validate every VALIDATION_TESTS pair in one batch."""
+    results = answer_validator.validate_batch(
+        [(test['student'], test['expected']) for test in VALIDATION_TESTS]
+    )
+
+    for test, result in zip(VALIDATION_TESTS, results):
+        log.debug(
+            "Validating '%s' vs '%s': correct=%s (expected %s) - %s",
+            test['student'], test['expected'], result['correct'],
+            test['should_match'], result['explanation']
+        )
 
-        print(f"Expressions found: {len(detection_result['expressions'])}")
+    return results
 
-        # Step 2: Extract for SymPy
-        expr_strings = math_detector.extract_expressions_for_sympy(detection_result)
-        print(f"SymPy expressions: {expr_strings}")
 
-        # Step 3: Process with SymPy
-        math_context = {
-            'detected': True,
-            'confidence': detection_result['confidence'],
-            'overall_type': detection_result['overall_type'],
-            'expressions': []
-        }
+def main():
+    """Run the complete SymPy integration workflow."""
+    log.addHandler(logging.StreamHandler(sys.stdout))
+    log.setLevel(logging.DEBUG)
 
-        for expr_str in expr_strings[:3]:
-            print(f"\nProcessing: '{expr_str}'")
-
-            expr_result = {
-                'original': expr_str,
-                'parsed': None,
-                'simplified': None,
-                'type': None,
-                'solutions': [],
-                'steps': []
-            }
-
-            try:
-                # Parse
-                parse_result = sympy_service.parse_expression(expr_str)
-                if parse_result['success']:
-                    expr_result['parsed'] = str(parse_result['result'])
-                    print(f"  Parsed: {expr_result['parsed']}")
-
-                    # Simplify
-                    simplify_result = sympy_service.simplify_expression(expr_str)
-                    if simplify_result['success']:
-                        expr_result['simplified'] = simplify_result['result']
-                        print(f"  Simplified: {expr_result['simplified']}")
-
-                    # If equation, solve
-                    if '=' in expr_str:
-                        expr_result['type'] = 'equation'
-                        solve_result = sympy_service.solve_equation(expr_str)
-                        if solve_result['success'] and solve_result['result']['solvable']:
-                            expr_result['solutions'] = solve_result['result']['solutions']
-                            print(f"  Solutions: {expr_result['solutions']}")
-
-                            # Generate steps
-                            steps_result = answer_validator.generate_solution_steps(expr_str)
-                            if steps_result.get('solvable'):
-                                expr_result['steps'] = steps_result['steps']
-                                print(f"  Steps: {expr_result['steps']}")
-                    else:
-                        expr_result['type'] = 'expression'
-
-                    math_context['expressions'].append(expr_result)
-                    print("  ✓ Successfully processed")
-                else:
-                    print(f"  ✗ Parse failed: {parse_result['error']}")
-
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
-
-        print(f"\n✓ Test '{scenario['name']}' completed")
-
-    print("\n" + "=" * 70)
-    print("ANSWER VALIDATION TEST")
-    print("=" * 70)
-
-    # Test answer validation
-    validation_tests = [
-        {
-            'student': 'x = 5',
-            'expected': '5',
-            'should_match': True
-        },
-        {
-            'student': '5',
-            'expected': 'x = 5',
-            'should_match': True
-        },
-        {
-            'student': '2x + 3x',
-            'expected': '5x',
-            'should_match': True
-        },
-        {
-            'student': 'x^2 - 1',
-            'expected': '(x-1)(x+1)',
-            'should_match': True
-        },
-        {
-            'student': '7',
-            'expected': '5',
-            'should_match': False
-        }
-    ]
-
-    for test in validation_tests:
-        print(f"\nValidating: '{test['student']}' vs '{test['expected']}'")
-        result = answer_validator.validate_answer(
-            student_answer=test['student'],
-            expected_answer=test['expected']
-        )
+    math_detector, sympy_service, answer_validator = _build_services()
 
-        correct = result['correct']
-        expected_correct = test['should_match']
+    for scenario in TEST_SCENARIOS:
+        run_scenario(scenario, math_detector, sympy_service, answer_validator)
 
-        status = "✓" if correct == expected_correct else "✗"
-        print(f"  {status} Correct: {correct} (expected: {expected_correct})")
-        print(f"  Explanation: {result['explanation']}")
+    run_answer_validation(answer_validator)
 
-    print("\n" + "=" * 70)
-    print("✓ ALL INTEGRATION TESTS COMPLETED")
-    print("=" * 70)
 
 if __name__ == "__main__":
-    test_full_integration()
+    main()
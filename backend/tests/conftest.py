@@ -0,0 +1,24 @@
+"""Shared pytest fixtures for the backend test suite."""
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture(scope="module")
+def context_manager():
+    """A ConversationContextManager shared by the tests in a module."""
+    from app.services.context_manager import ConversationContextManager
+
+    return ConversationContextManager()
+
+
+@pytest.fixture(scope="module")
+def socratic_guard():
+    """An OpenAI-backed SocraticGuard shared by the tests in a module.
+
+    Building the guard creates its OpenAI clients (~70 ms), so it is only
+    done once per module.
+    """
+    from app.services.socratic_guard import SocraticGuard
+
+    with patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+        return SocraticGuard()
@@ -0,0 +1,59 @@
+"""Unit tests for Answer Validator.
+
+Tests for:
+- Symbolic and numeric equivalence checks
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.answer_validator import AnswerValidator
+from app.services.sympy_service import SymPyService
+
+
+@pytest.fixture
+def validator():
+    """Create an AnswerValidator with the shared result cache disabled."""
+    SymPyService.clear_cache()
+    with patch('app.services.sympy_service.get_redis_service', return_value=None):
+        yield AnswerValidator()
+    SymPyService.clear_cache()
+
+
+class TestAnswerEquivalence:
+    """Test suite for validate_answer equivalence checks."""
+
+    @pytest.mark.parametrize('student, expected', [
+        ('2*x + 3*x', '5*x'),
+        ('(x + 1)^2', 'x^2 + 2*x + 1'),
+        ('1/(x + 1) + 1', '(x + 2)/(x + 1)'),
+        ('sin(x)^2 + cos(x)^2', '1'),
+    ])
+    def test_equivalent_forms_accepted(self, validator, student, expected):
+        """Algebraically equal answers are exact matches."""
+        result = validator.validate_answer(student, expected)
+
+        assert result['correct'] is True
+        assert result['is_approximate'] is False
+
+    def test_different_expressions_rejected(self, validator):
+        """Expressions that differ by a constant are not accepted."""
+        result = validator.validate_answer('x + 1', 'x + 2')
+
+        assert result['correct'] is False
+
+    def test_decimal_approximation_accepted(self, validator):
+        """Numeric answers within tolerance are approximate matches."""
+        result = validator.validate_answer('0.3333', '1/3')
+
+        assert result['correct'] is True
+        assert result['is_approximate'] is True
+
+    def test_batch_matches_single_validation(self, validator):
+        """validate_batch returns the validate_answer results in order."""
+        pairs = [('2*x + 3*x', '5*x'), ('7', '5'), ('x +', '5'), ('5', '5')]
+
+        with patch.object(validator, '_prepare_answer', wraps=validator._prepare_answer) as prepare:
+            results = validator.validate_batch(pairs)
+
+        assert results == [validator.validate_answer(*pair) for pair in pairs]
+        assert prepare.call_count == 5
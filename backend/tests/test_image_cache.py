@@ -0,0 +1,52 @@
+"""Unit tests for the shared image result cache.
+
+Tests for:
+- LRU eviction and recency
+- Copies on get/put
+- Content hashing
+"""
+from app.services.image_cache import ImageResultCache, image_content_hash
+
+
+class TestImageResultCache:
+    """Test suite for ImageResultCache."""
+
+    def test_miss_returns_none(self):
+        """Unknown keys are a miss."""
+        assert ImageResultCache(2).get(('abc', 'model')) is None
+
+    def test_evicts_least_recently_used(self):
+        """A full cache evicts the entry that was used longest ago."""
+        cache = ImageResultCache(2)
+        cache.put('a', {'text': 'a'})
+        cache.put('b', {'text': 'b'})
+        cache.get('a')
+        cache.put('c', {'text': 'c'})
+
+        assert cache.get('a') == {'text': 'a'}
+        assert cache.get('b') is None
+        assert cache.get('c') == {'text': 'c'}
+
+    def test_results_are_copied(self):
+        """Modifying a stored or returned result does not change the cache."""
+        cache = ImageResultCache(2)
+        result = {'regions': []}
+        cache.put('a', result)
+        result['regions'].append('stored')
+        cache.get('a')['regions'].append('returned')
+
+        assert cache.get('a') == {'regions': []}
+
+    def test_clear(self):
+        """clear() removes every entry."""
+        cache = ImageResultCache(2)
+        cache.put('a', {'text': 'a'})
+        cache.clear()
+
+        assert cache.get('a') is None
+
+
+def test_image_content_hash_depends_on_content():
+    """Identical bytes share a hash; different bytes do not."""
+    assert image_content_hash(b'image') == image_content_hash(b'image')
+    assert image_content_hash(b'image') != image_content_hash(b'other')
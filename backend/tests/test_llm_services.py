@@ -0,0 +1,140 @@
+"""Unit tests for the async LLM service paths.
+
+Tests for:
+- LLMService (Ollama) agenerate / acheck_health, including the timeout path
+- BedrockService agenerate / acheck_health
+- UnifiedLLMService routing of agenerate / acheck_health
+"""
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.bedrock_service import BedrockService
+from app.services.llm_service import LLMNetworkError, LLMService, LLMTimeoutError
+from app.services.unified_llm_service import UnifiedLLMService
+
+
+@pytest.fixture
+def ollama_service():
+    """Create an LLMService with mocked Ollama clients."""
+    with patch('app.services.llm_service.Client'), \
+            patch('app.services.llm_service.AsyncClient'):
+        service = LLMService(model_name='llama3.2:latest', timeout_seconds=1)
+    service.async_client.chat = AsyncMock(return_value={'message': {'content': 'What have you tried?'}})
+    service.async_client.list = AsyncMock(return_value=SimpleNamespace(
+        models=[SimpleNamespace(model='llama3.2:latest')]
+    ))
+    return service
+
+
+@pytest.fixture
+def bedrock_service():
+    """Create a BedrockService with a mocked boto3 client."""
+    with patch('app.services.bedrock_service.boto3') as mock_boto3:
+        service = BedrockService(model_id='test-model', region='us-east-1')
+    mock_boto3.client.return_value.invoke_model.side_effect = lambda **kwargs: {
+        'body': io.BytesIO(json.dumps({'content': [{'text': 'What have you tried?'}]}).encode('utf-8'))
+    }
+    yield service
+    service._executor.shutdown(wait=True)
+
+
+class TestLLMServiceAsync:
+    """Test suite for LLMService async methods."""
+
+    def test_agenerate_returns_completion(self, ollama_service):
+        """The system prompt is sent before the user prompt."""
+        result = asyncio.run(ollama_service.agenerate('Is x = 5?', system_prompt='Be Socratic.'))
+
+        assert result == 'What have you tried?'
+        messages = ollama_service.async_client.chat.call_args.kwargs['messages']
+        assert [message['role'] for message in messages] == ['system', 'user']
+
+    def test_agenerate_timeout_raises_llm_timeout(self, ollama_service):
+        """A chat call exceeding timeout_seconds raises LLMTimeoutError."""
+        async def slow_chat(**kwargs):
+            await asyncio.sleep(10)
+
+        ollama_service.timeout_seconds = 0.01
+        ollama_service.async_client.chat = AsyncMock(side_effect=slow_chat)
+
+        with pytest.raises(LLMTimeoutError):
+            asyncio.run(ollama_service.agenerate('Is x = 5?'))
+
+    def test_agenerate_connection_error(self, ollama_service):
+        """Connection failures raise LLMNetworkError."""
+        ollama_service.async_client.chat = AsyncMock(side_effect=ConnectionError('refused'))
+
+        with pytest.raises(LLMNetworkError):
+            asyncio.run(ollama_service.agenerate('Is x = 5?'))
+
+    def test_acheck_health_healthy(self, ollama_service):
+        """A listed model reports healthy."""
+        health = asyncio.run(ollama_service.acheck_health())
+
+        assert health['status'] == 'healthy'
+        assert health['model_available'] is True
+
+    def test_acheck_health_disconnected(self, ollama_service):
+        """An unreachable Ollama reports unhealthy."""
+        ollama_service.async_client.list = AsyncMock(side_effect=ConnectionError('refused'))
+
+        health = asyncio.run(ollama_service.acheck_health())
+
+        assert health['status'] == 'unhealthy'
+        assert health['ollama'] == 'disconnected'
+
+
+class TestBedrockServiceAsync:
+    """Test suite for BedrockService async methods."""
+
+    def test_agenerate_returns_completion(self, bedrock_service):
+        """agenerate runs generate on the executor with the same request."""
+        result = asyncio.run(bedrock_service.agenerate('Is x = 5?', system_prompt='Be Socratic.'))
+
+        assert result == 'What have you tried?'
+        body = json.loads(bedrock_service.client.invoke_model.call_args.kwargs['body'])
+        assert body['system'] == 'Be Socratic.'
+        assert body['messages'] == [{'role': 'user', 'content': 'Is x = 5?'}]
+
+    def test_acheck_health(self, bedrock_service):
+        """acheck_health reports a reachable model as healthy."""
+        health = asyncio.run(bedrock_service.acheck_health())
+
+        assert health == {'status': 'healthy', 'service': 'bedrock', 'model': 'test-model', 'region': 'us-east-1'}
+
+
+class TestUnifiedLLMServiceAsync:
+    """Test suite for UnifiedLLMService async routing."""
+
+    def test_bedrock_agenerate_and_health(self, bedrock_service):
+        """With USE_AWS_BEDROCK set, async calls go to Bedrock."""
+        with patch.dict('os.environ', {'USE_AWS_BEDROCK': 'true'}), \
+                patch('app.services.bedrock_service.get_bedrock_service', return_value=bedrock_service):
+            service = UnifiedLLMService()
+
+        result = asyncio.run(service.agenerate('Is x = 5?', system_prompt='Be Socratic.', temperature=0.2))
+        health = asyncio.run(service.acheck_health())
+
+        assert result == 'What have you tried?'
+        body = json.loads(bedrock_service.client.invoke_model.call_args_list[0].kwargs['body'])
+        assert body['temperature'] == 0.2
+        assert health['service_name'] == 'Bedrock'
+        assert health['use_bedrock'] is True
+
+    def test_ollama_agenerate_and_health(self, ollama_service):
+        """Without USE_AWS_BEDROCK, async calls go to Ollama."""
+        with patch.dict('os.environ', {'USE_AWS_BEDROCK': 'false'}), \
+                patch('app.services.llm_service.get_llm_service', return_value=ollama_service):
+            service = UnifiedLLMService()
+
+        result = asyncio.run(service.agenerate('Is x = 5?'))
+        health = asyncio.run(service.acheck_health())
+
+        assert result == 'What have you tried?'
+        assert health['service_name'] == 'Ollama'
+        assert health['status'] == 'healthy'
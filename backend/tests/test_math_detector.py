@@ -179,3 +179,15 @@ class TestMathDetector:
         result = self.detector.detect("x + y = 5 and x - y = 1")
         assert result['has_math'] is True
         assert len(result['expressions']) >= 2
+
+    def test_detect_batch_matches_detect(self):
+        """Batch detection returns the per-text results in order."""
+        texts = ["x + 5 = 10", "Hello world", "x = 5"]
+        results = self.detector.detect_batch(texts)
+        assert results == [self.detector.detect(text) for text in texts]
+
+    def test_long_message_without_comparison_skips_inequality(self):
+        """Patterns whose required characters are absent are never scanned."""
+        result = self.detector.detect("2x + 3x - 4 + " * 50)
+        assert result['has_math'] is True
+        assert 'inequality' not in result['detected_patterns']
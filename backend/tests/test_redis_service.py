@@ -310,6 +310,83 @@ class TestCacheInvalidation:
                     assert deleted == 0
 
 
+class TestSymPyCaching:
+    """Test suite for the shared SymPy result cache."""
+
+    def test_sympy_cache_key_format(self):
+        """Cache key includes operation and argument hash."""
+        with patch('app.services.redis_service.REDIS_AVAILABLE', False):
+            import app.services.redis_service as redis_module
+            reset_redis_singleton()
+
+            service = redis_module.RedisService()
+            key = service._get_sympy_cache_key('simplify', 'abc123')
+
+            assert key == 'sympy:simplify:abc123'
+
+    def test_sympy_cache_hit(self):
+        """Cached results are JSON-decoded."""
+        with patch.dict('os.environ', {'REDIS_URL': 'redis://localhost:6379/0'}):
+            with patch('app.services.redis_service.REDIS_AVAILABLE', True):
+                with patch('app.services.redis_service.redis') as mock_redis:
+                    mock_client = MagicMock()
+                    mock_redis.Redis.return_value = mock_client
+                    mock_redis.connection.ConnectionPool.from_url.return_value = MagicMock()
+                    mock_client.ping.return_value = True
+                    mock_client.get.return_value = json.dumps(['-2', '2'])
+
+                    import app.services.redis_service as redis_module
+                    reset_redis_singleton()
+
+                    service = redis_module.RedisService()
+                    result = service.get_cached_sympy_result('solve', 'abc123')
+
+                    assert result == ['-2', '2']
+                    mock_client.get.assert_called_once_with('sympy:solve:abc123')
+
+    def test_cache_sympy_result(self):
+        """SymPy results are cached with the default TTL."""
+        with patch.dict('os.environ', {'REDIS_URL': 'redis://localhost:6379/0'}):
+            with patch('app.services.redis_service.REDIS_AVAILABLE', True):
+                with patch('app.services.redis_service.redis') as mock_redis:
+                    mock_client = MagicMock()
+                    mock_redis.Redis.return_value = mock_client
+                    mock_redis.connection.ConnectionPool.from_url.return_value = MagicMock()
+                    mock_client.ping.return_value = True
+
+                    import app.services.redis_service as redis_module
+                    reset_redis_singleton()
+
+                    service = redis_module.RedisService()
+                    success = service.cache_sympy_result('factor', 'abc123', '(x + 1)**2')
+
+                    assert success is True
+                    mock_client.setex.assert_called_once_with(
+                        'sympy:factor:abc123', 604800, json.dumps('(x + 1)**2')
+                    )
+
+    def test_invalidate_sympy_cache_by_operation(self):
+        """Invalidation can be limited to one operation."""
+        with patch.dict('os.environ', {'REDIS_URL': 'redis://localhost:6379/0'}):
+            with patch('app.services.redis_service.REDIS_AVAILABLE', True):
+                with patch('app.services.redis_service.redis') as mock_redis:
+                    mock_client = MagicMock()
+                    mock_redis.Redis.return_value = mock_client
+                    mock_redis.connection.ConnectionPool.from_url.return_value = MagicMock()
+                    mock_client.ping.return_value = True
+                    mock_client.scan_iter.return_value = iter(['sympy:factor:a', 'sympy:factor:b'])
+                    mock_client.delete.return_value = 2
+
+                    import app.services.redis_service as redis_module
+                    reset_redis_singleton()
+
+                    service = redis_module.RedisService()
+                    deleted = service.invalidate_sympy_cache('factor')
+
+                    assert deleted == 2
+                    mock_client.scan_iter.assert_called_once_with(match='sympy:factor:*')
+
+
 class TestCelebrationCooldowns:
     """Test suite for celebration cooldown storage (AC-6)."""
 
@@ -484,3 +561,5 @@ class TestRedisUnavailable:
             assert service.invalidate_ocr_cache('abc') == 0
             assert service.is_celebration_on_cooldown('conv') is False
             assert service.set_celebration_cooldown('conv') is False
+            assert service.get_cached_sympy_result('simplify', 'abc') is None
+            assert service.cache_sympy_result('simplify', 'abc', 'x') is False
@@ -0,0 +1,48 @@
+"""Unit tests for the embedding-keyed semantic cache.
+
+Tests for:
+- Similar texts share a cached value
+- Texts with different numbers never share a cached value
+"""
+import re
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from app.services.semantic_cache import SemanticCache  # noqa: E402
+
+
+class _DigitBlindModel:
+    """Embeds texts by their letters only, like a model that ignores numbers."""
+
+    def encode(self, text, normalize_embeddings=True):
+        vector = np.zeros(26)
+        for letter in re.findall('[a-z]', text.lower()):
+            vector[ord(letter) - ord('a')] += 1
+        return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def cache():
+    """A SemanticCache using the digit-blind stand-in model."""
+    semantic_cache = SemanticCache(threshold=0.95, max_entries=4)
+    semantic_cache._enabled = True
+    semantic_cache._model = _DigitBlindModel()
+    return semantic_cache
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache lookups."""
+
+    def test_similar_text_hits(self, cache):
+        """Texts with the same embedding and numbers share a value."""
+        cache.set('Solve 2x = 4||What could you divide by?', 'valid')
+
+        assert cache.get('solve 2x = 4||what could you divide by') == 'valid'
+
+    def test_different_numbers_miss(self, cache):
+        """Texts that differ only in their numbers do not share a value."""
+        cache.set('Solve 2x = 4||Is x = 2?', 'valid')
+
+        assert cache.get('Solve 2x = 4||Is x = 3?') is None
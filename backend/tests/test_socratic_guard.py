@@ -0,0 +1,467 @@
+"""Unit tests for Socratic Guard validation.
+
+Tests for:
+- LLM validation verdict cache
+- Rule-based fast paths that skip the LLM
+- Prompt assembly
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.services.socratic_guard import CANDIDATE_COUNT
+
+
+@pytest.fixture
+def ollama_guard():
+    """Create an Ollama-backed SocraticGuard with a mocked client."""
+    with patch('app.services.socratic_guard.Client'), \
+            patch('app.services.socratic_guard.AsyncClient'):
+        from app.services.socratic_guard import SocraticGuard
+        guard = SocraticGuard(model_name='llama3.2:latest', use_openai=False)
+    guard.client = Mock()
+    return guard
+
+
+def _ollama_reply(content):
+    """Build an Ollama chat response dict."""
+    return {'message': {'content': content}}
+
+
+def _openai_reply(*contents):
+    """Build an OpenAI chat completion with one choice per content."""
+    return SimpleNamespace(choices=[
+        SimpleNamespace(message=SimpleNamespace(content=content)) for content in contents
+    ])
+
+
+def _ollama_stream(content, chunk_size=8):
+    """Build a streamed Ollama chat response."""
+    return (
+        {'message': {'content': content[i:i + chunk_size]}}
+        for i in range(0, len(content), chunk_size)
+    )
+
+
+def _streamed_replies(content):
+    """side_effect returning a fresh stream of content on every chat call."""
+    return lambda *args, **kwargs: _ollama_stream(content)
+
+
+class TestValidationCache:
+    """Test suite for the LLM validation verdict cache."""
+
+    def test_repeated_validation_uses_cache(self, ollama_guard):
+        """Identical (student, tutor) pairs only call the LLM once."""
+        ollama_guard.client.chat.side_effect = _streamed_replies(
+            '{"is_direct_answer": false, "confidence": 0.9, "reason": "asks a question"}'
+        )
+
+        first = ollama_guard._llm_validation('Solve 2x = 4', 'What could you divide by?')
+        second = ollama_guard._llm_validation('Solve 2x = 4', 'What could you divide by?')
+
+        assert first == second == (True, 'Validator verdict (stream stopped early)', 0.9)
+        assert ollama_guard.client.chat.call_count == 1
+
+    def test_different_responses_are_not_shared(self, ollama_guard):
+        """A different tutor response is validated separately."""
+        ollama_guard.client.chat.side_effect = _streamed_replies(
+            '{"is_direct_answer": false, "confidence": 0.9, "reason": "ok"}'
+        )
+
+        ollama_guard._llm_validation('Solve 2x = 4', 'What could you divide by?')
+        ollama_guard._llm_validation('Solve 2x = 4', 'What is on the left side?')
+
+        assert ollama_guard.client.chat.call_count == 2
+
+    def test_inconclusive_result_not_cached(self, ollama_guard):
+        """Unparseable replies are retried on the next call."""
+        ollama_guard.client.chat.side_effect = _streamed_replies('not json')
+
+        result = ollama_guard._llm_validation('Solve 2x = 4', 'Hmm')
+        ollama_guard._llm_validation('Solve 2x = 4', 'Hmm')
+
+        assert result == (True, 'Validation inconclusive', 0.3)
+        assert ollama_guard.client.chat.call_count == 2
+
+    def test_ollama_validation_uses_schema_format(self, ollama_guard):
+        """Ollama validation constrains output to the ValidationResult schema."""
+        from app.services.socratic_guard import ValidationResult
+        ollama_guard.client.chat.return_value = _ollama_stream(
+            '{"is_direct_answer": true, "confidence": 0.95, "reason": "states x = 2"}'
+        )
+
+        result = ollama_guard._llm_validation('Solve 2x = 4', 'So x = 2.')
+
+        assert result == (False, 'Validator verdict (stream stopped early)', 0.95)
+        call_kwargs = ollama_guard.client.chat.call_args.kwargs
+        assert call_kwargs['format'] == ValidationResult.model_json_schema()
+        assert '"is_direct_answer": true or false' not in call_kwargs['messages'][0]['content']
+
+    def test_ollama_stream_stops_after_verdict(self, ollama_guard):
+        """The Ollama stream is closed once the decision and confidence are known."""
+        chunks = [
+            '{"is_direct_answer": false, ',
+            '"confidence": 0.9, ',
+            '"reason": "asks',
+            ' a question"}',
+        ]
+        consumed = []
+
+        def stream(*args, **kwargs):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield {'message': {'content': chunk}}
+
+        ollama_guard.client.chat.side_effect = stream
+
+        result = ollama_guard._llm_validation('Solve 2x = 4', 'What could you divide by?')
+
+        assert result == (True, 'Validator verdict (stream stopped early)', 0.9)
+        assert consumed == chunks[:2]
+
+    def test_cache_evicts_least_recently_used(self, ollama_guard):
+        """Cache size is bounded by VALIDATION_CACHE_SIZE."""
+        ollama_guard.client.chat.side_effect = _streamed_replies(
+            '{"is_direct_answer": false, "confidence": 0.9, "reason": "ok"}'
+        )
+
+        with patch('app.services.socratic_guard.VALIDATION_CACHE_SIZE', 2):
+            for response in ('a', 'b', 'c'):
+                ollama_guard._llm_validation('Solve 2x = 4', response)
+
+        assert len(ollama_guard._validation_cache) == 2
+
+
+class TestSemanticValidationCache:
+    """Test suite for the optional semantic validation cache."""
+
+    def test_semantic_hit_skips_llm(self, ollama_guard):
+        """A paraphrase found in the semantic cache reuses its verdict."""
+        ollama_guard._semantic_cache = Mock()
+        ollama_guard._semantic_cache.get.return_value = (True, 'guiding question', 0.9)
+
+        result = ollama_guard._llm_validation('Solve 2x = 4', 'What have you tried so far?')
+
+        assert result == (True, 'guiding question', 0.9)
+        ollama_guard._semantic_cache.get.assert_called_once_with('Solve 2x = 4||What have you tried so far?')
+        ollama_guard.client.chat.assert_not_called()
+
+    def test_only_confident_verdicts_stored(self, ollama_guard):
+        """Low-confidence verdicts are kept out of the semantic cache."""
+        ollama_guard._semantic_cache = Mock()
+        ollama_guard._semantic_cache.get.return_value = None
+        ollama_guard.client.chat.side_effect = _streamed_replies(
+            '{"is_direct_answer": false, "confidence": 0.6, "reason": "unsure"}'
+        )
+
+        ollama_guard._llm_validation('Solve 2x = 4', 'Hmm, what next?')
+
+        ollama_guard._semantic_cache.set.assert_not_called()
+
+
+class TestValidationFastPaths:
+    """Test suite for rule-based shortcuts in validate_response."""
+
+    def test_short_acknowledgment_skips_llm(self, ollama_guard):
+        """Short celebration replies are accepted without an LLM call."""
+        is_valid, _, confidence = ollama_guard.validate_response(
+            'x = 2', "Excellent! You've solved it! Ready for another?"
+        )
+
+        assert is_valid is True
+        assert confidence >= 0.8
+        ollama_guard.client.chat.assert_not_called()
+
+    def test_acknowledgment_giving_answer_goes_to_llm(self, ollama_guard):
+        """Short replies that acknowledge but also give the answer are checked by the LLM."""
+        ollama_guard.client.chat.side_effect = _streamed_replies(
+            '{"is_direct_answer": true, "confidence": 0.9, "reason": "gives the answer"}'
+        )
+
+        is_valid, _, _ = ollama_guard.validate_response(
+            'x = 5', "That's not correct. The answer: x = 7."
+        )
+
+        assert is_valid is False
+        ollama_guard.client.chat.assert_called_once()
+
+    def test_direct_answer_rejected_without_llm(self, ollama_guard):
+        """Confident rule-based rejections never reach the LLM."""
+        is_valid, _, _ = ollama_guard.validate_response('Solve 2x = 4', 'The answer is 2.')
+
+        assert is_valid is False
+        ollama_guard.client.chat.assert_not_called()
+
+
+class TestRuleBasedValidation:
+    """Test suite for _rule_based_validation."""
+
+    def test_reason_names_matched_pattern(self, ollama_guard):
+        """The rejection reason reports the pattern that matched."""
+        _, reason, _ = ollama_guard._rule_based_validation('Try to substitute 3 for x.')
+
+        assert reason == r'Matched pattern: \bsubstitute\s+\d+'
+
+    def test_repeated_keywords_counted_once(self, ollama_guard):
+        """Keyword count reflects distinct keywords, not occurrences."""
+        is_valid, reason, _ = ollama_guard._rule_based_validation(
+            'What answer do you expect? Is that answer reasonable? Check the answer again.'
+        )
+
+        assert is_valid is True
+        assert reason == 'No obvious direct answer patterns detected'
+
+
+class TestMessageAnalysis:
+    """Test suite for OCR/geometry message classification."""
+
+    def test_repeated_message_uses_cache(self, ollama_guard):
+        """Re-analyzing the same message is a cache hit with the same flags."""
+        from app.services.socratic_guard import _analyze_message_text
+        _analyze_message_text.cache_clear()
+
+        first = ollama_guard._detect_geometry_content('Triangle ABC has a right angle')
+        second = ollama_guard._analyze_message('Triangle ABC has a right angle')
+
+        assert first is True
+        assert second.is_geometry is True
+        assert _analyze_message_text.cache_info().hits == 1
+
+
+class TestCandidateGeneration:
+    """Test suite for batched candidate generation and validation."""
+
+    def test_first_attempt_passes_without_candidates(self, ollama_guard):
+        """A passing first response costs one generation and one validation call."""
+        ollama_guard.client.chat.side_effect = [
+            _ollama_reply('What could you divide both sides by?'),
+            _ollama_stream('{"is_direct_answer": false, "confidence": 0.9, "reason": "ok"}'),
+        ]
+
+        result = ollama_guard.generate_validated_response('Solve 2x = 4')
+
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['attempts'] == 1
+        assert 'format' not in ollama_guard.client.chat.call_args_list[0].kwargs
+        assert ollama_guard.client.chat.call_count == 2
+
+    def test_first_passing_candidate_is_returned(self, ollama_guard):
+        """After attempt 1 fails, one generation and one batch validation call cover attempt 2."""
+        ollama_guard.client.chat.side_effect = [
+            _ollama_reply('The answer is 2.'),
+            _ollama_reply(
+                '{"candidates": ["The answer is 2.", "What could you divide both sides by?", '
+                '"What operation undoes multiplying by 2?"]}'
+            ),
+            _ollama_reply(
+                '{"verdicts": ['
+                '{"is_direct_answer": false, "confidence": 0.9, "reason": "guiding question"}, '
+                '{"is_direct_answer": false, "confidence": 0.9, "reason": "guiding question"}]}'
+            ),
+        ]
+
+        result = ollama_guard.generate_validated_response('Solve 2x = 4')
+
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['validation_passed'] is True
+        assert result['attempts'] == 2
+        assert ollama_guard.client.chat.call_count == 3
+
+    def test_falls_back_to_single_generation_on_bad_candidates(self, ollama_guard):
+        """Unparseable candidate output falls back to a single response."""
+        ollama_guard.client.chat.side_effect = [
+            _ollama_reply('The answer is 2.'),
+            _ollama_reply('not json'),
+            _ollama_reply('What could you divide both sides by?'),
+            _ollama_stream('{"is_direct_answer": false, "confidence": 0.9, "reason": "ok"}'),
+        ]
+
+        result = ollama_guard.generate_validated_response('Solve 2x = 4')
+
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['attempts'] == 2
+
+    def test_openai_candidates_only_requested_on_retry(self, socratic_guard):
+        """OpenAI asks for n choices only after a single response fails."""
+        with patch.object(socratic_guard, 'client') as client:
+            client.chat.completions.create.side_effect = [
+                _openai_reply('The answer is 2.'),
+                _openai_reply(
+                    'The answer is 2.',
+                    'What could you divide both sides by?',
+                    'What operation undoes multiplying by 2?'
+                ),
+                _openai_reply(
+                    '{"verdicts": ['
+                    '{"is_direct_answer": false, "confidence": 0.9, "reason": "guiding question"}, '
+                    '{"is_direct_answer": false, "confidence": 0.9, "reason": "guiding question"}]}'
+                ),
+            ]
+
+            result = socratic_guard.generate_validated_response('Solve 2x = 4')
+
+        first, retry, validation = client.chat.completions.create.call_args_list
+        assert 'n' not in first.kwargs
+        assert retry.kwargs['n'] == CANDIDATE_COUNT
+        assert validation.kwargs['response_format'] == {'type': 'json_object'}
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['attempts'] == 2
+
+    def test_batch_verdicts_populate_single_cache(self, ollama_guard):
+        """Batch verdicts are reused by later single validations."""
+        ollama_guard.client.chat.return_value = _ollama_reply(
+            '{"verdicts": ['
+            '{"is_direct_answer": false, "confidence": 0.9, "reason": "first"}, '
+            '{"is_direct_answer": true, "confidence": 0.8, "reason": "second"}]}'
+        )
+
+        ollama_guard._batch_llm_validation('Solve 2x = 4', ['Hint one?', 'Hint two?'])
+        result = ollama_guard._llm_validation('Solve 2x = 4', 'Hint two?')
+
+        assert result == (False, 'second', 0.8)
+        assert ollama_guard.client.chat.call_count == 1
+
+    def test_missing_batch_verdicts_are_inconclusive(self, ollama_guard):
+        """Short batch replies pad the remaining verdicts as inconclusive."""
+        ollama_guard.client.chat.return_value = _ollama_reply(
+            '{"verdicts": [{"is_direct_answer": false, "confidence": 0.9, "reason": "first"}]}'
+        )
+
+        results = ollama_guard._batch_llm_validation('Solve 2x = 4', ['Hint one?', 'Hint two?'])
+
+        assert results == [(True, 'first', 0.9), (True, 'Validation inconclusive', 0.3)]
+
+
+class TestFinalAnswerDetection:
+    """Test suite for detect_final_answer."""
+
+    @pytest.mark.parametrize('message, expected', [
+        ('5', True),
+        ('-2.5', True),
+        ('x = 5', True),
+        ('1e5', False),
+        ('1_000', False),
+        ('+5', False),
+        ('inf', False),
+        ('nan', False),
+        ('What is 5?', False),
+    ])
+    def test_plain_numbers_and_assignments(self, ollama_guard, message, expected):
+        """Only plain decimals and 'x = number' count as final answers."""
+        assert ollama_guard.detect_final_answer(message) is expected
+
+
+class TestAsyncValidatedResponse:
+    """Test suite for the async generate-and-validate loop."""
+
+    @staticmethod
+    def _run(guard, responses, verdicts):
+        """Run agenerate_validated_response with stubbed generation and validation.
+
+        Generations past the given responses never finish; they record
+        whether they were cancelled.
+        """
+        started = []
+        cancelled = []
+
+        async def generate(student_message, conversation_context, attempt, math_context):
+            started.append(attempt)
+            if attempt <= len(responses):
+                return responses[attempt - 1]
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+
+        remaining_verdicts = iter(verdicts)
+
+        async def validate(student_message, candidates):
+            # Yield like a real validation call, so speculative generations start
+            await asyncio.sleep(0)
+            return next(remaining_verdicts)
+
+        async def run():
+            with patch.object(guard, '_agenerate_attempt', side_effect=generate), \
+                    patch.object(guard, '_avalidate_candidates', side_effect=validate):
+                result = await guard.agenerate_validated_response('Solve 2x = 4')
+                await asyncio.sleep(0)
+            return result
+
+        return asyncio.run(run()), started, cancelled
+
+    def test_first_attempt_is_not_speculative(self, ollama_guard):
+        """A passing first attempt makes exactly one generation call."""
+        result, started, cancelled = self._run(
+            ollama_guard,
+            [['What could you divide both sides by?']],
+            [[(True, 'guiding question', 0.9)]]
+        )
+
+        assert result['attempts'] == 1
+        assert started == [1]
+        assert cancelled == []
+
+    def test_retry_overlaps_next_generation_and_cancels_it(self, ollama_guard):
+        """Attempt 3 is generated while attempt 2 is validated, then cancelled."""
+        result, started, cancelled = self._run(
+            ollama_guard,
+            [['The answer is 2.'], ['x = 2', 'What could you divide both sides by?']],
+            [[(False, 'direct answer', 0.9)], [(False, 'direct answer', 0.9), (True, 'guiding question', 0.9)]]
+        )
+
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['attempts'] == 2
+        assert started == [1, 2, 3]
+        assert cancelled == [3]
+
+    def test_retry_generates_candidates(self, ollama_guard):
+        """Async retries ask for several candidates, like the sync loop."""
+        ollama_guard.async_client = Mock()
+        ollama_guard.async_client.chat = AsyncMock(side_effect=[
+            _ollama_reply('The answer is 2.'),
+            _ollama_reply('{"candidates": ["The answer is 2.", "What could you divide both sides by?"]}'),
+            # Attempt 3, started speculatively while attempt 2 is validated
+            _ollama_reply('{"candidates": ["What is 4 divided by 2?"]}'),
+        ])
+
+        with patch.object(ollama_guard, '_allm_validation', AsyncMock(return_value=(True, 'ok', 0.9))):
+            result = asyncio.run(ollama_guard.agenerate_validated_response('Solve 2x = 4'))
+
+        first, retry = ollama_guard.async_client.chat.call_args_list[:2]
+        assert 'format' not in first.kwargs
+        assert 'format' in retry.kwargs
+        assert result['response'] == 'What could you divide both sides by?'
+        assert result['attempts'] == 2
+
+
+class TestPromptBuilding:
+    """Test suite for prompt assembly from precomputed fragments."""
+
+    def test_socratic_prompt_matches_template(self, ollama_guard):
+        """Concatenated fragments equal the formatted template."""
+        from app.services.socratic_guard import (
+            CONTINUING_CONVERSATION_INSTRUCTIONS,
+            SOCRATIC_PROMPT_TEMPLATE,
+        )
+        context = 'Student: Solve 2x = 4\nTutor: What is {x} multiplied by?'
+
+        prompt = ollama_guard._generation_prompt('I think 2', context, 2, None, None)
+
+        assert prompt == SOCRATIC_PROMPT_TEMPLATE.format(
+            emphasis='IMPORTANT: ',
+            context_section='Previous conversation:\n' + context + '\n',
+            math_info='',
+            student_message='I think 2',
+            critical_instructions=CONTINUING_CONVERSATION_INSTRUCTIONS,
+            ocr_instruction=''
+        )
+
+    def test_emphasis_capped_at_last_level(self, ollama_guard):
+        """Attempts past the last emphasis level reuse it."""
+        prompt = ollama_guard._generation_prompt('Solve 2x = 4', None, 5, None, None)
+
+        assert prompt.startswith('CRITICAL: You are a Socratic math tutor')
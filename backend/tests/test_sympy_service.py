@@ -0,0 +1,220 @@
+"""Unit tests for SymPy Service caching.
+
+Tests for:
+- Parse and result caches shared across operations
+- Shared (Redis) result cache
+- Cache clearing
+"""
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from app.services import sympy_service
+from app.services.sympy_service import SymPyService
+
+
+@pytest.fixture
+def shared_cache():
+    """Mock the Redis-backed shared result cache (always a miss)."""
+    mock_cache = Mock()
+    mock_cache.get_cached_sympy_result.return_value = None
+    mock_cache.cache_sympy_result.return_value = True
+    with patch('app.services.sympy_service.get_redis_service', return_value=mock_cache):
+        yield mock_cache
+
+
+@pytest.fixture
+def service(shared_cache):
+    """Create a SymPyService with empty in-process caches."""
+    SymPyService.clear_cache()
+    yield SymPyService()
+    SymPyService.clear_cache()
+
+
+class TestSymPyServiceCache:
+    """Test suite for SymPyService caching."""
+
+    def test_caret_and_whitespace_share_parse_entry(self, service):
+        """Equivalent inputs normalize to a single cache entry."""
+        first = service.parse_expression('x^2 + 1')
+        second = service.parse_expression('  x**2 + 1 ')
+        third = service.parse_expression('x^2  +\t1')
+
+        assert first['result'] == second['result'] == third['result']
+        assert sympy_service._parse_cached.cache_info().hits == 2
+
+    def test_repeated_factor_hits_result_cache(self, service):
+        """Repeated operations return the cached string result."""
+        first = service.factor_expression('x^2 + 2*x + 1')
+        second = service.factor_expression('x^2 + 2*x + 1')
+
+        assert first == second
+        assert first['result'] == '(x + 1)**2'
+        assert sympy_service._factor_cached.cache_info().hits == 1
+
+    def test_solve_cached_by_variable(self, service):
+        """The solve cache keys on the variable as well as the equation."""
+        for_x = service.solve_equation('x + y = 3', variable='x')
+        for_y = service.solve_equation('x + y = 3', variable='y')
+
+        assert for_x['result']['solutions'] == ['3 - y']
+        assert for_y['result']['solutions'] == ['3 - x']
+
+    def test_implicit_multiplication(self, service):
+        """Coefficients written next to variables parse as products."""
+        result = service.solve_equation('2x + 3 = 7')
+
+        assert result['result']['solutions'] == ['2']
+
+    def test_multi_letter_symbols_not_split(self, service):
+        """Multi-letter names stay single symbols."""
+        result = service.parse_expression('area')
+
+        assert str(result['result']) == 'area'
+
+    def test_parse_errors_are_not_cached(self, service):
+        """Invalid input still returns the standardized parse error."""
+        result = service.simplify_expression('x +')
+
+        assert result['success'] is False
+        assert 'Could not parse expression' in result['error']
+        assert sympy_service._parse_cached.cache_info().currsize == 0
+
+    @pytest.mark.parametrize('expression, expected', [
+        ('(x + 1)**2', '(x + 1)**2'),
+        ('(x + 1)*(x - 1)', 'x**2 - 1'),
+        ('(x^2 - 1)/(x - 1)', 'x + 1'),
+        ('sin(x)^2 + cos(x)^2', '1'),
+        ('exp(x)*exp(y)', 'exp(x + y)'),
+        ('(exp(2*x) - 1)/(exp(x) - 1)', 'exp(x) + 1'),
+        ('(sqrt(x) + 1)*(sqrt(x) - 1)', 'x - 1'),
+    ])
+    def test_simplify_matches_generic_simplify(self, service, expression, expected):
+        """Shape-specific simplification gives the same forms as simplify."""
+        result = service.simplify_expression(expression)
+
+        assert result['result'] == expected
+
+    def test_clear_cache(self, service):
+        """clear_cache empties every shared cache."""
+        service.simplify_expression('x + x')
+        service.differentiate('x^3')
+        SymPyService.clear_cache()
+
+        assert sympy_service._parse_cached.cache_info().currsize == 0
+        assert sympy_service._simplify_cached.cache_info().currsize == 0
+        assert sympy_service._diff_cached.cache_info().currsize == 0
+
+    def test_shared_cache_hit_skips_computation(self, service, shared_cache):
+        """Results found in the shared cache are returned without computing."""
+        shared_cache.get_cached_sympy_result.return_value = 'cached result'
+
+        result = service.simplify_expression('x + x')
+
+        assert result['result'] == 'cached result'
+        shared_cache.cache_sympy_result.assert_not_called()
+
+    def test_computed_results_are_shared(self, service, shared_cache):
+        """Shared cache misses store the computed result."""
+        service.solve_equation('x^2 = 4')
+
+        operation, _, result = shared_cache.cache_sympy_result.call_args[0]
+        assert operation == 'solve'
+        assert result == ('-2', '2')
+
+    def test_timeout_returns_error(self, service):
+        """Computations exceeding the timeout return a standardized error."""
+        with patch.object(sympy_service, 'COMPUTE_TIMEOUT_SECONDS', 0.001):
+            result = service.integrate_expression('exp(x)*sin(x)^3*cos(x)^2')
+
+        assert result['success'] is False
+        assert 'timed out' in result['error']
+        assert sympy_service._integrate_cached.cache_info().currsize == 0
+
+
+    def test_timeout_does_not_block_next_call(self, service):
+        """A timed-out computation frees its worker for later calls."""
+        with patch.object(sympy_service, 'COMPUTE_MAX_WORKERS', 1):
+            sympy_service._reset_pool(sympy_service._get_pool())
+            try:
+                with patch.object(sympy_service, 'COMPUTE_TIMEOUT_SECONDS', 0.5):
+                    with pytest.raises(TimeoutError):
+                        sympy_service._run_in_pool(time.sleep, 60)
+
+                    assert sympy_service._run_in_pool(sympy_service._worker_simplify, 'x + x') == '2*x'
+                    assert sympy_service._run_in_pool(sympy_service._worker_simplify, 'y + y') == '2*y'
+            finally:
+                sympy_service._reset_pool(sympy_service._get_pool())
+
+    def test_process_exits_after_pool_use_under_eventlet(self):
+        """A monkey-patched process that used the pool still exits."""
+        pytest.importorskip('eventlet')
+        script = textwrap.dedent("""
+            import eventlet
+            eventlet.monkey_patch()
+            from app.services import sympy_service
+            print(sympy_service._run_in_pool(sympy_service._worker_simplify, 'x + x'))
+        """)
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=backend_dir,
+            env={**os.environ, 'PYTHONPATH': backend_dir},
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == '2*x'
+
+
+class TestProcessExpression:
+    """Test suite for SymPyService.process_expression."""
+
+    def test_equation_is_solved(self, service):
+        """Equations are parsed side by side and solved."""
+        result = service.process_expression('x^2 - 4 = 0')
+
+        assert result['result'] == {
+            'type': 'equation',
+            'parsed': 'x**2 - 4 = 0',
+            'simplified': None,
+            'solutions': ['-2', '2'],
+            'operations': ['parse', 'solve']
+        }
+
+    def test_expression_is_simplified_from_one_parse(self, service):
+        """Expressions are parsed once and simplified."""
+        result = service.process_expression('2x + 3x')
+
+        assert result['result']['type'] == 'expression'
+        assert result['result']['simplified'] == '5*x'
+        assert result['result']['operations'] == ['parse', 'simplify']
+        assert sympy_service._parse_cached.cache_info().misses == 1
+
+    @pytest.mark.parametrize('expr_str, simplified', [
+        ('x <= 5', 'x <= 5'),
+        ('x >= 3', 'x >= 3'),
+        ('2x + 3x <= 10', 'x <= 2'),
+    ])
+    def test_inequality_is_simplified(self, service, expr_str, simplified):
+        """Comparisons containing '=' are simplified, not solved as equations."""
+        result = service.process_expression(expr_str)
+
+        assert result['success'] is True
+        assert result['result']['type'] == 'expression'
+        assert result['result']['simplified'] == simplified
+
+    def test_parse_error_is_returned(self, service):
+        """Unparseable input returns the parse error response."""
+        result = service.process_expression('x = y +')
+
+        assert result['success'] is False
+        assert 'Could not parse expression' in result['error']
@@ -8,6 +8,10 @@ Tests for:
 - AC-5: GEOMETRY_PROMPT with JSON structure
 - AC-6: Accuracy benchmarking
 """
+import asyncio
+import base64
+import httpx
+import openai
 import pytest
 import json
 import re
@@ -20,6 +24,14 @@ from app.services.vision_service import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_ocr_cache():
+    """Start every test with an empty OCR result cache."""
+    VisionService.clear_cache()
+    yield
+    VisionService.clear_cache()
+
+
 class TestVisionServicePrompts:
     """Test suite for OCR prompts (AC-2, AC-5)."""
 
@@ -107,6 +119,506 @@ class TestVisionServiceTemperature:
             f"Temperature should be 0.0, got {call_args.kwargs.get('temperature')}"
 
 
+class TestVisionServiceHttpClient:
+    """Test suite for the shared HTTP connection pool."""
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_instances_share_http_client(self, mock_openai):
+        """Every VisionService reuses one pooled HTTP client."""
+        VisionService()
+        VisionService()
+
+        first, second = (call.kwargs['http_client'] for call in mock_openai.call_args_list)
+        assert first is second
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_transient_errors_retried(self, mock_openai):
+        """The client retries rate-limit and server errors with backoff."""
+        from app.services.vision_service import VISION_MAX_RETRIES
+        VisionService()
+
+        assert mock_openai.call_args.kwargs['max_retries'] == VISION_MAX_RETRIES
+
+
+class TestVisionServiceAvailability:
+    """Test suite for the cached model availability check."""
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_availability_cached(self, mock_openai):
+        """Repeated checks retrieve the model once."""
+        from app.services.vision_service import MODEL_PROBE_TIMEOUT_SECONDS
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        service = VisionService(model_name='gpt-4o-availability-test')
+
+        first = service.check_model_availability()
+        second = service.check_model_availability()
+
+        assert first == second == {'available': True, 'model': 'gpt-4o-availability-test', 'provider': 'OpenAI'}
+        mock_client.with_options.assert_called_once_with(timeout=MODEL_PROBE_TIMEOUT_SECONDS, max_retries=0)
+        mock_client.with_options.return_value.models.retrieve.assert_called_once_with('gpt-4o-availability-test')
+        mock_client.models.list.assert_not_called()
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_failed_probe_backs_off(self, mock_openai):
+        """After a failure checks fast-fail for a window that doubles per failure."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        retrieve = mock_client.with_options.return_value.models.retrieve
+        retrieve.side_effect = Exception('Service unavailable')
+        service = VisionService(model_name='gpt-4o-backoff-test')
+
+        with patch('app.services.vision_service.time.monotonic', side_effect=[100.0, 101.0, 103.0, 105.0]):
+            first = service.check_model_availability()    # probe fails, open until 102
+            second = service.check_model_availability()   # fast-fails
+            service.check_model_availability()            # probe fails, open until 107
+            service.check_model_availability()            # fast-fails
+
+        assert first['available'] is False and second == first
+        assert retrieve.call_count == 2
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_failed_ocr_invalidates_availability(self, mock_openai, tmp_path):
+        """A failed Vision call makes the next check probe the API again."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = openai.APIConnectionError(
+            request=httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+        )
+        service = VisionService(model_name='gpt-4o-invalidation-test')
+        image_path = tmp_path / 'test.png'
+        image_path.write_bytes(b'fake image data')
+
+        service.check_model_availability()
+        service.extract_text_from_image(str(image_path))
+        service.check_model_availability()
+
+        assert mock_client.with_options.return_value.models.retrieve.call_count == 2
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_local_failure_keeps_availability(self, mock_openai, tmp_path):
+        """File and parsing failures do not force a new availability probe."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.return_value.choices[0].message.content = None
+        service = VisionService(model_name='gpt-4o-local-failure-test')
+        image_path = tmp_path / 'test.png'
+        image_path.write_bytes(b'fake image data')
+
+        service.check_model_availability()
+        missing = service.extract_text_from_image(str(tmp_path / 'missing.png'))
+        unparseable = service.extract_text_from_image(str(image_path))
+        service.check_model_availability()
+
+        assert missing['success'] is False and unparseable['success'] is False
+        assert mock_client.with_options.return_value.models.retrieve.call_count == 1
+
+
+class TestVisionServiceImageEncoding:
+    """Test suite for the image data URL sent to the Vision API."""
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_image_sent_as_base64_data_url(self, mock_openai, tmp_path):
+        """The image is sent as a data URL with the normalized format."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.return_value.choices[0].message.content = '{"extracted_text": "x"}'
+        image_path = tmp_path / 'drawing.jpg'
+        image_path.write_bytes(b'fake image data')
+
+        VisionService().extract_text_from_image(str(image_path))
+
+        content = mock_client.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        assert content[1]['image_url']['url'] == 'data:image/jpeg;base64,ZmFrZSBpbWFnZSBkYXRh'
+        assert content[1]['image_url']['detail'] == 'high'
+
+
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_large_image_downscaled_before_upload(self, mock_openai, tmp_path):
+        """Images larger than the API's working size are resized and flattened to JPEG."""
+        from io import BytesIO
+        from PIL import Image
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.return_value.choices[0].message.content = '{"extracted_text": "x"}'
+        image_path = tmp_path / 'drawing.png'
+        Image.new('RGBA', (3000, 1000), (0, 0, 0, 0)).save(image_path)
+
+        VisionService().extract_text_from_image(str(image_path))
+
+        content = mock_client.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        prefix, encoded = content[1]['image_url']['url'].split(',', 1)
+        assert prefix == 'data:image/jpeg;base64'
+        with Image.open(BytesIO(base64.b64decode(encoded))) as sent:
+            assert sent.size == (2048, 683)
+            assert sent.getpixel((0, 0)) == (255, 255, 255)
+
+    def test_rotated_photo_downscaled_upright(self, tmp_path):
+        """EXIF-rotated JPEGs are reduced while decoding and sent upright."""
+        from io import BytesIO
+        from PIL import Image
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees clockwise
+        buffer = BytesIO()
+        Image.new('RGB', (4000, 3000), (255, 255, 255)).save(buffer, 'JPEG', exif=exif)
+
+        image_data, image_format, _ = VisionService._downscale_image(buffer.getvalue(), 'jpeg')
+
+        assert image_format == 'jpeg'
+        with Image.open(BytesIO(image_data)) as sent:
+            assert sent.size == (768, 1024)
+
+    def test_small_image_sent_unchanged(self, tmp_path):
+        """Images within the API's working size are not re-encoded."""
+        from PIL import Image
+        image_path = tmp_path / 'small.png'
+        Image.new('RGB', (800, 600), (255, 255, 255)).save(image_path)
+        image_data = image_path.read_bytes()
+
+        assert VisionService._downscale_image(image_data, 'png') == (image_data, 'png', 'high')
+
+    def test_thumbnail_sent_at_low_detail(self, tmp_path):
+        """Images that fit the low-detail view skip the high-detail tiles."""
+        from PIL import Image
+        image_path = tmp_path / 'thumb.png'
+        Image.new('RGB', (512, 300), (255, 255, 255)).save(image_path)
+        image_data = image_path.read_bytes()
+
+        assert VisionService._downscale_image(image_data, 'png') == (image_data, 'png', 'low')
+
+
+class TestVisionServiceResultCache:
+    """Test suite for the OCR result cache keyed by image content."""
+
+    @pytest.fixture
+    def vision(self, tmp_path):
+        """Create a VisionService with a mocked client and an image on disk."""
+        with patch('app.services.vision_service.OpenAI') as mock_openai, \
+                patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            mock_client.chat.completions.create.return_value.choices[0].message.content = \
+                '{"extracted_text": "x + 1 = 2", "confidence": 0.95}'
+            service = VisionService()
+        image_path = tmp_path / 'equation.png'
+        image_path.write_bytes(b'fake image data')
+        return service, mock_client, str(image_path)
+
+    def test_identical_image_uses_cache(self, vision):
+        """Re-uploading the same image skips the Vision API call."""
+        service, mock_client, image_path = vision
+
+        first = service.extract_text_from_image(image_path)
+        first['method_used'] = 'gpt4o'
+        second = service.extract_text_from_image(image_path)
+
+        assert second['extracted_text'] == 'x + 1 = 2'
+        assert 'method_used' not in second
+        assert mock_client.chat.completions.create.call_count == 1
+
+    def test_subject_is_part_of_key(self, vision):
+        """The same image with a different subject is processed again."""
+        service, mock_client, image_path = vision
+
+        service.extract_text_from_image(image_path)
+        service.extract_text_from_image(image_path, subject='geometry')
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_subject_spelling_shares_key(self, vision):
+        """Subject hints are normalized, so spellings share one cache entry."""
+        service, mock_client, image_path = vision
+
+        service.extract_text_from_image(image_path, subject='Geometry')
+        service.extract_text_from_image(image_path, subject='GEOMETRY')
+
+        content = mock_client.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        assert content[0]['text'] == GEOMETRY_PROMPT
+        assert mock_client.chat.completions.create.call_count == 1
+
+    def test_failures_not_cached(self, vision):
+        """API errors are retried on the next call."""
+        service, mock_client, image_path = vision
+        mock_client.chat.completions.create.side_effect = Exception('rate limited')
+
+        service.extract_text_from_image(image_path)
+        service.extract_text_from_image(image_path)
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+
+    def test_prompt_is_stable_with_hint_as_suffix(self, vision):
+        """The prompt has no per-request ID and the subject hint follows OCR_PROMPT."""
+        service, mock_client, image_path = vision
+
+        service.extract_text_from_image(image_path, subject='algebra')
+
+        content = mock_client.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        assert content[0]['text'].startswith(OCR_PROMPT)
+        assert content[0]['text'].endswith('ALGEBRA problem (equations, expressions, variables).')
+        assert 'Request ID' not in content[0]['text']
+
+
+class TestVisionServiceAsync:
+    """Test suite for concurrent async OCR."""
+
+    @patch('app.services.vision_service.AsyncOpenAI')
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_async_client_created_on_first_use(self, mock_openai, mock_async_openai):
+        """Instances used only synchronously never build the async client."""
+        service = VisionService()
+        mock_async_openai.assert_not_called()
+
+        assert service.async_client is service.async_client
+        mock_async_openai.assert_called_once()
+
+    @patch('app.services.vision_service.AsyncOpenAI')
+    @patch('app.services.vision_service.OpenAI')
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_extract_many_bounds_concurrency(self, mock_openai, mock_async_openai, tmp_path):
+        """aextract_many keeps result order and respects the concurrency limit."""
+        in_flight = []
+        peak = []
+
+        async def create(**kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            image_url = kwargs['messages'][0]['content'][1]['image_url']['url']
+            response = MagicMock()
+            response.choices[0].message.content = json.dumps({'extracted_text': image_url[-4:]})
+            return response
+
+        mock_async_openai.return_value.chat.completions.create.side_effect = create
+        paths = []
+        for i in range(5):
+            image_path = tmp_path / f'{i}.png'
+            image_path.write_bytes(b'image %d' % i)
+            paths.append(str(image_path))
+
+        results = asyncio.run(VisionService().aextract_many(paths, concurrency=2))
+
+        assert [result['success'] for result in results] == [True] * 5
+        assert results[3]['extracted_text'] == 'Mw=='  # base64 tail of b'image 3'
+        assert max(peak) == 2
+
+
+    def test_extract_texts_from_images_keeps_order(self, tmp_path):
+        """The threaded sync helper returns results in input order."""
+        with patch('app.services.vision_service.OpenAI') as mock_openai, \
+                patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+            def create(**kwargs):
+                image_url = kwargs['messages'][0]['content'][1]['image_url']['url']
+                response = MagicMock()
+                response.choices[0].message.content = json.dumps({'extracted_text': image_url[-4:]})
+                return response
+
+            mock_openai.return_value.chat.completions.create.side_effect = create
+            service = VisionService()
+        paths = []
+        for i in range(4):
+            image_path = tmp_path / f'{i}.png'
+            image_path.write_bytes(b'image %d' % i)
+            paths.append(str(image_path))
+
+        results = service.extract_texts_from_images(paths, concurrency=2)
+
+        assert [result['extracted_text'] for result in results] == ['MA==', 'MQ==', 'Mg==', 'Mw==']
+
+
+class TestVisionServiceMultiImage:
+    """Test suite for packing several images into one Vision request."""
+
+    @pytest.fixture
+    def multi_vision(self, tmp_path):
+        """Create a VisionService with a mocked client and three images."""
+        with patch('app.services.vision_service.OpenAI') as mock_openai, \
+                patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            service = VisionService()
+        paths = []
+        for i in range(3):
+            image_path = tmp_path / f'{i}.png'
+            image_path.write_bytes(b'image %d' % i)
+            paths.append(str(image_path))
+        return service, mock_client, paths
+
+    @staticmethod
+    def _reply(content):
+        """Build a chat completion response with the given content."""
+        response = MagicMock()
+        response.choices[0].message.content = content
+        return response
+
+    def test_images_share_one_request(self, multi_vision):
+        """Images in one batch are sent together and mapped back in order."""
+        service, mock_client, paths = multi_vision
+        mock_client.chat.completions.create.return_value = self._reply(json.dumps({'results': [
+            {'extracted_text': 'x + 1 = 2'}, {'extracted_text': '3 * 4'}, {'extracted_text': 'y = 5'}
+        ]}))
+
+        results = service.extract_texts_batched(paths)
+
+        assert [result['extracted_text'] for result in results] == ['x + 1 = 2', '3 * 4', 'y = 5']
+        call_kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert mock_client.chat.completions.create.call_count == 1
+        assert len(call_kwargs['messages'][0]['content']) == 4
+        assert call_kwargs['response_format'] == {'type': 'json_object'}
+
+    def test_mismatched_reply_falls_back_to_single_calls(self, multi_vision):
+        """A reply with the wrong number of results is retried per image."""
+        service, mock_client, paths = multi_vision
+        mock_client.chat.completions.create.side_effect = [
+            self._reply(json.dumps({'results': [{'extracted_text': 'x + 1 = 2'}]})),
+            self._reply('{"extracted_text": "a"}'),
+            self._reply('{"extracted_text": "b"}'),
+            self._reply('{"extracted_text": "c"}'),
+        ]
+
+        results = service.extract_texts_batched(paths)
+
+        assert [result['extracted_text'] for result in results] == ['a', 'b', 'c']
+        assert mock_client.chat.completions.create.call_count == 4
+
+    def test_cached_images_not_resent(self, multi_vision):
+        """Only cache misses are sent; a lone miss uses the single-image prompt."""
+        from app.services.vision_service import OCR_PROMPT
+        service, mock_client, paths = multi_vision
+        mock_client.chat.completions.create.return_value = self._reply(json.dumps({'results': [
+            {'extracted_text': 'a'}, {'extracted_text': 'b'}
+        ]}))
+        service.extract_texts_batched(paths[:2])
+        mock_client.chat.completions.create.return_value = self._reply('{"extracted_text": "c"}')
+
+        results = service.extract_texts_batched(paths)
+
+        assert [result['extracted_text'] for result in results] == ['a', 'b', 'c']
+        assert mock_client.chat.completions.create.call_count == 2
+        content = mock_client.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        assert content[0]['text'] == OCR_PROMPT
+
+
+class TestVisionServiceBatch:
+    """Test suite for Batch API OCR."""
+
+    @pytest.fixture
+    def batch_vision(self, tmp_path):
+        """Create a VisionService with a mocked batch-capable client and two images."""
+        with patch('app.services.vision_service.OpenAI') as mock_openai, \
+                patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'}):
+            mock_client = MagicMock()
+            mock_openai.return_value = mock_client
+            service = VisionService()
+        paths = []
+        for name, data in (('a.png', b'image a'), ('b.png', b'image b')):
+            image_path = tmp_path / name
+            image_path.write_bytes(data)
+            paths.append(str(image_path))
+        return service, mock_client, paths
+
+    @staticmethod
+    def _submitted_lines(mock_client):
+        """Capture the JSONL lines uploaded as the batch input."""
+        submitted = []
+        mock_client.files.create.side_effect = lambda file, purpose: (
+            submitted.extend(json.loads(line) for line in file.read().splitlines()) or Mock(id='file-in')
+        )
+        return submitted
+
+    @staticmethod
+    def _output(custom_id, content):
+        """Build one batch output line."""
+        return json.dumps({
+            'custom_id': custom_id,
+            'response': {'status_code': 200, 'body': {'choices': [{'message': {'content': content}}]}},
+            'error': None
+        })
+
+    def test_batch_results_keyed_by_path(self, batch_vision):
+        """Each image is submitted once and its reply mapped back to its path."""
+        service, mock_client, paths = batch_vision
+        submitted = self._submitted_lines(mock_client)
+        mock_client.batches.create.return_value = Mock(id='batch-1', status='completed', output_file_id='file-out')
+
+        def output(file_id):
+            return Mock(text='\n'.join(
+                self._output(line['custom_id'], json.dumps({'extracted_text': line['custom_id'][:4]}))
+                for line in submitted
+            ))
+        mock_client.files.content.side_effect = output
+
+        results = service.extract_text_from_image_batch(paths + [paths[0]], subject='algebra')
+
+        assert len(submitted) == 2
+        assert submitted[0]['url'] == '/v1/chat/completions'
+        assert submitted[0]['body']['temperature'] == 0.0
+        assert results[paths[0]]['extracted_text'] == submitted[0]['custom_id'][:4]
+        assert results[paths[1]]['extracted_text'] == submitted[1]['custom_id'][:4]
+        mock_client.batches.create.assert_called_once_with(
+            input_file_id='file-in', endpoint='/v1/chat/completions', completion_window='24h'
+        )
+
+    def test_batch_populates_ocr_cache(self, batch_vision):
+        """Batch results are reused by later interactive calls."""
+        service, mock_client, paths = batch_vision
+        submitted = self._submitted_lines(mock_client)
+        mock_client.batches.create.return_value = Mock(id='batch-1', status='completed', output_file_id='file-out')
+        mock_client.files.content.side_effect = lambda file_id: Mock(text='\n'.join(
+            self._output(line['custom_id'], '{"extracted_text": "x = 1"}') for line in submitted
+        ))
+
+        service.extract_text_from_image_batch(paths)
+        result = service.extract_text_from_image(paths[1])
+
+        assert result['extracted_text'] == 'x = 1'
+        mock_client.chat.completions.create.assert_not_called()
+
+    def test_failed_batch_returns_errors(self, batch_vision):
+        """A failed batch yields error results for every image."""
+        service, mock_client, paths = batch_vision
+        self._submitted_lines(mock_client)
+        mock_client.batches.create.return_value = Mock(id='batch-1', status='failed')
+
+        results = service.extract_text_from_image_batch(paths)
+
+        assert all(result['success'] is False for result in results.values())
+
+    def test_timeout_cancels_batch(self, batch_vision):
+        """Batches still running at the timeout are cancelled."""
+        service, mock_client, paths = batch_vision
+        self._submitted_lines(mock_client)
+        mock_client.batches.create.return_value = Mock(id='batch-1', status='in_progress')
+
+        results = service.extract_text_from_image_batch(paths, timeout=0)
+
+        mock_client.batches.cancel.assert_called_once_with('batch-1')
+        assert results[paths[0]]['success'] is False
+
+
+    def test_encode_error_removes_batch_file(self, batch_vision, tmp_path):
+        """The JSONL input file is removed even if encoding an image raises."""
+        service, mock_client, paths = batch_vision
+
+        with patch('tempfile.tempdir', str(tmp_path)), \
+                patch.object(service, '_encode_image', side_effect=ValueError('cannot decode image')):
+            with pytest.raises(ValueError):
+                service.extract_text_from_image_batch(paths)
+
+        assert list(tmp_path.glob('*.jsonl')) == []
+        mock_client.batches.create.assert_not_called()
+
+
 class TestVisionServiceUncertaintyParsing:
     """Test suite for uncertainty marker parsing (AC-3)."""
 
@@ -186,6 +698,20 @@ class TestVisionServiceResponseParsing:
         assert result['problem_type'] == "algebra"
         assert len(result['uncertain_regions']) == 1
 
+    def test_parse_json_surrounded_by_text(self):
+        """JSON wrapped in prose or code fences is found by brace matching."""
+        response = (
+            'Here is the result:\n```json\n'
+            '{"extracted_text": "f(x) = {x}", "latex": "$\\\\{x\\\\}$", "problem_type": "algebra"}'
+            '\n```\nLet me know if you need {more}.'
+        )
+
+        result = self.service._parse_ocr_response(response)
+
+        assert result['success'] is True
+        assert result['extracted_text'] == 'f(x) = {x}'
+        assert result['latex'] == '$\\{x\\}$'
+
     def test_parse_geometry_json_response(self):
         """AC-4: Parse geometry JSON response with shapes."""
         json_response = '''{
@@ -351,6 +877,32 @@ class TestVisionServiceMathDetection:
         assert self.service._detect_math("") is False
         assert self.service._detect_math(None) is False
 
+    def test_known_problem_type_skips_text_scan(self):
+        """A recognized problem type marks math without rescanning the text."""
+        with patch.object(self.service, '_detect_math') as detect_math:
+            result = self.service._finalize_ocr_result(
+                '{"extracted_text": "Find the missing side", "problem_type": "geometry"}', None
+            )
+
+        assert result['math_detected'] is True
+        detect_math.assert_not_called()
+
+    def test_unknown_problem_type_scans_text(self):
+        """Without a problem type or LaTeX the text is still scanned."""
+        result = self.service._finalize_ocr_result('{"extracted_text": "Hello world"}', None)
+
+        assert result['math_detected'] is False
+
+    def test_estimate_confidence_reuses_math_flag(self):
+        """A known math flag is used instead of rescanning the text."""
+        with patch.object(self.service, '_detect_math') as detect_math:
+            confidence = self.service._estimate_confidence('Solve this equation', math_detected=True)
+
+        assert confidence == pytest.approx(
+            self.service._estimate_confidence('Solve this equation') + 0.05
+        )
+        detect_math.assert_not_called()
+
 
 class TestVisionServiceGeometryRouting:
     """Test suite for geometry-specific routing (AC-5)."""